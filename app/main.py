@@ -1,16 +1,34 @@
 """
 GreyDB API - Futbol Maç Verileri ve İstatistikleri
 """
+import asyncio
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.config import get_settings
-from app.routers import form, h2h, predictions, coupons, match_comments, feedback, skorjin, leagues, match_data
+from app.routers import form, h2h, predictions, coupons, match_comments, feedback, skorjin, leagues, match_data, ratings, model, team_metrics, players, availability, admin
+from app.services.warmup import warm_up
+from app.services.write_buffer import start_buffers, stop_buffers
 
 settings = get_settings()
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Başlangıç/kapanış: warm-up, write-behind buffer'ları başlat, kapanırken flush et"""
+    if settings.warmup_enabled:
+        # Uvicorn lifespan startup bitmeden istek kabul etmez
+        app.state.warmup = await asyncio.to_thread(warm_up)
+    await start_buffers()
+    yield
+    await stop_buffers()
+
+
 # FastAPI app
 app = FastAPI(
+    lifespan=lifespan,
     title=settings.api_title,
     version=settings.api_version,
     description=settings.api_description,
@@ -37,6 +55,12 @@ app.include_router(feedback.router, prefix="/api")
 app.include_router(skorjin.router, prefix="/api")
 app.include_router(leagues.router, prefix="/api")
 app.include_router(match_data.router, prefix="/api")
+app.include_router(ratings.router, prefix="/api")
+app.include_router(model.router, prefix="/api")
+app.include_router(team_metrics.router, prefix="/api")
+app.include_router(players.router, prefix="/api")
+app.include_router(availability.router, prefix="/api")
+app.include_router(admin.router, prefix="/api")
 
 
 @app.get("/")
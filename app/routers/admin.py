@@ -0,0 +1,63 @@
+"""
+Admin Router - Operasyonel teşhis endpoint'leri
+"""
+from fastapi import APIRouter, HTTPException
+
+from app.config import get_settings
+from app.services.db import pool_stats
+from app.services.query_log import slow_query_log
+from app.services.write_buffer import buffer_stats
+
+router = APIRouter(prefix="/admin", tags=["admin"])
+
+SLOW_QUERY_ORDERS = ("total_ms", "max_ms", "avg_ms", "count")
+
+
+@router.get("/slow-queries")
+async def get_slow_queries(limit: int = 20, order_by: str = "total_ms"):
+    """
+    Eşiği aşan sorgular, normalize edilmiş hâlleriyle gruplanmış.
+    order_by: total_ms, max_ms, avg_ms, count
+    Örneklenen SELECT'lerde EXPLAIN (ANALYZE, BUFFERS) planı 'plan' alanındadır.
+    """
+    if order_by not in SLOW_QUERY_ORDERS:
+        raise HTTPException(status_code=400, detail=f"order_by şunlardan biri olmalı: {', '.join(SLOW_QUERY_ORDERS)}")
+    
+    return {
+        "threshold_ms": slow_query_log.threshold_ms,
+        "explain_sample_rate": slow_query_log.explain_sample_rate,
+        "queries": slow_query_log.top(limit, order_by)
+    }
+
+
+@router.delete("/slow-queries")
+async def reset_slow_queries():
+    """Yavaş sorgu istatistiklerini sıfırla"""
+    slow_query_log.reset()
+    return {"message": "Slow query log cleared"}
+
+
+@router.get("/write-buffers")
+async def get_write_buffers():
+    """Write-behind buffer durumları (kuyruk, flush sayıları)"""
+    return buffer_stats()
+
+
+@router.get("/pool")
+async def get_pool():
+    """
+    Bağlantı havuzu: checked_out/idle/overflow ve checkout bekleme süreleri.
+    Değerler bu worker'a aittir; toplam = workers * değer.
+    """
+    settings = get_settings()
+    return {
+        "config": {
+            "pool_size": settings.db_pool_size,
+            "max_overflow": settings.db_max_overflow,
+            "pool_timeout": settings.db_pool_timeout,
+            "pool_recycle": settings.db_pool_recycle,
+            "pool_pre_ping": settings.db_pool_pre_ping,
+            "statement_timeout_ms": settings.db_statement_timeout_ms
+        },
+        "pools": pool_stats()
+    }
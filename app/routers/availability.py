@@ -0,0 +1,41 @@
+"""
+Takım Eksikleri Router - son bilinen sakat/cezalı oyuncular
+"""
+from fastapi import APIRouter, HTTPException
+from pydantic import BaseModel
+from typing import List
+
+from app.services.availability import get_team_availability, get_team_availability_many
+
+router = APIRouter(prefix="/availability", tags=["Availability"])
+
+MAX_TEAMS = 100
+
+
+class AvailabilityBatchRequest(BaseModel):
+    """Toplu eksik isteği (örn. haftanın fikstüründeki tüm takımlar)"""
+    team_fotmob_ids: List[int]
+
+
+@router.post("/batch")
+def team_availability_batch(request: AvailabilityBatchRequest):
+    """Birden fazla takımın son bilinen eksikleri tek sorguda (istek sırasında)"""
+    if len(request.team_fotmob_ids) > MAX_TEAMS:
+        raise HTTPException(status_code=400, detail=f"En fazla {MAX_TEAMS} takım gönderilebilir")
+
+    return {"teams": get_team_availability_many(request.team_fotmob_ids)}
+
+
+@router.get("/{team_fotmob_id}")
+def team_availability(team_fotmob_id: int):
+    """
+    Takımın son bilinen eksikleri (sakat/cezalı)
+
+    - **team_fotmob_id**: Takım FotMob ID (örn: 8637 = Galatasaray)
+
+    Liste takımın ingest edilen son maçının kadro bilgisinden gelir (`as_of_match`).
+    """
+    availability = get_team_availability(team_fotmob_id)
+    if not availability["known"]:
+        raise HTTPException(status_code=404, detail="Takım için kadro bilgisi yok")
+    return availability
@@ -1,12 +1,13 @@
 """
 Coupons Router - Kupon CRUD işlemleri
 """
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query
 from pydantic import BaseModel
 from typing import Optional, List
 from datetime import datetime
 
-from app.services.db import query_to_df, execute_insert, execute_insert_many
+from app.services.coupons import settle_coupons, settle_coupons_for_predictions, settle_open_coupons
+from app.services.db import query_to_df, execute_insert, execute_insert_many, use_primary
 
 router = APIRouter(tags=["coupons"])
 
@@ -67,6 +68,9 @@ class CouponResponse(BaseModel):
     created_by_email: str
     created_at: datetime
     updated_at: datetime
+    result: Optional[str] = None  # won, lost, void; None = açık
+    settled_odds: Optional[float] = None  # void ayaklar düşülmüş oran
+    settled_at: Optional[datetime] = None
     matches: List[CouponMatchResponse]
 
 
@@ -123,9 +127,12 @@ async def create_coupon(coupon: CouponCreate):
     
     if match_params:
         execute_insert_many(sql_match, match_params)
+        # Ayakları zaten sonuçlanmış tahminlere bağlıysa kupon hemen sonuçlanır
+        settle_coupons_for_predictions(m["prediction_id"] for m in match_params)
     
-    # Oluşturulan kuponu getir
-    return await get_coupon(coupon_id)
+    # Oluşturulan kuponu getir (replica henüz görmemiş olabilir)
+    with use_primary():
+        return await get_coupon(coupon_id)
 
 
 @router.get("/coupons", response_model=List[CouponResponse])
@@ -178,6 +185,18 @@ async def list_coupons(
     return coupons
 
 
+@router.post("/coupons/settle")
+async def sweep_open_coupons(batch_size: int = Query(500, ge=1, le=5000)):
+    """
+    Açık kuponları ayakların tahmin sonuçlarından sonuçlandır (ilk kurulum / periyodik job)
+    
+    Tahmin sonuçlandığında bağlı kuponlar zaten güncellenir; bu uç tüm açık kuponları
+    `batch_size`'lık sayfalarla, sayfa başına tek UPDATE ile tarar.
+    """
+    counts = settle_open_coupons(batch_size)
+    return {"message": f"{counts['checked']} açık kupon kontrol edildi", **counts}
+
+
 def _has_upcoming_matches(matches: List[dict]) -> bool:
     """Kuponda henüz başlamamış maç var mı kontrol et"""
     from datetime import datetime, timezone, timedelta
@@ -278,6 +297,12 @@ async def update_coupon(coupon_id: int, update: CouponUpdate):
     if df.empty:
         raise HTTPException(status_code=404, detail="Kupon bulunamadı")
     
+    if "total_odds" in update_data:
+        # Void ayaksız won kuponun settled_odds'u total_odds'tur: yeniden hesapla
+        settle_coupons([coupon_id])
+        with use_primary():
+            return await get_coupon(coupon_id)
+    
     matches = await _get_coupon_matches(coupon_id)
     return _row_to_response(df.iloc[0], matches)
 
@@ -333,6 +358,9 @@ def _row_to_response(row, matches: List[dict]) -> dict:
         "created_by_email": row["created_by_email"],
         "created_at": row["created_at"],
         "updated_at": row["updated_at"],
+        "result": row["result"] if not pd.isna(row.get("result")) else None,
+        "settled_odds": float(row["settled_odds"]) if not pd.isna(row.get("settled_odds")) else None,
+        "settled_at": row["settled_at"] if not pd.isna(row.get("settled_at")) else None,
         "matches": matches,
     }
 
@@ -2,10 +2,15 @@
 Feedback Router - Kupon, tahmin ve bültenler için beğeni/beğenmeme sistemi
 """
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import JSONResponse
 from pydantic import BaseModel
-from typing import Optional, List
+from typing import Optional, List, Dict
 from datetime import datetime
 from ..services.db import query_to_df
+from ..services.feedback import (
+    toggle_feedback, delete_feedback, get_counts, get_bulk_counts, get_counts_many, get_user_feedbacks,
+    reconcile_counters, feedback_buffer
+)
 
 router = APIRouter()
 
@@ -29,6 +34,14 @@ class FeedbackResponse(BaseModel):
     content_id: str
     feedback_type: str
     created_at: datetime
+    likes: Optional[int] = None  # Toggle sonrası güncel sayılar
+    dislikes: Optional[int] = None
+
+
+class BulkFeedbackCountsRequest(BaseModel):
+    """Toplu feedback sayı isteği şeması"""
+    items: Dict[str, List[str]]  # {content_type: [content_id, ...]}
+    user_id: Optional[str] = None
 
 
 class FeedbackCountResponse(BaseModel):
@@ -40,7 +53,7 @@ class FeedbackCountResponse(BaseModel):
     user_feedback: Optional[str] = None  # Kullanıcının verdiği feedback
 
 
-def _row_to_response(row) -> FeedbackResponse:
+def _row_to_response(row, likes: Optional[int] = None, dislikes: Optional[int] = None) -> FeedbackResponse:
     """DataFrame satırını response modeline çevir"""
     return FeedbackResponse(
         id=int(row['id']),
@@ -48,7 +61,9 @@ def _row_to_response(row) -> FeedbackResponse:
         content_type=row['content_type'],
         content_id=row['content_id'],
         feedback_type=row['feedback_type'],
-        created_at=row['created_at']
+        created_at=row['created_at'],
+        likes=likes,
+        dislikes=dislikes
     )
 
 
@@ -58,46 +73,26 @@ async def create_or_update_feedback(feedback: FeedbackCreate):
     Feedback oluştur veya güncelle.
     Aynı kullanıcı aynı içeriğe tekrar tıklarsa feedback güncellenir.
     Aynı feedback_type'a tekrar tıklarsa feedback silinir (toggle).
+    Tek statement ile çalışır; yanıt güncel beğeni/beğenmeme sayılarını da içerir.
+    Write-behind modunda toggle kuyruğa alınır ve 202 döner.
     """
-    # Mevcut feedback'i kontrol et
-    check_sql = """
-        SELECT id, feedback_type FROM greydb.feedbacks
-        WHERE user_id = %s AND content_type = %s AND content_id = %s
-    """
-    existing = query_to_df(check_sql, (feedback.user_id, feedback.content_type, feedback.content_id))
+    if feedback_buffer.running:
+        await feedback_buffer.put({"op": "toggle", **feedback.model_dump()})
+        return JSONResponse(status_code=202, content={"message": "Feedback queued"})
     
-    if not existing.empty:
-        existing_type = existing.iloc[0]['feedback_type']
-        existing_id = int(existing.iloc[0]['id'])
-        
-        if existing_type == feedback.feedback_type:
-            # Aynı butona tekrar tıklandı - feedback'i sil (toggle off)
-            delete_sql = "DELETE FROM greydb.feedbacks WHERE id = %s"
-            query_to_df(delete_sql, (existing_id,), commit=True)
-            raise HTTPException(status_code=204, detail="Feedback removed")
-        else:
-            # Farklı butona tıklandı - güncelle
-            update_sql = """
-                UPDATE greydb.feedbacks 
-                SET feedback_type = %s
-                WHERE id = %s
-                RETURNING *
-            """
-            result = query_to_df(update_sql, (feedback.feedback_type, existing_id), commit=True)
-            return _row_to_response(result.iloc[0])
+    result = toggle_feedback(
+        feedback.user_id, feedback.content_type, feedback.content_id, feedback.feedback_type
+    )
     
-    # Yeni feedback oluştur
-    insert_sql = """
-        INSERT INTO greydb.feedbacks (user_id, content_type, content_id, feedback_type)
-        VALUES (%s, %s, %s, %s)
-        RETURNING *
-    """
-    result = query_to_df(
-        insert_sql,
-        (feedback.user_id, feedback.content_type, feedback.content_id, feedback.feedback_type),
-        commit=True
+    if result["action"] == "removed":
+        # Aynı butona tekrar tıklandı - feedback silindi (toggle off)
+        raise HTTPException(status_code=204, detail="Feedback removed")
+    
+    return _row_to_response(
+        result["feedback"],
+        likes=result["likes"] + INITIAL_LIKES_OFFSET,
+        dislikes=result["dislikes"]
     )
-    return _row_to_response(result.iloc[0])
 
 
 @router.get("/feedback/counts/{content_type}/{content_id}", response_model=FeedbackCountResponse)
@@ -106,18 +101,9 @@ async def get_feedback_counts(content_type: str, content_id: str, user_id: Optio
     Belirli bir içeriğin feedback sayılarını getir.
     user_id verilirse kullanıcının verdiği feedback de döner.
     """
-    # Feedback sayılarını al
-    count_sql = """
-        SELECT 
-            COUNT(*) FILTER (WHERE feedback_type = 'like') as likes,
-            COUNT(*) FILTER (WHERE feedback_type = 'dislike') as dislikes
-        FROM greydb.feedbacks
-        WHERE content_type = %s AND content_id = %s
-    """
-    counts = query_to_df(count_sql, (content_type, content_id))
-    
-    likes = int(counts.iloc[0]['likes']) + INITIAL_LIKES_OFFSET if not counts.empty else INITIAL_LIKES_OFFSET
-    dislikes = int(counts.iloc[0]['dislikes']) if not counts.empty else 0
+    # Feedback sayılarını sayaç tablosundan al
+    likes, dislikes = get_counts(content_type, content_id)
+    likes += INITIAL_LIKES_OFFSET
     
     # Kullanıcının feedback'ini al
     user_feedback = None
@@ -147,59 +133,79 @@ async def get_bulk_feedback_counts(content_type: str, content_ids: str, user_id:
     """
     ids_list = [id.strip() for id in content_ids.split(',')]
     
-    # Tüm feedback'leri al
-    placeholders = ','.join(['%s'] * len(ids_list))
-    count_sql = f"""
-        SELECT 
-            content_id,
-            COUNT(*) FILTER (WHERE feedback_type = 'like') as likes,
-            COUNT(*) FILTER (WHERE feedback_type = 'dislike') as dislikes
-        FROM greydb.feedbacks
-        WHERE content_type = %s AND content_id IN ({placeholders})
-        GROUP BY content_id
-    """
-    counts = query_to_df(count_sql, (content_type, *ids_list))
+    # Sayaçları al
+    counts_dict = get_bulk_counts(content_type, ids_list)
     
     # Kullanıcı feedback'lerini al
     user_feedbacks = {}
     if user_id:
-        user_sql = f"""
-            SELECT content_id, feedback_type FROM greydb.feedbacks
-            WHERE user_id = %s AND content_type = %s AND content_id IN ({placeholders})
-        """
-        user_result = query_to_df(user_sql, (user_id, content_type, *ids_list))
-        for _, row in user_result.iterrows():
-            user_feedbacks[row['content_id']] = row['feedback_type']
+        user_feedbacks = get_user_feedbacks(user_id, [(content_type, content_id) for content_id in ids_list])
     
     # Sonuçları oluştur
     results = []
-    counts_dict = {}
-    for _, row in counts.iterrows():
-        counts_dict[row['content_id']] = {
-            'likes': int(row['likes']),
-            'dislikes': int(row['dislikes'])
-        }
-    
     for content_id in ids_list:
-        data = counts_dict.get(content_id, {'likes': 0, 'dislikes': 0})
+        likes, dislikes = counts_dict.get(content_id, (0, 0))
         results.append(FeedbackCountResponse(
             content_type=content_type,
             content_id=content_id,
-            likes=data['likes'] + INITIAL_LIKES_OFFSET,
-            dislikes=data['dislikes'],
-            user_feedback=user_feedbacks.get(content_id)
+            likes=likes + INITIAL_LIKES_OFFSET,
+            dislikes=dislikes,
+            user_feedback=user_feedbacks.get((content_type, content_id))
         ))
     
     return results
 
 
+@router.post("/feedback/bulk-counts", response_model=List[FeedbackCountResponse])
+async def get_batch_feedback_counts(request: BulkFeedbackCountsRequest):
+    """
+    Farklı içerik tiplerinin feedback sayılarını tek istekte getir (ana sayfa feed'i için).
+    Sayılar paylaşılan kısa TTL cache'ten gelir; sadece kullanıcının kendi
+    feedback'leri her istekte ayrı sorgulanır.
+    
+    Örnek body: {"items": {"prediction": ["1", "2"], "coupon": ["7"]}, "user_id": "..."}
+    """
+    keys = list(dict.fromkeys(
+        (content_type, str(content_id))
+        for content_type, content_ids in request.items.items()
+        for content_id in content_ids
+    ))
+    
+    counts = get_counts_many(keys)
+    user_feedbacks = get_user_feedbacks(request.user_id, keys) if request.user_id else {}
+    
+    return [
+        FeedbackCountResponse(
+            content_type=content_type,
+            content_id=content_id,
+            likes=counts[(content_type, content_id)][0] + INITIAL_LIKES_OFFSET,
+            dislikes=counts[(content_type, content_id)][1],
+            user_feedback=user_feedbacks.get((content_type, content_id))
+        )
+        for content_type, content_id in keys
+    ]
+
+
 @router.delete("/feedback/{content_type}/{content_id}")
 async def delete_user_feedback(content_type: str, content_id: str, user_id: str):
     """Kullanıcının feedback'ini sil"""
-    delete_sql = """
-        DELETE FROM greydb.feedbacks
-        WHERE user_id = %s AND content_type = %s AND content_id = %s
-    """
-    query_to_df(delete_sql, (user_id, content_type, content_id), commit=True)
+    if feedback_buffer.running:
+        # Kuyruktaki toggle'lardan sonra uygulanmalı: aynı kuyruktan geçer
+        await feedback_buffer.put({
+            "op": "delete", "user_id": user_id, "content_type": content_type, "content_id": content_id
+        })
+        return JSONResponse(status_code=202, content={"message": "Feedback delete queued"})
+    
+    delete_feedback(user_id, content_type, content_id)
     return {"message": "Feedback deleted"}
 
+
+@router.post("/feedback/reconcile-counters")
+async def reconcile_feedback_counters():
+    """
+    Sayaç tablosunu greydb.feedbacks'ten yeniden hesapla (periyodik job).
+    Yazma yolundaki olası sapmaları düzeltir.
+    """
+    fixed = reconcile_counters()
+    return {"message": f"{fixed} sayaç düzeltildi", "fixed": fixed}
+
@@ -1,14 +1,19 @@
 """
 Takım Form Endpoint'leri
 """
-from fastapi import APIRouter, Query
-from app.services.stats import get_team_form, get_team_form_by_name
+from typing import List
+
+from fastapi import APIRouter, HTTPException, Query
+from app.services.stats import get_team_form, get_team_form_by_name, get_team_form_summary
 
 router = APIRouter(prefix="/form", tags=["Form"])
 
+# Handler'lar sync tanımlı: FastAPI threadpool'da çalıştırır, böylece aynı
+# anahtarlı eşzamanlı istekler stats servisindeki single-flight ile birleşir.
+
 
 @router.get("/by-name/{team_name}")
-async def team_form_by_name(
+def team_form_by_name(
     team_name: str,
     limit: int = Query(5, ge=1, le=20, description="Maç sayısı"),
     venue: str = Query(None, description="home, away veya boş (genel)")
@@ -28,7 +33,7 @@ async def team_form_by_name(
 
 
 @router.get("/{team_fotmob_id}")
-async def team_form(
+def team_form(
     team_fotmob_id: int,
     limit: int = Query(5, ge=1, le=20, description="Maç sayısı"),
     venue: str = Query(None, description="home, away veya boş (genel)"),
@@ -50,8 +55,31 @@ async def team_form(
     )
 
 
+@router.get("/{team_fotmob_id}/summary")
+def team_form_summary(
+    team_fotmob_id: int,
+    windows: List[int] = Query([5, 10], description="Maç sayıları (en fazla 4 değer, her biri 1-20)"),
+    league_id: int = Query(None, description="Lig formu için lig FotMob ID (boş = son maçın ligi)")
+):
+    """
+    Takım kartı - genel, ev, deplasman ve lig formu, her pencere için tek yanıtta
+    
+    - **team_fotmob_id**: Takım FotMob ID (örn: 8637 = Galatasaray)
+    - **windows**: Örn `?windows=5&windows=10`
+    - **league_id**: Lig formu filtresi (örn: 71 = Süper Lig)
+    """
+    if not 1 <= len(windows) <= 4 or not all(1 <= w <= 20 for w in windows):
+        raise HTTPException(status_code=400, detail="windows: 1-4 değer, her biri 1-20 arası")
+    
+    return get_team_form_summary(
+        team_fotmob_id=team_fotmob_id,
+        windows=tuple(windows),
+        league_fotmob_id=league_id
+    )
+
+
 @router.get("/{team_fotmob_id}/home")
-async def team_home_form(
+def team_home_form(
     team_fotmob_id: int,
     limit: int = Query(5, ge=1, le=20)
 ):
@@ -60,7 +88,7 @@ async def team_home_form(
 
 
 @router.get("/{team_fotmob_id}/away")
-async def team_away_form(
+def team_away_form(
     team_fotmob_id: int,
     limit: int = Query(5, ge=1, le=20)
 ):
@@ -69,7 +97,7 @@ async def team_away_form(
 
 
 @router.get("/{team_fotmob_id}/league/{league_fotmob_id}")
-async def team_league_form(
+def team_league_form(
     team_fotmob_id: int,
     league_fotmob_id: int,
     limit: int = Query(5, ge=1, le=20)
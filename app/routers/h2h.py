@@ -1,14 +1,60 @@
 """
 Head-to-Head Endpoint'leri
 """
-from fastapi import APIRouter, Query
-from app.services.stats import get_h2h
+from fastapi import APIRouter, HTTPException, Query
+from pydantic import BaseModel, Field
+from typing import List, Optional
+from app.services.stats import get_h2h, get_h2h_matrix, get_round_fixtures
 
 router = APIRouter(prefix="/h2h", tags=["H2H"])
 
+MAX_FIXTURES = 100
+
+
+class H2HPair(BaseModel):
+    """Eşleşme (team1 genelde ev sahibi)"""
+    team1_fotmob_id: int
+    team2_fotmob_id: int
+
+
+class H2HMatrixRequest(BaseModel):
+    """Toplu H2H isteği: fikstür listesi veya lig + hafta"""
+    fixtures: Optional[List[H2HPair]] = None
+    league_id: Optional[int] = None  # Lig FotMob ID (round ile)
+    round: Optional[int] = None  # Lig haftası (son oynandığı sezon)
+    limit: int = Field(10, ge=1, le=50)  # Çift başına son maç sayısı
+
+# Sync handler: threadpool'da çalışır, eşzamanlı aynı istekler single-flight ile birleşir.
+
+
+@router.post("/matrix")
+def head_to_head_matrix(request: H2HMatrixRequest):
+    """
+    Birden fazla eşleşmenin H2H özeti tek istekte (tek sorgu)
+    
+    - **fixtures**: `[{"team1_fotmob_id": 8637, "team2_fotmob_id": 8695}, ...]`
+    - **league_id + round**: Fikstür yerine lig haftasının tüm eşleşmeleri
+    
+    Her eşleşme için /h2h/{team1}/{team2} ile aynı stats alanları (maç listesi hariç).
+    """
+    if request.fixtures is not None:
+        fixtures = [(f.team1_fotmob_id, f.team2_fotmob_id) for f in request.fixtures]
+    elif request.league_id is not None and request.round is not None:
+        fixtures = get_round_fixtures(request.league_id, request.round)
+    else:
+        raise HTTPException(status_code=400, detail="fixtures veya league_id + round gerekli")
+    
+    if len(fixtures) > MAX_FIXTURES:
+        raise HTTPException(status_code=400, detail=f"En fazla {MAX_FIXTURES} eşleşme gönderilebilir")
+    
+    return {
+        "limit": request.limit,
+        "fixtures": get_h2h_matrix(tuple(fixtures), limit=request.limit)
+    }
+
 
 @router.get("/{team1_fotmob_id}/{team2_fotmob_id}")
-async def head_to_head(
+def head_to_head(
     team1_fotmob_id: int,
     team2_fotmob_id: int,
     limit: int = Query(10, ge=1, le=50, description="Maç sayısı"),
@@ -1,11 +1,12 @@
 """
 Leagues Router - League name lookup endpoints
 """
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query
 from typing import List, Optional
 from pydantic import BaseModel
 
 from app.services.db import query_to_df
+from app.services.standings import get_standings
 
 router = APIRouter(tags=["leagues"])
 
@@ -33,6 +34,25 @@ async def get_league_by_id(league_id: int):
     }
 
 
+@router.get("/leagues/{league_id}/standings")
+def get_league_standings(
+    league_id: int,
+    season: Optional[str] = Query(None, description="Sezon (örn. 2024/2025); boşsa son sezon")
+):
+    """
+    Puan durumu - ingest edilen bitmiş maçlardan
+    
+    - **league_id**: Lig FotMob ID
+    - **season**: '2024/2025' veya '2024' (sezon 1 Temmuz'da başlar)
+    
+    Sıralama: puan, averaj, atılan gol, galibiyet, takım adı. Her takım için ev/deplasman ayrımı döner.
+    """
+    try:
+        return get_standings(league_id, season)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
 @router.post("/leagues/batch", response_model=dict)
 async def get_leagues_batch(league_ids: List[int]):
     """Get multiple league names by IDs"""
@@ -6,13 +6,18 @@ Maç Verisi Yönetimi Router
 """
 from fastapi import APIRouter, HTTPException, BackgroundTasks
 from pydantic import BaseModel
-from typing import Optional, List
+from typing import Optional, List, Dict
 from datetime import datetime, timedelta
-import httpx
+import json
 import asyncio
 
+from app.config import get_settings
 from app.services.db import execute_query, execute_insert
-from app.services.match_saver import save_full_match_data
+from app.services.match_saver import save_full_match_data, save_match_period_stats
+from app.services.match_parser import parse_match_period_stats
+from app.services.ingest_metrics import ingest_metrics, trace_match, stage
+
+settings = get_settings()
 
 router = APIRouter(
     prefix="/match-data",
@@ -20,7 +25,7 @@ router = APIRouter(
 )
 
 # FotMob API config
-FOTMOB_API_URL = "https://www.fotmob.com/api"
+FOTMOB_API_URL = settings.fotmob_api_url
 FOTMOB_HEADERS = {
     "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
     "Accept": "application/json",
@@ -49,6 +54,13 @@ class FinishedMatchInfo(BaseModel):
     finished: bool
 
 
+class MatchTiming(BaseModel):
+    fotmob_match_id: int
+    total_ms: float
+    stages: Dict[str, float]  # aşama -> ms (fetch, parse, extract, save_*, mark_processed)
+    rows: Dict[str, int]  # aşama -> yazılan satır
+
+
 class ProcessResult(BaseModel):
     total_checked: int
     finished_count: int
@@ -56,10 +68,13 @@ class ProcessResult(BaseModel):
     error_count: int
     errors: List[str]
     finished_matches: List[FinishedMatchInfo]
+    timings: Optional[List[MatchTiming]] = None
 
 
 async def fetch_match_details(match_id: int) -> dict:
     """FotMob API'den maç detaylarını çek"""
+    import httpx
+    
     url = f"{FOTMOB_API_URL}/matchDetails?matchId={match_id}"
     
     async with httpx.AsyncClient(timeout=30.0) as client:
@@ -235,7 +250,8 @@ async def check_finished_matches(match_ids: List[int]):
 async def process_finished_matches(
     fotmob_league_id: Optional[int] = None,
     limit_per_league: int = 20,
-    dry_run: bool = False
+    dry_run: bool = False,
+    include_timings: bool = False
 ):
     """
     Bitmiş maçları tespit et ve veritabanına kaydet.
@@ -247,6 +263,7 @@ async def process_finished_matches(
         fotmob_league_id: Opsiyonel lig filtresi
         limit_per_league: Her lig için maksimum kontrol edilecek maç sayısı
         dry_run: True ise sadece kontrol et, kaydetme
+        include_timings: True ise maç başına aşama süreleri ve satır sayıları döner
     """
     result = ProcessResult(
         total_checked=0,
@@ -254,7 +271,8 @@ async def process_finished_matches(
         processed_count=0,
         error_count=0,
         errors=[],
-        finished_matches=[]
+        finished_matches=[],
+        timings=[] if include_timings else None
     )
     
     # 1. Ligleri al
@@ -307,61 +325,68 @@ async def process_finished_matches(
             fotmob_match_id = match["fotmob_match_id"]
             
             try:
-                data = await fetch_match_details(fotmob_match_id)
-                info = parse_match_info(data)
-                
-                # Maç bitti mi?
-                if info["finished"] and info["home_score"] is not None and info["away_score"] is not None:
-                    result.finished_count += 1
+                with trace_match(fotmob_match_id) as trace:
+                    with stage("fetch"):
+                        data = await fetch_match_details(fotmob_match_id)
+                    with stage("parse"):
+                        info = parse_match_info(data)
                     
-                    finished_info = FinishedMatchInfo(
-                        id=match["id"],
-                        fotmob_match_id=fotmob_match_id,
-                        home_team_name=info["home_team_name"],
-                        away_team_name=info["away_team_name"],
-                        home_score=info["home_score"],
-                        away_score=info["away_score"],
-                        finished=True
-                    )
-                    result.finished_matches.append(finished_info)
+                    # Maç bitti mi?
+                    if info["finished"] and info["home_score"] is not None and info["away_score"] is not None:
+                        result.finished_count += 1
+                        
+                        finished_info = FinishedMatchInfo(
+                            id=match["id"],
+                            fotmob_match_id=fotmob_match_id,
+                            home_team_name=info["home_team_name"],
+                            away_team_name=info["away_team_name"],
+                            home_score=info["home_score"],
+                            away_score=info["away_score"],
+                            finished=True
+                        )
+                        result.finished_matches.append(finished_info)
+                        
+                        if not dry_run:
+                            # Tüm ilgili tablolara kaydet (fotmob_to_db.py gibi)
+                            try:
+                                # save_full_match_data tüm tabloları doldurur:
+                                # - matches (raw_match_details dahil)
+                                # - match_stats (xG, shots, possession, etc.)
+                                # - match_advanced_stats (55 kolon)
+                                # - match_context (stadium, referee, weather)
+                                # - match_formations
+                                # - match_lineups (kadro, market value, age, rating)
+                                # - match_player_stats (oyuncu istatistikleri)
+                                # - match_events (gol, kart, değişiklik)
+                                # - player_availability (sakatlık, ceza)
+                                # - h2h_stats
+                                match_id = save_full_match_data(data)
+                                
+                                # upcoming_matches'ta is_processed=true yap
+                                mark_processed_query = """
+                                    UPDATE public.upcoming_matches 
+                                    SET is_processed = true, updated_at = NOW()
+                                    WHERE id = :id
+                                """
+                                with stage("mark_processed"):
+                                    execute_insert(mark_processed_query, {"id": match["id"]})
+                                
+                                result.processed_count += 1
+                                
+                            except Exception as e:
+                                result.error_count += 1
+                                result.errors.append(f"{match['home_team_name']} vs {match['away_team_name']}: {str(e)}")
+                    else:
+                        # Maç henüz bitmemiş (ertelenmiş veya gelecek maç olabilir)
+                        # BREAK YAPMA - diğer maçları kontrol etmeye devam et
+                        # Çünkü ertelenmiş maçlar tarih sırasını bozabilir
+                        pass
                     
-                    if not dry_run:
-                        # Tüm ilgili tablolara kaydet (fotmob_to_db.py gibi)
-                        try:
-                            # save_full_match_data tüm tabloları doldurur:
-                            # - matches (raw_match_details dahil)
-                            # - match_stats (xG, shots, possession, etc.)
-                            # - match_advanced_stats (55 kolon)
-                            # - match_context (stadium, referee, weather)
-                            # - match_formations
-                            # - match_lineups (kadro, market value, age, rating)
-                            # - match_player_stats (oyuncu istatistikleri)
-                            # - match_events (gol, kart, değişiklik)
-                            # - player_availability (sakatlık, ceza)
-                            # - h2h_stats
-                            match_id = save_full_match_data(data)
-                            
-                            # upcoming_matches'ta is_processed=true yap
-                            mark_processed_query = """
-                                UPDATE public.upcoming_matches 
-                                SET is_processed = true, updated_at = NOW()
-                                WHERE id = :id
-                            """
-                            execute_insert(mark_processed_query, {"id": match["id"]})
-                            
-                            result.processed_count += 1
-                            
-                        except Exception as e:
-                            result.error_count += 1
-                            result.errors.append(f"{match['home_team_name']} vs {match['away_team_name']}: {str(e)}")
-                else:
-                    # Maç henüz bitmemiş (ertelenmiş veya gelecek maç olabilir)
-                    # BREAK YAPMA - diğer maçları kontrol etmeye devam et
-                    # Çünkü ertelenmiş maçlar tarih sırasını bozabilir
-                    pass
+                if include_timings:
+                    result.timings.append(MatchTiming(**trace.as_dict()))
                 
                 # Rate limiting
-                await asyncio.sleep(0.3)
+                await asyncio.sleep(settings.fotmob_request_delay)
                 
             except Exception as e:
                 result.error_count += 1
@@ -415,6 +440,64 @@ async def refill_missing_data(limit: int = 20):
     }
 
 
+@router.post("/backfill-period-stats")
+async def backfill_period_stats(limit: int = 200, after_id: int = 0):
+    """
+    match_period_stats'ı olmayan eski maçlar için devre istatistiklerini
+    raw_match_details'ten doldur (diğer tablolara dokunmaz).
+    Devre verisi olmayan maçlar atlanır; sonraki sayfa için dönen last_id'yi after_id olarak verin.
+    """
+    query = """
+        SELECT m.id, m.fotmob_match_id, m.raw_match_details
+        FROM public.matches m
+        WHERE m.raw_match_details IS NOT NULL
+        AND m.finished = true
+        AND m.id > :after_id
+        AND NOT EXISTS (
+            SELECT 1 FROM public.match_period_stats ps WHERE ps.match_id = m.id
+        )
+        ORDER BY m.id
+        LIMIT :limit
+    """
+    matches = execute_query(query, {"limit": limit, "after_id": after_id})
+    
+    filled_count = 0
+    errors = []
+    
+    for match in matches:
+        try:
+            match_data = match["raw_match_details"]
+            if isinstance(match_data, str):
+                match_data = json.loads(match_data)
+            
+            rows = parse_match_period_stats(match_data)
+            save_match_period_stats(match["id"], rows)
+            if rows:
+                filled_count += 1
+        except Exception as e:
+            errors.append(f"Match {match['fotmob_match_id']}: {str(e)}")
+    
+    return {
+        "total_found": len(matches),
+        "filled": filled_count,
+        "last_id": matches[-1]["id"] if matches else None,
+        "errors": errors
+    }
+
+
+@router.get("/metrics")
+async def get_ingest_metrics(reset: bool = False):
+    """
+    Ingest aşama metrikleri (process-finished çağrıları boyunca birikir):
+    aşama başına süre (avg/p50/p95/max), yazılan satır sayısı ve son yavaş maçlar.
+    reset=true ile okuduktan sonra sıfırlanır.
+    """
+    snapshot = ingest_metrics.snapshot()
+    if reset:
+        ingest_metrics.reset()
+    return snapshot
+
+
 @router.get("/stats")
 async def get_match_data_stats():
     """
@@ -0,0 +1,44 @@
+"""
+Model Router - Fikstürler için skor olasılıkları (Poisson)
+"""
+from fastapi import APIRouter, HTTPException
+from pydantic import BaseModel, Field
+from typing import List
+
+from app.services.model import evaluate_fixtures
+
+router = APIRouter(prefix="/model", tags=["Model"])
+
+MAX_FIXTURES = 200
+
+
+class FixtureInput(BaseModel):
+    """Değerlendirilecek maç"""
+    home_team_fotmob_id: int
+    away_team_fotmob_id: int
+
+
+class FixturesRequest(BaseModel):
+    """Toplu model isteği şeması (örn. bir haftanın tüm maçları)"""
+    fixtures: List[FixtureInput]
+    matches: int = Field(10, ge=1, le=50)  # Takım gücü için son maç sayısı
+    max_goals: int = Field(10, ge=5, le=15)  # Skor matrisinde takım başına en fazla gol
+
+
+@router.post("/fixtures")
+def model_fixtures(request: FixturesRequest):
+    """
+    Fikstür başına beklenen goller, 1X2, alt/üst (0.5-4.5), KG var/yok ve en olası skor.
+
+    Takım gücü son `matches` maçtan (genel form) hesaplanır; tüm fikstürler tek sorgu
+    ve tek vektörel hesapla değerlendirilir. Olasılıklar tahmin girişindeki
+    `probability` alanı için öneridir.
+    """
+    if len(request.fixtures) > MAX_FIXTURES:
+        raise HTTPException(status_code=400, detail=f"En fazla {MAX_FIXTURES} fikstür gönderilebilir")
+
+    fixtures = [(f.home_team_fotmob_id, f.away_team_fotmob_id) for f in request.fixtures]
+    return {
+        "matches": request.matches,
+        "fixtures": evaluate_fixtures(fixtures, matches=request.matches, max_goals=request.max_goals)
+    }
@@ -0,0 +1,56 @@
+"""
+Oyuncu Endpoint'leri - sezon toplamları, son maç formu, lig krallıkları
+"""
+from fastapi import APIRouter, HTTPException, Query
+from typing import Optional
+
+from app.services.players import LEADER_METRICS, get_league_leaders, get_player_form, rebuild_season_stats
+
+router = APIRouter(prefix="/players", tags=["Players"])
+
+
+@router.get("/leaders/{league_id}")
+def league_leaders(
+    league_id: int,
+    metric: str = Query("goals", description=f"{', '.join(LEADER_METRICS)}"),
+    season: Optional[str] = Query(None, description="Sezon (örn. 2024/2025); boşsa son sezon"),
+    limit: int = Query(20, ge=1, le=100),
+    min_minutes: int = Query(0, ge=0, description="En az oynanan dakika")
+):
+    """
+    Lig krallığı - gol krallığı (metric=goals), xG (metric=xg), asist ...
+
+    - **league_id**: Lig FotMob ID (örn: 71 = Süper Lig)
+    - **season**: '2024/2025' veya '2024' (sezon 1 Temmuz'da başlar)
+    """
+    try:
+        return get_league_leaders(league_id, metric, season, limit, min_minutes)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.post("/season-stats/rebuild")
+def rebuild_player_season_stats():
+    """Oyuncu sezon toplamlarını match_player_stats'tan yeniden hesapla (periyodik düzeltme)"""
+    rows = rebuild_season_stats()
+    return {"message": f"{rows} oyuncu-sezon satırı yeniden hesaplandı", "rows": rows}
+
+
+@router.get("/{player_id}/form")
+def player_form(
+    player_id: int,
+    season: Optional[str] = Query(None, description="Sezon (örn. 2024/2025); boşsa son sezon"),
+    matches: int = Query(5, ge=1, le=20, description="Son maç sayısı")
+):
+    """
+    Oyuncu formu - son maçlar ve sezon toplamları (lig başına, 90 dakika başına gol/xG)
+
+    - **player_id**: Oyuncu FotMob ID
+    """
+    try:
+        form = get_player_form(player_id, season, matches)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if form is None:
+        raise HTTPException(status_code=404, detail="Oyuncu için maç verisi yok")
+    return form
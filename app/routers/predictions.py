@@ -1,15 +1,20 @@
 """
 Predictions Router - Tahmin CRUD işlemleri
 """
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query
 from pydantic import BaseModel
 from typing import Optional, List
 from datetime import datetime
 
-from app.services.db import execute_query, query_to_df
+from app.config import get_settings
+from app.services.db import PreparedStatement, execute_query, query_to_df
+from app.services.coupons import settle_coupons_for_predictions
+from app.services.tipsters import LEADERBOARD_ORDERS, get_leaderboard, rebuild_tipster_stats, refresh_tipster_stats
 
 router = APIRouter(tags=["predictions"])
 
+PREDICTION_BY_ID = PreparedStatement("prediction_by_id", "SELECT * FROM greydb.predictions WHERE id = :id")
+
 
 class PredictionCreate(BaseModel):
     """Tahmin oluşturma şeması"""
@@ -151,11 +156,35 @@ async def list_predictions(
     return [_row_to_response(row) for _, row in df.iterrows()]
 
 
+@router.get("/predictions/leaderboard")
+async def tipster_leaderboard(
+    order_by: str = Query("roi", description=f"{', '.join(LEADERBOARD_ORDERS)}"),
+    min_settled: int = Query(10, ge=0, description="En az sonuçlanmış tahmin"),
+    limit: int = Query(20, ge=1, le=100)
+):
+    """
+    Tahminci sıralaması - isabet oranı, ROI (birim bahis), seriler
+    
+    Yazar başına toplamlar sonuç değiştikçe güncellenir; okuma tahmin tablosunu taramaz.
+    """
+    try:
+        leaderboard = get_leaderboard(order_by, min_settled, limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"order_by": order_by, "min_settled": min_settled, "leaderboard": leaderboard}
+
+
+@router.post("/predictions/leaderboard/rebuild")
+async def rebuild_tipster_leaderboard():
+    """Tüm yazarların toplamlarını tahminlerden yeniden hesapla (ilk kurulum / periyodik job)"""
+    authors = rebuild_tipster_stats()
+    return {"message": f"{authors} tahminci güncellendi", "authors": authors}
+
+
 @router.get("/predictions/{prediction_id}", response_model=PredictionResponse)
 async def get_prediction(prediction_id: int):
     """Tahmin detayı getir"""
-    sql = "SELECT * FROM greydb.predictions WHERE id = :id"
-    df = query_to_df(sql, {"id": prediction_id})
+    df = PREDICTION_BY_ID.to_df({"id": prediction_id})
     
     if df.empty:
         raise HTTPException(status_code=404, detail="Tahmin bulunamadı")
@@ -190,18 +219,27 @@ async def update_prediction(prediction_id: int, update: PredictionUpdate):
     if df.empty:
         raise HTTPException(status_code=404, detail="Tahmin bulunamadı")
     
+    if {"result", "odds"} & update_data.keys():
+        refresh_tipster_stats([df.iloc[0]["created_by_email"]])
+        settle_coupons_for_predictions([prediction_id])
+    
     return _row_to_response(df.iloc[0])
 
 
 @router.delete("/predictions/{prediction_id}")
 async def delete_prediction(prediction_id: int):
     """Tahmin sil"""
-    sql = "DELETE FROM greydb.predictions WHERE id = :id RETURNING id"
+    sql = "DELETE FROM greydb.predictions WHERE id = :id RETURNING id, created_by_email, result"
     df = query_to_df(sql, {"id": prediction_id}, commit=True)
     
     if df.empty:
         raise HTTPException(status_code=404, detail="Tahmin bulunamadı")
     
+    if df.iloc[0]["result"] in ("won", "lost", "void"):
+        refresh_tipster_stats([df.iloc[0]["created_by_email"]])
+    # Silinen tahmine bağlı ayak artık sonuçlanamaz: kupon açığa döner
+    settle_coupons_for_predictions([prediction_id])
+    
     return {"message": "Tahmin silindi", "id": prediction_id}
 
 
@@ -235,6 +273,8 @@ async def check_prediction_results():
     updated = 0
     problems = 0
     results = []
+    settled_authors = set()
+    settled_ids = []
     
     for _, prediction in df.iterrows():
         pred_id = int(prediction["id"])
@@ -283,7 +323,7 @@ async def check_prediction_results():
                         if match_id_match:
                             fotmob_match_id = match_id_match.group(1)
                             async with httpx.AsyncClient(timeout=10.0) as client:
-                                fotmob_api_url = f"https://www.fotmob.com/api/matchDetails?matchId={fotmob_match_id}"
+                                fotmob_api_url = f"{get_settings().fotmob_api_url}/matchDetails?matchId={fotmob_match_id}"
                                 response = await client.get(fotmob_api_url)
                                 if response.status_code == 200:
                                     data = response.json()
@@ -320,6 +360,8 @@ async def check_prediction_results():
                     WHERE id = :id
                 """
                 query_to_df(update_sql, {"id": pred_id, "result": result}, commit=True)
+                settled_authors.add(prediction["created_by_email"])
+                settled_ids.append(pred_id)
                 updated += 1
                 results.append({"id": pred_id, "status": "updated", "result": result})
             else:
@@ -340,11 +382,17 @@ async def check_prediction_results():
             except:
                 pass
     
+    # Sıralama: sonucu değişen yazarlar tek statement'ta
+    refresh_tipster_stats(settled_authors)
+    # Kuponlar: sonuçlanan tahminlere bağlı kuponlar tek statement'ta
+    coupons = settle_coupons_for_predictions(settled_ids)
+    
     return {
         "message": f"{len(df)} tahmin kontrol edildi",
         "checked": len(df),
         "updated": updated,
         "problems": problems,
+        "coupons_settled": coupons["updated"],
         "results": results
     }
 
@@ -0,0 +1,49 @@
+"""
+Takım Rating (Elo) Endpoint'leri
+"""
+from fastapi import APIRouter, HTTPException, Query
+from app.services.ratings import rating_table
+
+router = APIRouter(prefix="/ratings", tags=["Ratings"])
+
+# Sync handler'lar: ilk istekte tablo DB'den kurulur (threadpool'da bloklar),
+# sonraki okumalar bellekten döner.
+
+
+@router.get("/league/{league_id}")
+def league_ratings(
+    league_id: int,
+    limit: int = Query(None, ge=1, le=100, description="İlk N takım")
+):
+    """
+    Ligin takımları, Elo rating'e göre azalan
+
+    - **league_id**: Lig FotMob ID (ligde son sezonda oynamış takımlar)
+    """
+    return {"league_id": league_id, "ratings": rating_table.league(league_id, limit)}
+
+
+@router.get("/status")
+def ratings_status():
+    """Rating tablosu durumu (takım/maç sayısı, son senkron)"""
+    return rating_table.status()
+
+
+@router.post("/rebuild")
+def rebuild_ratings():
+    """Tüm bitmiş maçları baştan oynatarak tabloyu yeniden kur (bu worker)"""
+    applied = rating_table.rebuild()
+    return {"matches_applied": applied, **rating_table.status()}
+
+
+@router.get("/{team_fotmob_id}")
+def team_rating(team_fotmob_id: int):
+    """
+    Takımın Elo rating'i ve tüm takımlar içindeki sırası
+
+    - **team_fotmob_id**: Takım FotMob ID (örn: 8637 = Galatasaray)
+    """
+    rating = rating_table.team(team_fotmob_id)
+    if rating is None:
+        raise HTTPException(status_code=404, detail="Takım için bitmiş maç yok")
+    return rating
@@ -1,12 +1,17 @@
 """
 Skorjin Router - Skorjin konuşmaları ve feedback işlemleri
 """
+import asyncio
+
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import JSONResponse
 from pydantic import BaseModel
 from typing import Optional, List
 from datetime import datetime
 
 from app.services.db import query_to_df
+from app.services.feedback import toggle_feedback, get_counts, feedback_buffer
+from app.services.skorjin import conversation_buffer, reserve_conversation_id
 
 router = APIRouter(tags=["skorjin"])
 
@@ -44,11 +49,27 @@ class MessageFeedbackResponse(BaseModel):
     user_id: str
     feedback_type: str
     created_at: datetime
+    up_votes: Optional[int] = None  # Toggle sonrası güncel sayılar
+    down_votes: Optional[int] = None
 
 
 @router.post("/skorjin/conversations", response_model=ConversationResponse)
 async def save_conversation(conversation: ConversationCreate):
     """Skorjin konuşmasını kaydet"""
+    if conversation_buffer.running:
+        # Write-behind: ID'yi önceden ayır, satırı kuyruğa koy, commit'i bekleme.
+        # Blok bitince ayırma DB'ye gider: event loop'u bloklamasın diye thread'de
+        row = {
+            "id": await asyncio.to_thread(reserve_conversation_id),
+            "user_id": conversation.user_id,
+            "user_email": conversation.user_email,
+            "user_message": conversation.user_message,
+            "skorjin_response": conversation.skorjin_response,
+            "created_at": datetime.now()
+        }
+        await conversation_buffer.put(row)
+        return row
+    
     sql = """
         INSERT INTO greydb.skorjin_conversations (
             user_id, user_email, user_message, skorjin_response
@@ -144,38 +165,28 @@ async def save_message_feedback(feedback: MessageFeedbackCreate):
     content_id = str(feedback.conversation_id)
     content_type = "skorjin_message"
     
-    # Mevcut feedback kontrol et
-    check_sql = """
-        SELECT id, feedback_type FROM greydb.feedbacks
-        WHERE content_type = %s AND content_id = %s AND user_id = %s
-    """
-    existing_df = query_to_df(check_sql, (content_type, content_id, feedback.user_id))
-    
-    if not existing_df.empty:
-        existing_id = existing_df.iloc[0]['id']
-        existing_type = existing_df.iloc[0]['feedback_type']
-        
-        if existing_type == feedback.feedback_type:
-            # Aynı feedback tekrarlandıysa sil (toggle off)
-            delete_sql = "DELETE FROM greydb.feedbacks WHERE id = %s"
-            query_to_df(delete_sql, (existing_id,), commit=True)
-            raise HTTPException(status_code=200, detail="Feedback removed")
-        else:
-            # Farklı feedback verdiyse güncelle
-            update_sql = """
-                UPDATE greydb.feedbacks SET feedback_type = %s
-                WHERE id = %s RETURNING *
-            """
-            updated_df = query_to_df(update_sql, (feedback.feedback_type, existing_id), commit=True)
-            return _row_to_feedback_response(updated_df.iloc[0])
-    else:
-        # Yeni feedback ekle
-        insert_sql = """
-            INSERT INTO greydb.feedbacks (content_type, content_id, user_id, feedback_type)
-            VALUES (%s, %s, %s, %s) RETURNING *
-        """
-        inserted_df = query_to_df(insert_sql, (content_type, content_id, feedback.user_id, feedback.feedback_type), commit=True)
-        return _row_to_feedback_response(inserted_df.iloc[0])
+    if feedback_buffer.running:
+        # Write-behind: toggle sırayla arka planda uygulanır
+        await feedback_buffer.put({
+            "op": "toggle",
+            "user_id": feedback.user_id,
+            "content_type": content_type,
+            "content_id": content_id,
+            "feedback_type": feedback.feedback_type
+        })
+        return JSONResponse(status_code=202, content={"message": "Feedback queued"})
+    
+    result = toggle_feedback(feedback.user_id, content_type, content_id, feedback.feedback_type)
+    
+    if result["action"] == "removed":
+        # Aynı feedback tekrarlandıysa silindi (toggle off)
+        raise HTTPException(status_code=200, detail="Feedback removed")
+    
+    return {
+        **_row_to_feedback_response(result["feedback"]),
+        "up_votes": result["likes"],
+        "down_votes": result["dislikes"]
+    }
 
 
 @router.get("/skorjin/feedback/{conversation_id}")
@@ -184,22 +195,12 @@ async def get_message_feedback_counts(conversation_id: int):
     content_id = str(conversation_id)
     content_type = "skorjin_message"
     
-    sql = """
-        SELECT 
-            COALESCE(SUM(CASE WHEN feedback_type = 'like' THEN 1 ELSE 0 END), 0) AS up_votes,
-            COALESCE(SUM(CASE WHEN feedback_type = 'dislike' THEN 1 ELSE 0 END), 0) AS down_votes
-        FROM greydb.feedbacks
-        WHERE content_type = %s AND content_id = %s
-    """
-    df = query_to_df(sql, (content_type, content_id))
-    
-    if df.empty:
-        return {"conversation_id": conversation_id, "up_votes": 0, "down_votes": 0}
+    up_votes, down_votes = get_counts(content_type, content_id)
     
     return {
         "conversation_id": conversation_id,
-        "up_votes": int(df.iloc[0]["up_votes"]),
-        "down_votes": int(df.iloc[0]["down_votes"])
+        "up_votes": up_votes,
+        "down_votes": down_votes
     }
 
 
@@ -0,0 +1,54 @@
+"""
+Takım Metrikleri Router - son N maçın xG, şut, topla oynama ortalamaları
+"""
+from fastapi import APIRouter, HTTPException, Query
+from pydantic import BaseModel, Field
+from typing import List
+
+from app.services.team_metrics import get_team_metrics, get_team_metrics_many
+
+router = APIRouter(prefix="/metrics", tags=["Team Metrics"])
+
+MAX_TEAMS = 100
+
+
+class MetricsBatchRequest(BaseModel):
+    """Toplu metrik isteği şeması (örn. bir haftanın tüm takımları)"""
+    team_fotmob_ids: List[int]
+    window: int = Field(10, ge=1, le=50)  # Takım başına son maç sayısı
+
+
+@router.post("/batch")
+def team_metrics_batch(request: MetricsBatchRequest):
+    """
+    Birden fazla takımın metrikleri tek sorguda (istek sırasında)
+
+    Bitmiş maçı olmayan takımlar `matches: 0` ile döner.
+    """
+    if len(request.team_fotmob_ids) > MAX_TEAMS:
+        raise HTTPException(status_code=400, detail=f"En fazla {MAX_TEAMS} takım gönderilebilir")
+
+    return {
+        "window": request.window,
+        "teams": get_team_metrics_many(request.team_fotmob_ids, request.window)
+    }
+
+
+@router.get("/{team_fotmob_id}")
+def team_metrics(
+    team_fotmob_id: int,
+    window: int = Query(10, ge=1, le=50, description="Son maç sayısı")
+):
+    """
+    Takımın son `window` bitmiş maçındaki ortalamalar (takımın gözünden)
+
+    - **xg_for / xg_against**: Beklenen gol
+    - **shots_* / shots_on_target_***: Şut, isabetli şut
+    - **possession**: Topla oynama (%)
+    - **big_chances_for / big_chances_against**: Büyük fırsatlar
+    - **matches_with_stats**: Ortalamaya giren (istatistiği olan) maç sayısı
+    """
+    metrics = get_team_metrics(team_fotmob_id, window)
+    if metrics["matches"] == 0:
+        raise HTTPException(status_code=404, detail="Takım için bitmiş maç yok")
+    return metrics
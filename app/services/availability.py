@@ -0,0 +1,61 @@
+"""
+Takım eksikleri servisi - son bilinen sakat/cezalı oyuncular
+
+public.team_availability takım başına tek satırdır (migrations/007);
+save_player_availability her ingest'te takımın son maçındaki eksik listesini
+yazar. Okuma takım başına PK lookup'ıdır, player_availability geçmişi taranmaz.
+"""
+from app.services.db import execute_query
+
+TEAM_AVAILABILITY_SQL = """
+    SELECT
+        t.fotmob_team_id,
+        t.name AS team_name,
+        ta.players,
+        ta.match_date,
+        ta.updated_at,
+        m.fotmob_match_id,
+        opp.name AS opponent
+    FROM public.teams t
+    JOIN public.team_availability ta ON ta.team_id = t.id
+    LEFT JOIN public.matches m ON m.id = ta.match_id
+    LEFT JOIN public.teams opp
+        ON opp.id = CASE WHEN m.home_team_id = t.id THEN m.away_team_id ELSE m.home_team_id END
+    WHERE t.fotmob_team_id = ANY(:team_ids)
+"""
+
+
+def _availability_entry(team_id: int, row: dict | None) -> dict:
+    if row is None:
+        return {"team_fotmob_id": team_id, "known": False, "unavailable": []}
+    return {
+        "team_fotmob_id": team_id,
+        "team_name": row["team_name"],
+        "known": True,
+        "as_of_match": {
+            "fotmob_match_id": row["fotmob_match_id"],
+            "match_date": row["match_date"].isoformat() if row["match_date"] else None,
+            "opponent": row["opponent"],
+        },
+        "updated_at": row["updated_at"].isoformat() if row["updated_at"] else None,
+        "unavailable": row["players"] or [],
+    }
+
+
+def get_team_availability_many(team_ids: list[int]) -> list[dict]:
+    """
+    Takım listesi için son bilinen eksikler (team_ids sırasında)
+
+    Snapshot'ı olmayan takımlar known=False ile döner.
+    """
+    team_ids = list(dict.fromkeys(team_ids))
+    if not team_ids:
+        return []
+
+    rows = execute_query(TEAM_AVAILABILITY_SQL, {"team_ids": team_ids})
+    by_team = {row["fotmob_team_id"]: row for row in rows}
+    return [_availability_entry(team_id, by_team.get(team_id)) for team_id in team_ids]
+
+
+def get_team_availability(team_id: int) -> dict:
+    return get_team_availability_many([team_id])[0]
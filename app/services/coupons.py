@@ -0,0 +1,138 @@
+"""
+Kupon sonuçlandırma - ayakların tahmin sonuçlarından kupon sonucu
+
+Kupon ayakları (greydb.coupon_matches) prediction_id ile tahminlere bağlıdır.
+Etkilenen kuponlar tek set-based UPDATE ile sonuçlanır (migrations/009):
+
+- herhangi bir ayak lost -> lost (settled_odds 0)
+- sonucu olmayan / tahmine bağlı olmayan ayak varsa -> açık (result NULL)
+- tüm ayaklar void -> void (settled_odds 1)
+- kalanlar won: void ayak yoksa settled_odds = total_odds, varsa won
+  ayakların oranları çarpımı (void ayak 1 sayılır); bu durumda oranı
+  bilinmeyen won ayak varsa kupon oran gelene kadar açık kalır
+
+Tahmin sonuçlandırma yolu (check_prediction_results, update_prediction,
+silme) sadece değişen tahminlerin kuponlarını sonuçlandırır; kuponun
+total_odds'u değişirse (update_coupon) o kupon yeniden hesaplanır. Sonradan
+düzeltilen tahmin kuponu yeniden hesaplatır (gerekirse tekrar açar).
+"""
+from app.services.db import execute_insert
+
+# {affected}: coupon_id kolonlu kupon kümesi (tahmin ID'leri veya açık kupon sayfası)
+_SETTLE_SQL = """
+    WITH affected AS (
+        {affected}
+    ),
+    legs AS (
+        SELECT
+            cm.coupon_id,
+            COUNT(*) AS legs,
+            COUNT(*) FILTER (WHERE p.result = 'won') AS won,
+            COUNT(*) FILTER (WHERE p.result = 'lost') AS lost,
+            COUNT(*) FILTER (WHERE p.result = 'void') AS void,
+            COUNT(*) FILTER (WHERE p.result = 'won' AND COALESCE(cm.odds, p.odds, 0) <= 0) AS won_without_odds,
+            EXP(SUM(LN(COALESCE(cm.odds, p.odds))) FILTER (
+                WHERE p.result = 'won' AND COALESCE(cm.odds, p.odds) > 0
+            )) AS won_odds
+        FROM greydb.coupon_matches cm
+        JOIN affected a ON a.coupon_id = cm.coupon_id
+        LEFT JOIN greydb.predictions p ON p.id = cm.prediction_id
+        GROUP BY cm.coupon_id
+    ),
+    outcome AS (
+        SELECT
+            l.coupon_id,
+            CASE
+                WHEN l.lost > 0 THEN 'lost'
+                WHEN l.won + l.void < l.legs THEN NULL
+                WHEN l.won = 0 THEN 'void'
+                -- Void düşülmüş oran hesaplanamıyor: won ama settled_odds NULL yazılmaz
+                WHEN l.void > 0 AND l.won_without_odds > 0 THEN NULL
+                ELSE 'won'
+            END AS result,
+            CASE
+                WHEN l.lost > 0 THEN 0
+                WHEN l.won + l.void < l.legs THEN NULL
+                WHEN l.won = 0 THEN 1
+                WHEN l.void = 0 THEN c.total_odds
+                WHEN l.won_without_odds = 0 THEN ROUND(l.won_odds, 2)
+            END AS settled_odds
+        FROM legs l
+        JOIN greydb.coupons c ON c.id = l.coupon_id
+    ),
+    updated AS (
+        UPDATE greydb.coupons c SET
+            result = o.result,
+            settled_odds = o.settled_odds,
+            settled_at = CASE WHEN o.result IS NULL THEN NULL ELSE NOW() END,
+            updated_at = NOW()
+        FROM outcome o
+        WHERE c.id = o.coupon_id
+          AND (c.result IS DISTINCT FROM o.result OR c.settled_odds IS DISTINCT FROM o.settled_odds)
+        RETURNING c.id, c.result
+    )
+    SELECT
+        (SELECT COUNT(*) FROM affected) AS checked,
+        (SELECT MAX(coupon_id) FROM affected) AS last_id,
+        COUNT(*) AS updated,
+        COUNT(*) FILTER (WHERE result = 'won') AS won,
+        COUNT(*) FILTER (WHERE result = 'lost') AS lost,
+        COUNT(*) FILTER (WHERE result = 'void') AS void,
+        COUNT(*) FILTER (WHERE result IS NULL) AS reopened
+    FROM updated
+"""
+
+SETTLE_BY_PREDICTIONS_SQL = _SETTLE_SQL.format(affected="""
+        SELECT DISTINCT coupon_id FROM greydb.coupon_matches
+        WHERE prediction_id = ANY(CAST(:prediction_ids AS integer[]))
+""")
+
+SETTLE_COUPONS_SQL = _SETTLE_SQL.format(affected="""
+        SELECT unnest(CAST(:coupon_ids AS integer[])) AS coupon_id
+""")
+
+SETTLE_OPEN_PAGE_SQL = _SETTLE_SQL.format(affected="""
+        SELECT id AS coupon_id FROM greydb.coupons
+        WHERE result IS NULL AND id > :after_id
+        ORDER BY id
+        LIMIT :limit
+""")
+
+_COUNT_KEYS = ("checked", "updated", "won", "lost", "void", "reopened")
+
+
+def _counts(row: dict | None) -> dict:
+    return {key: int(row[key]) if row else 0 for key in _COUNT_KEYS}
+
+
+def settle_coupons_for_predictions(prediction_ids) -> dict:
+    """Tahminlerin bağlı olduğu kuponları sonuçlandır (tahmin sonuçlandırma kancası)"""
+    prediction_ids = sorted({int(pid) for pid in prediction_ids if pid is not None})
+    if not prediction_ids:
+        return _counts(None)
+    return _counts(execute_insert(SETTLE_BY_PREDICTIONS_SQL, {"prediction_ids": prediction_ids}))
+
+
+def settle_coupons(coupon_ids) -> dict:
+    """Verilen kuponları yeniden sonuçlandır (örn. total_odds değişti)"""
+    coupon_ids = sorted({int(cid) for cid in coupon_ids})
+    if not coupon_ids:
+        return _counts(None)
+    return _counts(execute_insert(SETTLE_COUPONS_SQL, {"coupon_ids": coupon_ids}))
+
+
+def settle_open_coupons(batch_size: int = 500) -> dict:
+    """
+    Tüm açık kuponları id sırasıyla sayfa sayfa sonuçlandır (ilk kurulum / elle tetikleme).
+    Her sayfa ayrı transaction; sayfa başına tek UPDATE.
+    """
+    totals = _counts(None)
+    after_id = 0
+    while True:
+        row = execute_insert(SETTLE_OPEN_PAGE_SQL, {"after_id": after_id, "limit": batch_size})
+        page = _counts(row)
+        for key in _COUNT_KEYS:
+            totals[key] += page[key]
+        if not row or row["last_id"] is None or page["checked"] < batch_size:
+            return totals
+        after_id = int(row["last_id"])
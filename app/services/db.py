@@ -1,16 +1,192 @@
 """
 Database bağlantı servisi
 """
-import pandas as pd
+import itertools
+import logging
+import re
+import threading
+import time
+from collections import deque
+from contextvars import ContextVar
+from functools import lru_cache
+from typing import TYPE_CHECKING
+
 from sqlalchemy import create_engine, text
+from sqlalchemy.exc import DBAPIError, TimeoutError as PoolTimeoutError
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import QueuePool
 from contextlib import contextmanager
 from app.config import get_settings
+from app.services.query_log import slow_query_log, is_read_only
+
+if TYPE_CHECKING:
+    import pandas as pd
 
 settings = get_settings()
+logger = logging.getLogger(__name__)
+
+
+class TimedQueuePool(QueuePool):
+    """QueuePool + checkout bekleme süresi ve timeout sayacı"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._wait_lock = threading.Lock()
+        self._wait_samples = deque(maxlen=1000)
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+        self._checkouts = 0
+        self._timeouts = 0
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            # Timeout'lar ayrı sayılır; tam pool_timeout beklemesi wait istatistiklerine girmez
+            with self._wait_lock:
+                self._timeouts += 1
+            raise
+        waited = (time.perf_counter() - started) * 1000
+        with self._wait_lock:
+            self._checkouts += 1
+            self._wait_total += waited
+            self._wait_max = max(self._wait_max, waited)
+            self._wait_samples.append(waited)
+        return connection
+
+    def stats(self) -> dict:
+        with self._wait_lock:
+            samples = sorted(self._wait_samples)
+            checkouts = self._checkouts
+            wait_total = self._wait_total
+            wait_max = self._wait_max
+            timeouts = self._timeouts
+        return {
+            "size": self.size(),
+            "checked_out": self.checkedout(),
+            "idle": self.checkedin(),
+            "overflow": max(self.overflow(), 0),
+            "max_overflow": self._max_overflow,
+            "timeout_s": self._timeout,
+            "checkouts": checkouts,
+            "timeouts": timeouts,
+            "wait_ms": {
+                "avg": round(wait_total / checkouts, 3) if checkouts else 0.0,
+                "p95": round(samples[min(len(samples) - 1, int(len(samples) * 0.95))], 3) if samples else 0.0,
+                "max": round(wait_max, 3),
+            },
+        }
+
+
+def _create_engine(url: str):
+    """Settings'teki havuz ayarlarıyla engine (statement_timeout bağlantı açılırken set edilir)"""
+    connect_args = {}
+    if settings.db_statement_timeout_ms > 0:
+        connect_args["options"] = f"-c statement_timeout={settings.db_statement_timeout_ms}"
+    
+    new_engine = create_engine(
+        url,
+        poolclass=TimedQueuePool,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout,
+        pool_recycle=settings.db_pool_recycle,
+        pool_pre_ping=settings.db_pool_pre_ping,
+        connect_args=connect_args,
+    )
+    slow_query_log.install(new_engine)
+    return new_engine
+
+
+# SQLAlchemy engine (primary - tüm yazmalar)
+engine = _create_engine(settings.database_url)
+
+
+REPLICA_LAG_SQL = """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END AS lag_seconds
+"""
+
+
+class Replica:
+    """Read replica engine'i + periyodik lag kontrolü"""
+
+    def __init__(self, url: str):
+        self.engine = _create_engine(url)
+        self.host = self.engine.url.host
+        self.lag_seconds: float | None = None
+        self.healthy = False
+        self.checked_at = 0.0
+        self.error: str | None = None
+        self._check_lock = threading.Lock()
+
+    def is_usable(self) -> bool:
+        """Kontrol süresi dolduysa tek thread lag'i yeniden ölçer, diğerleri son durumu kullanır"""
+        if time.monotonic() - self.checked_at >= settings.replica_lag_check_interval and self._check_lock.acquire(blocking=False):
+            try:
+                self.check()
+            finally:
+                self._check_lock.release()
+        return self.healthy
+
+    def check(self) -> None:
+        try:
+            with self.engine.connect() as conn:
+                self.lag_seconds = float(conn.execute(text(REPLICA_LAG_SQL)).scalar() or 0)
+            self.error = None
+            self.healthy = self.lag_seconds <= settings.replica_max_lag_seconds
+            if not self.healthy:
+                logger.warning("Replica %s lagging %.1fs, reads go to primary", self.host, self.lag_seconds)
+        except Exception as e:
+            self.healthy = False
+            self.error = str(e)
+            logger.warning("Replica %s unavailable: %s", self.host, e)
+        self.checked_at = time.monotonic()
+
+    def status(self) -> dict:
+        return {
+            "host": self.host,
+            "healthy": self.healthy,
+            "lag_seconds": self.lag_seconds,
+            "error": self.error,
+        }
+
+
+replicas = [Replica(url) for url in settings.database_replica_urls]
+_replica_cycle = itertools.cycle(replicas) if replicas else None
+
+# True iken okumalar da primary'ye gider (read-after-write)
+_force_primary: ContextVar[bool] = ContextVar("force_primary", default=False)
+
+
+@contextmanager
+def use_primary():
+    """
+    Bu blok içindeki tüm okumaları primary'ye yönlendir.
+    Yazdıktan hemen sonra okunan veri için (örn. create_coupon -> get_coupon, ingest).
+    """
+    token = _force_primary.set(True)
+    try:
+        yield
+    finally:
+        _force_primary.reset(token)
+
+
+def _read_engine(sql: str):
+    """Salt okuma sorgusu için engine: sağlıklı bir replica, yoksa primary"""
+    if _replica_cycle is None or _force_primary.get() or not is_read_only(sql):
+        return engine
+    for _ in range(len(replicas)):
+        replica = next(_replica_cycle)
+        if replica.is_usable():
+            return replica.engine
+    return engine
+
 
-# SQLAlchemy engine
-engine = create_engine(settings.database_url, pool_pre_ping=True)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 
@@ -33,34 +209,56 @@ def get_connection():
         conn.close()
 
 
-def query_to_df(sql: str, params = None, commit: bool = False) -> pd.DataFrame:
+@contextmanager
+def get_transaction():
+    """Tek transaction içinde birden fazla sorgu - hata olursa rollback, yoksa commit"""
+    with engine.begin() as conn:
+        yield conn
+
+
+_PYFORMAT_PARAM = re.compile(r"%s")
+_NAMED_PARAM = re.compile(r"(?<![:\w]):(\w+)")
+
+
+@lru_cache(maxsize=1024)
+def _compiled(sql: str):
+    """SQL metni -> text() nesnesi; aynı sorgu her çağrıda yeniden parse edilmez"""
+    return text(sql)
+
+
+@lru_cache(maxsize=1024)
+def _pyformat_to_named(sql: str) -> str:
+    """psycopg2 formatı (%s) -> sqlalchemy formatı (:p0, :p1, ...)"""
+    counter = itertools.count()
+    return _PYFORMAT_PARAM.sub(lambda _: f":p{next(counter)}", sql)
+
+
+def query_to_df(sql: str, params = None, commit: bool = False) -> "pd.DataFrame":
     """SQL sorgusunu pandas DataFrame olarak döndür
     
     Args:
         sql: SQL sorgusu (%s veya :param formatında)
         params: tuple veya dict olabilir
-        commit: True ise commit yap
+        commit: True ise commit yap (commit'li sorgular her zaman primary'ye gider)
     """
-    with engine.connect() as conn:
+    import pandas as pd
+    
+    with (engine if commit else _read_engine(sql)).connect() as conn:
         # Eğer params tuple ise, psycopg2 formatından sqlalchemy formatına çevir
         if params is not None and isinstance(params, tuple):
-            # %s placeholder'ları :p0, :p1, ... formatına çevir
-            import re
-            placeholders = re.findall(r'%s', sql)
-            for i, _ in enumerate(placeholders):
-                sql = sql.replace('%s', f':p{i}', 1)
+            sql = _pyformat_to_named(sql)
             params = {f'p{i}': v for i, v in enumerate(params)}
         
-        result = pd.read_sql(text(sql), conn, params=params)
+        result = pd.read_sql(_compiled(sql), conn, params=params)
         if commit:
             conn.commit()
         return result
 
 
 def execute_query(sql: str, params: dict = None) -> list[dict]:
-    """SQL sorgusunu çalıştır ve dict listesi döndür"""
-    with engine.connect() as conn:
-        result = conn.execute(text(sql), params or {})
+    """SQL sorgusunu çalıştır ve dict listesi döndür (salt okuma ise replica'ya gidebilir)"""
+    with _read_engine(sql).connect() as conn:
+        result = conn.execute(_compiled(sql), params or {})
         columns = result.keys()
         return [dict(zip(columns, row)) for row in result.fetchall()]
 
@@ -68,7 +266,7 @@ def execute_query(sql: str, params: dict = None) -> list[dict]:
 def execute_insert(sql: str, params: dict = None) -> dict | None:
     """INSERT/UPDATE/DELETE çalıştır, RETURNING varsa sonucu döndür"""
     with engine.connect() as conn:
-        result = conn.execute(text(sql), params or {})
+        result = conn.execute(_compiled(sql), params or {})
         conn.commit()
         try:
             row = result.fetchone()
@@ -82,8 +280,106 @@ def execute_insert(sql: str, params: dict = None) -> dict | None:
 
 def execute_insert_many(sql: str, params_list: list[dict]) -> None:
     """Birden fazla INSERT çalıştır"""
+    statement = _compiled(sql)
     with engine.connect() as conn:
         for params in params_list:
-            conn.execute(text(sql), params)
+            conn.execute(statement, params)
         conn.commit()
 
+
+# Bağlantıda prepared statement yok (26000) veya view/tablo kolonları değişti (0A000:
+# "cached plan must not change result type") -> yeniden PREPARE edip bir kez daha dene
+_STALE_PREPARED = {"26000", "0A000"}
+
+# Ad -> PreparedStatement (warm-up tüm kayıtlı statement'ları PREPARE eder)
+PREPARED_STATEMENTS: dict[str, "PreparedStatement"] = {}
+
+
+class PreparedStatement:
+    """
+    Sık çalışan salt okuma sorgusu - modül seviyesinde bir kez tanımlanır.
+
+    SQL (:param formatında) bir kez $1, $2 ... formatına çevrilir. Bağlantıda ilk
+    kullanımda PREPARE edilir, sonraki çalışmalar EXECUTE ile parse/analyze
+    adımını atlar. Hazırlanan isimler conn.info'da tutulur; bu sözlük DBAPI
+    bağlantısına bağlıdır ve bağlantı yenilenince (recycle/invalidate) temizlenir.
+    db_prepared_statements kapalıysa (PgBouncer transaction mode) düz SQL çalışır.
+    """
+
+    def __init__(self, name: str, sql: str):
+        if name in PREPARED_STATEMENTS:
+            raise ValueError(f"Prepared statement adı zaten kullanılıyor: {name}")
+        PREPARED_STATEMENTS[name] = self
+
+        self.name = name
+        self.sql = sql
+        self.param_names = list(dict.fromkeys(_NAMED_PARAM.findall(sql)))
+        positional = _NAMED_PARAM.sub(lambda m: f"${self.param_names.index(m.group(1)) + 1}", sql)
+        self._prepare_sql = f"PREPARE {name} AS {positional}"
+        args = ", ".join(f":{param}" for param in self.param_names)
+        self.execute_sql = f"EXECUTE {name}({args})" if args else f"EXECUTE {name}"
+        self._execute = text(self.execute_sql)
+        self._plain = text(sql)
+        self._source_options = None
+
+    def prepare(self, conn) -> None:
+        """Bu bağlantıda henüz hazırlanmadıysa PREPARE et"""
+        prepared = conn.info.setdefault("prepared_statements", set())
+        if self.name not in prepared:
+            conn.exec_driver_sql(self._prepare_sql)
+            prepared.add(self.name)
+
+    def source_options(self, conn) -> dict:
+        """
+        EXECUTE için execution option: asıl SQL (driver formatında). Yavaş sorgu logu
+        "EXECUTE name(...)" yerine bunu kaydeder ve EXPLAIN eder (parametre adları aynı).
+        """
+        if self._source_options is None:
+            self._source_options = {"source_statement": str(self._plain.compile(dialect=conn.dialect))}
+        return self._source_options
+
+    def execute(self, conn, params: dict = None):
+        """Verilen bağlantıda çalıştır (gerekirse önce PREPARE)"""
+        if not settings.db_prepared_statements:
+            return conn.execute(self._plain, params or {})
+
+        self.prepare(conn)
+        options = self.source_options(conn)
+        try:
+            return conn.execute(self._execute, params or {}, execution_options=options)
+        except DBAPIError as e:
+            if getattr(e.orig, "pgcode", None) not in _STALE_PREPARED:
+                raise
+            logger.info("Prepared statement %s re-prepared: %s", self.name, e.orig)
+            conn.rollback()
+            if e.orig.pgcode == "26000":
+                # Sunucu tarafı temizlenmiş (örn. DISCARD ALL): kayıt artık geçersiz
+                conn.info["prepared_statements"].clear()
+            else:
+                conn.exec_driver_sql(f"DEALLOCATE {self.name}")
+                conn.info["prepared_statements"].discard(self.name)
+            self.prepare(conn)
+            return conn.execute(self._execute, params or {}, execution_options=options)
+
+    def fetch_all(self, params: dict = None) -> list[dict]:
+        """execute_query karşılığı: dict listesi (replica'ya gidebilir)"""
+        with _read_engine(self.sql).connect() as conn:
+            result = self.execute(conn, params)
+            columns = result.keys()
+            return [dict(zip(columns, row)) for row in result.fetchall()]
+
+    def to_df(self, params: dict = None) -> "pd.DataFrame":
+        """query_to_df karşılığı: DataFrame (replica'ya gidebilir)"""
+        import pandas as pd
+
+        with _read_engine(self.sql).connect() as conn:
+            result = self.execute(conn, params)
+            return pd.DataFrame.from_records(result.fetchall(), columns=list(result.keys()), coerce_float=True)
+
+
+def pool_stats() -> dict:
+    """Bağlantı havuzu durumu (admin endpoint'i için)"""
+    pools = {"primary": engine.pool.stats()}
+    for replica in replicas:
+        pools[f"replica:{replica.host}"] = {**replica.engine.pool.stats(), **replica.status()}
+    return pools
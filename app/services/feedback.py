@@ -0,0 +1,298 @@
+"""
+Feedback servisi - beğeni/beğenmeme yazma yolu ve sayaç tablosu
+
+greydb.feedback_counters (content_type, content_id) başına sayıları tutar.
+Her feedback değişikliği sayacı aynı statement içinde günceller, böylece
+sayım okumaları COUNT(*) yerine primary key lookup olur.
+Şema: migrations/001_feedback_counters.sql, migrations/002_feedbacks_unique.sql
+"""
+import logging
+
+from sqlalchemy import text
+
+from app.config import get_settings
+from app.services.cache import TTLCache
+from app.services.db import PreparedStatement, execute_query, execute_insert, get_transaction
+from app.services.write_buffer import WriteBuffer
+
+logger = logging.getLogger(__name__)
+
+# (content_type, content_id) -> (likes, dislikes). Kullanıcıya özel veri tutulmaz.
+_counts_cache = TTLCache(get_settings().feedback_counts_cache_ttl)
+
+
+# Toggle tek statement: mevcut satırı oku, aynı tipse sil, değilse upsert et,
+# sayacı güncelle ve yeni durumu + sayıları döndür. Tek round trip, tek transaction.
+# Unique index: migrations/002_feedbacks_unique.sql
+TOGGLE_FEEDBACK_SQL = """
+    WITH existing AS (
+        SELECT id, feedback_type FROM greydb.feedbacks
+        WHERE user_id = :user_id AND content_type = :content_type AND content_id = :content_id
+    ),
+    removed AS (
+        DELETE FROM greydb.feedbacks f
+        USING existing e
+        WHERE f.id = e.id AND e.feedback_type = :feedback_type
+        RETURNING f.id
+    ),
+    upserted AS (
+        INSERT INTO greydb.feedbacks (user_id, content_type, content_id, feedback_type)
+        SELECT :user_id, :content_type, :content_id, :feedback_type
+        WHERE NOT EXISTS (SELECT 1 FROM existing WHERE feedback_type = :feedback_type)
+        ON CONFLICT (user_id, content_type, content_id) DO UPDATE
+            SET feedback_type = EXCLUDED.feedback_type
+        RETURNING *, (xmax = 0) AS inserted
+    ),
+    transition AS (
+        SELECT
+            CASE WHEN EXISTS (SELECT 1 FROM removed) THEN NULL ELSE :feedback_type END AS new_type,
+            CASE
+                WHEN EXISTS (SELECT 1 FROM existing) THEN (SELECT feedback_type FROM existing)
+                WHEN EXISTS (SELECT 1 FROM upserted WHERE inserted) THEN NULL
+                -- Eşzamanlı çift tıklama: satırı diğer istek aynı tiple ekledi
+                ELSE :feedback_type
+            END AS old_type
+    ),
+    delta AS (
+        SELECT
+            (new_type IS NOT DISTINCT FROM 'like')::int - (old_type IS NOT DISTINCT FROM 'like')::int AS likes,
+            (new_type IS NOT DISTINCT FROM 'dislike')::int - (old_type IS NOT DISTINCT FROM 'dislike')::int AS dislikes
+        FROM transition
+    ),
+    -- Sayaç satırı yoksa delta -1 olabilir: eklenen değer de 0'da kırpılır
+    counter AS (
+        INSERT INTO greydb.feedback_counters AS c (content_type, content_id, likes, dislikes)
+        SELECT :content_type, :content_id, GREATEST(likes, 0), GREATEST(dislikes, 0)
+        FROM delta
+        ON CONFLICT (content_type, content_id) DO UPDATE SET
+            likes = GREATEST(c.likes + (SELECT likes FROM delta), 0),
+            dislikes = GREATEST(c.dislikes + (SELECT dislikes FROM delta), 0),
+            updated_at = NOW()
+        RETURNING GREATEST(c.likes, 0) AS likes, GREATEST(c.dislikes, 0) AS dislikes
+    )
+    SELECT
+        CASE
+            WHEN EXISTS (SELECT 1 FROM removed) THEN 'removed'
+            WHEN (SELECT inserted FROM upserted) THEN 'created'
+            ELSE 'updated'
+        END AS action,
+        counter.likes AS total_likes,
+        counter.dislikes AS total_dislikes,
+        upserted.*
+    FROM counter
+    LEFT JOIN upserted ON TRUE
+"""
+
+FEEDBACK_COLUMNS = ("id", "user_id", "content_type", "content_id", "feedback_type", "created_at")
+
+
+def toggle_feedback(user_id: str, content_type: str, content_id: str, feedback_type: str) -> dict:
+    """
+    Feedback oluştur, güncelle veya kaldır (toggle) - tek statement, tek round trip.
+
+    Returns:
+        {"action": 'created' | 'updated' | 'removed',
+         "feedback": feedbacks satırı ('removed' ise None),
+         "likes": int, "dislikes": int}
+    """
+    row = execute_insert(TOGGLE_FEEDBACK_SQL, {
+        "user_id": user_id,
+        "content_type": content_type,
+        "content_id": content_id,
+        "feedback_type": feedback_type,
+    })
+
+    action = row["action"]
+    _counts_cache.set((content_type, content_id), (int(row["total_likes"]), int(row["total_dislikes"])))
+    return {
+        "action": action,
+        "feedback": None if action == "removed" else {k: row[k] for k in FEEDBACK_COLUMNS},
+        "likes": int(row["total_likes"]),
+        "dislikes": int(row["total_dislikes"]),
+    }
+
+
+DELETE_FEEDBACK_SQL = """
+    WITH removed AS (
+        DELETE FROM greydb.feedbacks
+        WHERE user_id = :user_id AND content_type = :content_type AND content_id = :content_id
+        RETURNING feedback_type
+    ),
+    counter AS (
+        UPDATE greydb.feedback_counters c SET
+            likes = GREATEST(c.likes - (SELECT COUNT(*) FROM removed WHERE feedback_type = 'like'), 0),
+            dislikes = GREATEST(c.dislikes - (SELECT COUNT(*) FROM removed WHERE feedback_type = 'dislike'), 0),
+            updated_at = NOW()
+        WHERE c.content_type = :content_type AND c.content_id = :content_id
+          AND EXISTS (SELECT 1 FROM removed)
+        RETURNING 1
+    )
+    SELECT COUNT(*) AS removed FROM removed
+"""
+
+
+def delete_feedback(user_id: str, content_type: str, content_id: str) -> bool:
+    """Kullanıcının feedback'ini sil ve sayacı düş - tek statement"""
+    row = execute_insert(DELETE_FEEDBACK_SQL, {"user_id": user_id, "content_type": content_type, "content_id": content_id})
+
+    _counts_cache.delete((content_type, content_id))
+    return bool(row and row["removed"])
+
+
+# Kuyruk kaydının "op" alanı -> statement (op yoksa toggle)
+_BUFFER_OPS = {"toggle": TOGGLE_FEEDBACK_SQL, "delete": DELETE_FEEDBACK_SQL}
+
+
+def apply_feedback_batch(items: list[dict]) -> int:
+    """
+    Kuyruktaki toggle/silmeleri sırayla tek transaction'da uygula (tek commit).
+    Silmeler de kuyruktan geçer: önceki toggle silmeden sonra uygulanıp feedback'i geri getirmez.
+    Batch hata verirse kayıtlar tek tek denenir; bozuk bir kayıt diğerlerini düşürmez.
+    Uygulanamayan kayıt sayısını döndürür.
+
+    items: {"op": 'toggle' | 'delete', user_id, content_type, content_id, feedback_type (toggle)}
+    """
+    statements = {op: text(sql) for op, sql in _BUFFER_OPS.items()}
+
+    def apply(conn, item):
+        params = {k: v for k, v in item.items() if k != "op"}
+        conn.execute(statements[item.get("op", "toggle")], params)
+
+    try:
+        try:
+            with get_transaction() as conn:
+                for item in items:
+                    apply(conn, item)
+            return 0
+        except Exception:
+            if len(items) == 1:
+                raise
+
+        failed = 0
+        for item in items:
+            try:
+                with get_transaction() as conn:
+                    apply(conn, item)
+            except Exception as e:
+                failed += 1
+                logger.error("Feedback write error for %s/%s: %s", item["content_type"], item["content_id"], e)
+        return failed
+    finally:
+        for item in items:
+            _counts_cache.delete((item["content_type"], item["content_id"]))
+
+
+# Write-behind modu (config: write_buffer_enabled)
+feedback_buffer = WriteBuffer("feedback", apply_feedback_batch)
+
+
+# Sayaç okuması en sık çalışan sorgu: bağlantı başına PREPARE edilir
+COUNTS_STATEMENT = PreparedStatement("feedback_counts", """
+    SELECT c.content_type, c.content_id, c.likes, c.dislikes
+    FROM unnest(CAST(:content_types AS text[]), CAST(:content_ids AS text[]))
+         AS k(content_type, content_id)
+    JOIN greydb.feedback_counters c
+      ON c.content_type = k.content_type AND c.content_id = k.content_id
+""")
+
+
+def get_counts(content_type: str, content_id: str) -> tuple[int, int]:
+    """Tek içeriğin (likes, dislikes) sayıları"""
+    return get_counts_many([(content_type, content_id)])[(content_type, content_id)]
+
+
+def get_bulk_counts(content_type: str, content_ids: list[str]) -> dict[str, tuple[int, int]]:
+    """Tek tipte birden fazla içeriğin sayıları: {content_id: (likes, dislikes)}"""
+    counts = get_counts_many([(content_type, content_id) for content_id in content_ids])
+    return {content_id: counts[(content_type, content_id)] for content_id in content_ids}
+
+
+def get_counts_many(keys: list[tuple[str, str]]) -> dict[tuple[str, str], tuple[int, int]]:
+    """
+    Farklı tiplerdeki içeriklerin sayıları - önce paylaşılan cache,
+    eksikler tek sorguda sayaç tablosundan.
+
+    Returns:
+        {(content_type, content_id): (likes, dislikes)} - her anahtar için değer döner
+    """
+    counts, missing = _counts_cache.get_many(dict.fromkeys(keys))
+    if not missing:
+        return counts
+
+    rows = COUNTS_STATEMENT.fetch_all({
+        "content_types": [key[0] for key in missing],
+        "content_ids": [key[1] for key in missing],
+    })
+
+    fetched = {key: (0, 0) for key in missing}
+    for row in rows:
+        fetched[(row["content_type"], row["content_id"])] = (int(row["likes"]), int(row["dislikes"]))
+
+    _counts_cache.set_many(fetched)
+    counts.update(fetched)
+    return counts
+
+
+def get_user_feedbacks(user_id: str, keys: list[tuple[str, str]]) -> dict[tuple[str, str], str]:
+    """Kullanıcının verilen içeriklere feedback'leri (kullanıcıya özel, cache'lenmez)"""
+    if not keys:
+        return {}
+
+    rows = execute_query("""
+        SELECT f.content_type, f.content_id, f.feedback_type
+        FROM unnest(CAST(:content_types AS text[]), CAST(:content_ids AS text[]))
+             AS k(content_type, content_id)
+        JOIN greydb.feedbacks f
+          ON f.content_type = k.content_type AND f.content_id = k.content_id
+        WHERE f.user_id = :user_id
+    """, {
+        "user_id": user_id,
+        "content_types": [key[0] for key in keys],
+        "content_ids": [key[1] for key in keys],
+    })
+
+    return {(row["content_type"], row["content_id"]): row["feedback_type"] for row in rows}
+
+
+def reconcile_counters() -> int:
+    """
+    Sayaçları greydb.feedbacks'ten yeniden hesapla, farklı olanları düzelt.
+
+    Returns:
+        Düzeltilen sayaç satırı sayısı
+    """
+    result = execute_insert("""
+        WITH actual AS (
+            SELECT
+                content_type,
+                content_id,
+                COUNT(*) FILTER (WHERE feedback_type = 'like') AS likes,
+                COUNT(*) FILTER (WHERE feedback_type = 'dislike') AS dislikes
+            FROM greydb.feedbacks
+            GROUP BY content_type, content_id
+        ),
+        fixed AS (
+            INSERT INTO greydb.feedback_counters (content_type, content_id, likes, dislikes)
+            SELECT content_type, content_id, likes, dislikes FROM actual
+            ON CONFLICT (content_type, content_id) DO UPDATE SET
+                likes = EXCLUDED.likes,
+                dislikes = EXCLUDED.dislikes,
+                updated_at = NOW()
+            WHERE greydb.feedback_counters.likes <> EXCLUDED.likes
+               OR greydb.feedback_counters.dislikes <> EXCLUDED.dislikes
+            RETURNING 1
+        ),
+        zeroed AS (
+            UPDATE greydb.feedback_counters c
+            SET likes = 0, dislikes = 0, updated_at = NOW()
+            WHERE (c.likes <> 0 OR c.dislikes <> 0)
+              AND NOT EXISTS (
+                  SELECT 1 FROM actual a
+                  WHERE a.content_type = c.content_type AND a.content_id = c.content_id
+              )
+            RETURNING 1
+        )
+        SELECT (SELECT COUNT(*) FROM fixed) + (SELECT COUNT(*) FROM zeroed) AS fixed
+    """)
+    _counts_cache.clear()
+    return int(result["fixed"]) if result else 0
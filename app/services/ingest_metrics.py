@@ -0,0 +1,150 @@
+"""
+Ingest metrikleri - maç işleme boru hattında aşama süreleri ve satır sayıları
+
+Her maç bir MatchTrace ile izlenir (trace_match). stage() ile sarılan adımlar
+(fetch, parse, extract, her save_* ...) süre ve yazılan satır sayısı biriktirir.
+Trace bitince süreç geneli metriklere eklenir; eşiği aşan maçlar loglanır.
+"""
+import logging
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+# Aşama başına son N süre (p50/p95 için)
+_SAMPLE_SIZE = 1000
+
+
+class MatchTrace:
+    """Tek maçın aşama süreleri (ms) ve aşama başına yazılan satır sayısı"""
+
+    def __init__(self, fotmob_match_id: int):
+        self.fotmob_match_id = fotmob_match_id
+        self.stages: dict[str, float] = {}
+        self.rows: dict[str, int] = {}
+        self.current_stage: Optional[str] = None
+        self.started = time.perf_counter()
+        self.total_ms = 0.0
+
+    def as_dict(self) -> dict:
+        return {
+            "fotmob_match_id": self.fotmob_match_id,
+            "total_ms": round(self.total_ms, 2),
+            "stages": {name: round(ms, 2) for name, ms in self.stages.items()},
+            "rows": dict(self.rows),
+        }
+
+
+_current_trace: ContextVar[Optional[MatchTrace]] = ContextVar("ingest_trace", default=None)
+
+
+@contextmanager
+def stage(name: str):
+    """
+    Aktif trace'e aşama süresi ekle. Trace yoksa no-op.
+    Decorator olarak da kullanılabilir: @stage("save_match_stats")
+    """
+    trace = _current_trace.get()
+    if trace is None:
+        yield
+        return
+
+    previous = trace.current_stage
+    trace.current_stage = name
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = (time.perf_counter() - started) * 1000
+        trace.stages[name] = trace.stages.get(name, 0.0) + elapsed
+        trace.current_stage = previous
+
+
+def count_rows(n: int = 1) -> None:
+    """Aktif aşamaya yazılan satır ekle"""
+    trace = _current_trace.get()
+    if trace is not None and trace.current_stage is not None:
+        trace.rows[trace.current_stage] = trace.rows.get(trace.current_stage, 0) + n
+
+
+class IngestMetrics:
+    """Süreç geneli aşama istatistikleri ve yavaş maç listesi"""
+
+    def __init__(self, slow_match_ms: float, max_slow: int = 50):
+        self.slow_match_ms = slow_match_ms
+        self._lock = threading.Lock()
+        self._max_slow = max_slow
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.matches = 0
+            self._stages: dict[str, dict] = {}
+            self._slow = deque(maxlen=self._max_slow)
+
+    def record(self, trace: MatchTrace) -> None:
+        with self._lock:
+            self.matches += 1
+            for name, ms in trace.stages.items():
+                entry = self._stages.get(name)
+                if entry is None:
+                    entry = self._stages[name] = {
+                        "count": 0, "total_ms": 0.0, "max_ms": 0.0, "rows": 0,
+                        "samples": deque(maxlen=_SAMPLE_SIZE),
+                    }
+                entry["count"] += 1
+                entry["total_ms"] += ms
+                entry["max_ms"] = max(entry["max_ms"], ms)
+                entry["rows"] += trace.rows.get(name, 0)
+                entry["samples"].append(ms)
+
+            if self.slow_match_ms and trace.total_ms >= self.slow_match_ms:
+                self._slow.append(trace.as_dict())
+                slowest = max(trace.stages.items(), key=lambda item: item[1], default=("-", 0.0))
+                logger.warning(
+                    "Slow ingest: fotmob_match_id=%s total=%.0fms slowest_stage=%s (%.0fms)",
+                    trace.fotmob_match_id, trace.total_ms, slowest[0], slowest[1],
+                )
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            stages = {}
+            for name, entry in self._stages.items():
+                samples = sorted(entry["samples"])
+                stages[name] = {
+                    "count": entry["count"],
+                    "rows": entry["rows"],
+                    "total_ms": round(entry["total_ms"], 2),
+                    "avg_ms": round(entry["total_ms"] / entry["count"], 2),
+                    "p50_ms": round(samples[len(samples) // 2], 2),
+                    "p95_ms": round(samples[min(len(samples) - 1, int(len(samples) * 0.95))], 2),
+                    "max_ms": round(entry["max_ms"], 2),
+                }
+            return {
+                "matches": self.matches,
+                "slow_match_ms": self.slow_match_ms,
+                "stages": stages,
+                "slow_matches": list(self._slow),
+            }
+
+
+ingest_metrics = IngestMetrics(get_settings().ingest_slow_match_ms)
+
+
+@contextmanager
+def trace_match(fotmob_match_id: int):
+    """Bir maçın işlenmesini izle; bitince ingest_metrics'e kaydet"""
+    trace = MatchTrace(fotmob_match_id)
+    token = _current_trace.set(trace)
+    try:
+        yield trace
+    finally:
+        _current_trace.reset(token)
+        trace.total_ms = (time.perf_counter() - trace.started) * 1000
+        ingest_metrics.record(trace)
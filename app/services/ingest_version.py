@@ -0,0 +1,43 @@
+"""
+Ingest versiyonu - public.matches'e son yazılan zaman (MAX(updated_at))
+
+Ingest edilen maç verisinden türeyen cache'ler anahtarlarına bu versiyonu
+ekler; yeni ingest olunca eski anahtarlar kendiliğinden kullanılmaz olur.
+Değer DB'den okunduğu için tüm worker'larda aynıdır; sorguyu azaltmak için
+ingest_version_ttl kadar bellekte tutulur, bu worker'daki ingest hemen düşürür.
+
+save_match updated_at'i maçın alt satırlarından (istatistik, oyuncu ...) önce
+commit eder; ingest sırasında gelen okuma eksik sonucu o versiyonla cache'ler.
+Bu yüzden ingest sonunda bump_ingest_version maçın updated_at'ini tekrar
+ilerletir: eksik sonuç eski anahtarda kalır.
+"""
+from app.config import get_settings
+from app.services.cache import TTLCache
+from app.services.db import execute_insert, execute_query
+
+_version_cache = TTLCache(get_settings().ingest_version_ttl, max_entries=1)
+
+INGEST_VERSION_SQL = "SELECT MAX(updated_at) AS version FROM public.matches"
+
+BUMP_INGEST_VERSION_SQL = "UPDATE public.matches SET updated_at = NOW() WHERE id = :match_id"
+
+
+def current_ingest_version() -> str:
+    version = _version_cache.get("version")
+    if version is None:
+        rows = execute_query(INGEST_VERSION_SQL)
+        value = rows[0]["version"] if rows else None
+        version = value.isoformat() if value is not None else "empty"
+        _version_cache.set("version", version)
+    return version
+
+
+def invalidate_ingest_version() -> None:
+    """Bu worker ingest yaptı: sonraki okuma versiyonu DB'den tazelesin"""
+    _version_cache.delete("version")
+
+
+def bump_ingest_version(match_id: int) -> None:
+    """Maçın tüm satırları yazıldı: versiyonu ilerlet ve bu worker'da hemen düşür"""
+    execute_insert(BUMP_INGEST_VERSION_SQL, {"match_id": match_id})
+    invalidate_ingest_version()
@@ -0,0 +1,338 @@
+"""
+Match Parser - FotMob maç detayını tablo satırlarına çeviren saf fonksiyonlar
+DB erişimi yok; match_saver bu satırları yazar, benchmarks/ parse hızını ölçer
+"""
+import re
+from typing import Optional, List
+
+
+def parse_match_round(round_value) -> int:
+    """Round değerini integer'a çevir (turnuva formatları dahil)"""
+    if round_value is None:
+        return 0
+
+    if isinstance(round_value, int):
+        return round_value
+
+    round_str = str(round_value).strip()
+    if not round_str:
+        return 0
+
+    # Tournament format: "1/16", "1/4", "1/2"
+    if '/' in round_str:
+        try:
+            parts = round_str.split('/')
+            if len(parts) == 2 and parts[0] == '1':
+                return int(parts[1])
+        except:
+            pass
+        return 0
+
+    # Final
+    if round_str.lower() in ('final', 'finale'):
+        return 1
+    if 'semi' in round_str.lower():
+        return 2
+    if 'quarter' in round_str.lower():
+        return 4
+
+    try:
+        return int(round_str)
+    except ValueError:
+        numbers = re.findall(r'\d+', round_str)
+        if numbers:
+            return int(numbers[0])
+        return 0
+
+
+def parse_value(val):
+    """'123 (45%)', '55%', '1.23', 7 -> sayı"""
+    if val is None:
+        return None
+    if isinstance(val, (int, float)):
+        return val
+    val_str = str(val)
+    if '(' in val_str:
+        num_part = val_str.split('(')[0].strip()
+        try:
+            return int(num_part)
+        except:
+            return None
+    if '%' in val_str:
+        try:
+            return float(val_str.replace('%', ''))
+        except:
+            return None
+    try:
+        return float(val_str) if '.' in val_str else int(val_str)
+    except:
+        return None
+
+
+def parse_pct(val):
+    """'123 (45%)' -> 45.0, '55%' -> 55.0"""
+    if val is None:
+        return None
+    val_str = str(val)
+    if '(' in val_str and '%' in val_str:
+        try:
+            pct_part = val_str.split('(')[1].replace('%', '').replace(')', '')
+            return float(pct_part)
+        except:
+            return None
+    if '%' in val_str:
+        try:
+            return float(val_str.replace('%', ''))
+        except:
+            return None
+    return None
+
+
+def _or_default(convert, default):
+    """Boş/0 değerde default, aksi halde convert(değer) - match_stats semantiği"""
+    return lambda val: convert(val) if val else default
+
+
+def _pct_float(val):
+    return float(str(val).replace('%', ''))
+
+
+_int0 = _or_default(int, 0)
+
+# Takım istatistikleri: (FotMob key'leri, tablo, kolon, dönüştürücü)
+# Kolon home_<kolon>/away_<kolon> olarak yazılır. Yeni stat = yeni satır.
+MATCH_STAT_MAP = [
+    # public.match_stats
+    (('expected_goals',), 'stats', 'xg', _or_default(float, 0.0)),
+    (('total_shots',), 'stats', 'shots', _int0),
+    (('ShotsOnTarget', 'shots_on_target'), 'stats', 'shots_on_target', _int0),
+    (('BallPossesion', 'BallPossession', 'Ball possession', 'possession_percentage'),
+     'stats', 'possession', _or_default(_pct_float, 50.0)),
+    (('corners',), 'stats', 'corners', _int0),
+    (('fouls',), 'stats', 'fouls', _int0),
+    (('yellow_cards',), 'stats', 'yellow_cards', _int0),
+    (('red_cards',), 'stats', 'red_cards', _int0),
+
+    # public.match_advanced_stats
+    (('expected_goals_open_play',), 'advanced', 'open_play_xg', parse_value),
+    (('expected_goals_set_play',), 'advanced', 'set_piece_xg', parse_value),
+    (('expected_goals_on_target',), 'advanced', 'xgot', parse_value),
+    (('blocked_shots',), 'advanced', 'shots_blocked', parse_value),
+    (('ShotsOffTarget',), 'advanced', 'shots_off_target', parse_value),
+    (('shots_inside_box',), 'advanced', 'shots_inside_box', parse_value),
+    (('shots_outside_box',), 'advanced', 'shots_outside_box', parse_value),
+    (('passes',), 'advanced', 'total_passes', parse_value),
+    (('accurate_passes',), 'advanced', 'pass_accuracy', parse_pct),
+    (('long_balls_accurate',), 'advanced', 'long_passes', parse_value),
+    (('long_balls_accurate',), 'advanced', 'long_pass_accuracy', parse_pct),
+    (('accurate_crosses',), 'advanced', 'crosses', parse_value),
+    (('accurate_crosses',), 'advanced', 'cross_accuracy', parse_pct),
+    (('own_half_passes',), 'advanced', 'passes_own_half', parse_value),
+    (('opposition_half_passes',), 'advanced', 'passes_opp_half', parse_value),
+    (('touches_opp_box',), 'advanced', 'touches_in_box', parse_value),
+    (('matchstats.headers.tackles',), 'advanced', 'tackles', parse_value),
+    (('interceptions',), 'advanced', 'interceptions', parse_value),
+    (('shot_blocks',), 'advanced', 'blocks', parse_value),
+    (('clearances',), 'advanced', 'clearances', parse_value),
+    (('keeper_saves',), 'advanced', 'goalkeeper_saves', parse_value),
+    (('duel_won',), 'advanced', 'duels_won', parse_value),
+    (('ground_duels_won',), 'advanced', 'duels_won_pct', parse_pct),
+    (('aerials_won',), 'advanced', 'aerial_duels_won', parse_value),
+    (('aerials_won',), 'advanced', 'aerial_duels_pct', parse_pct),
+    (('dribbles_succeeded',), 'advanced', 'dribbles_successful', parse_value),
+    (('dribbles_succeeded',), 'advanced', 'dribbles_pct', parse_pct),
+    (('Offsides',), 'advanced', 'offsides', parse_value),
+    (('big_chance',), 'advanced', 'big_chances', parse_value),
+    (('big_chance_missed_title',), 'advanced', 'big_chances_missed', parse_value),
+]
+
+# Stats varken bulunamayan kolonların değeri
+MATCH_STATS_DEFAULTS = {
+    "home_xg": 0.0, "away_xg": 0.0,
+    "home_shots": 0, "away_shots": 0,
+    "home_shots_on_target": 0, "away_shots_on_target": 0,
+    "home_possession": 50.0, "away_possession": 50.0,
+    "home_corners": 0, "away_corners": 0,
+    "home_fouls": 0, "away_fouls": 0,
+    "home_yellow_cards": 0, "away_yellow_cards": 0,
+    "home_red_cards": 0, "away_red_cards": 0,
+}
+
+ADVANCED_STATS_COLUMNS = [
+    f"{side}_{column}"
+    for _, table, column, _ in MATCH_STAT_MAP if table == 'advanced'
+    for side in ('home', 'away')
+]
+
+# public.match_period_stats: devre başına match_stats + advanced kolonları
+PERIOD_STATS_COLUMNS = list(MATCH_STATS_DEFAULTS) + ADVANCED_STATS_COLUMNS
+
+
+# Oyuncu istatistikleri: kolon -> (isim fallback'leri, stat alanı, default, sadece kaleci)
+# İlk dolu (truthy) isim kazanır; hiçbiri yoksa default.
+PLAYER_STAT_MAP = {
+    "rating": (('FotMob rating', 'rating_title'), 'value', None, False),
+    "minutes_played": (('Minutes played', 'minutes_played'), 'value', None, False),
+    "goals": (('Goals', 'goals'), 'value', 0, False),
+    "assists": (('Assists', 'assists'), 'value', 0, False),
+    "xg": (('Expected goals (xG)', 'expected_goals'), 'value', None, False),
+    "xa": (('Expected assists (xA)', 'expected_assists'), 'value', None, False),
+    "total_shots": (('Total shots', 'total_shots'), 'value', 0, False),
+    "shots_on_target": (('Shots on target', 'ShotsOnTarget'), 'value', 0, False),
+    "touches": (('Touches', 'touches'), 'value', 0, False),
+    "total_passes": (('Accurate passes', 'accurate_passes'), 'total', 0, False),
+    "accurate_passes": (('Accurate passes', 'accurate_passes'), 'value', 0, False),
+    "key_passes": (('Key passes', 'key_passes'), 'value', 0, False),
+    "tackles": (('Tackles', 'tackles'), 'value', 0, False),
+    "interceptions": (('Interceptions', 'interceptions'), 'value', 0, False),
+    "clearances": (('Clearances', 'clearances'), 'value', 0, False),
+    "duels_won": (('Duels won', 'duels_won'), 'value', 0, False),
+    "duels_lost": (('Duels lost', 'duels_lost'), 'value', 0, False),
+    "fouls_committed": (('Fouls', 'fouls'), 'value', 0, False),
+    "fouls_won": (('Was fouled', 'was_fouled'), 'value', 0, False),
+    "saves": (('Saves', 'saves'), 'value', 0, True),
+    "goals_conceded": (('Goals conceded', 'goals_conceded'), 'value', None, True),
+}
+
+
+def _compile_match_dispatch() -> dict:
+    """FotMob key -> ((tablo, home kolon, away kolon, dönüştürücü), ...)"""
+    dispatch = {}
+    for keys, table, column, convert in MATCH_STAT_MAP:
+        for key in keys:
+            dispatch.setdefault(key, []).append((table, f"home_{column}", f"away_{column}", convert))
+    return {key: tuple(targets) for key, targets in dispatch.items()}
+
+
+def _compile_player_lookups() -> tuple:
+    """PLAYER_STAT_MAP -> ((kolon, ((isim, alan), ...), default, sadece kaleci), ...)"""
+    return tuple(
+        (column, tuple((name, field) for name in names), default, gk_only)
+        for column, (names, field, default, gk_only) in PLAYER_STAT_MAP.items()
+    )
+
+
+_MATCH_DISPATCH = _compile_match_dispatch()
+_PLAYER_LOOKUPS = _compile_player_lookups()
+
+
+def _extract_team_rows(match_data: dict, period: str = 'All'):
+    """Periods.<period> üzerinde tek geçiş: (match_stats satırı, advanced satırı); stats yoksa (None, None)"""
+    stats_data = match_data.get('content', {}).get('stats')
+    if not stats_data:
+        return None, None
+
+    rows = {'stats': dict(MATCH_STATS_DEFAULTS), 'advanced': dict.fromkeys(ADVANCED_STATS_COLUMNS)}
+    dispatch = _MATCH_DISPATCH
+
+    for stat_group in stats_data.get('Periods', {}).get(period, {}).get('stats', []):
+        for stat in stat_group.get('stats', []):
+            targets = dispatch.get(stat.get('key', ''))
+            if targets is None:
+                continue
+            stats_arr = stat.get('stats', [None, None])
+            home_val = stats_arr[0] if len(stats_arr) > 0 else None
+            away_val = stats_arr[1] if len(stats_arr) > 1 else None
+            for table, home_col, away_col, convert in targets:
+                row = rows[table]
+                row[home_col] = convert(home_val)
+                row[away_col] = convert(away_val)
+
+    return rows['stats'], rows['advanced']
+
+
+def _extract_player_row(player_data: dict, team_id: int) -> dict:
+    all_stats = {}
+    for stat_group in player_data.get('stats', []):
+        all_stats.update(stat_group.get('stats', {}))
+
+    is_goalkeeper = player_data.get('isGoalkeeper', False)
+    row = {
+        "team_id": team_id,
+        "fotmob_player_id": player_data.get('id'),
+        "player_name": player_data.get('name', ''),
+        "position": None,
+    }
+    for column, lookups, default, gk_only in _PLAYER_LOOKUPS:
+        if gk_only and not is_goalkeeper:
+            row[column] = None
+            continue
+        value = None
+        for name, field in lookups:
+            stat_obj = all_stats.get(name)
+            stat_data = stat_obj.get('stat') if stat_obj else None
+            if stat_data:
+                value = stat_data.get(field)
+                if value:
+                    break
+        row[column] = value or default
+    return row
+
+
+def parse_match_stats(match_data: dict) -> Optional[dict]:
+    """public.match_stats satırı (match_id hariç); stats yoksa None"""
+    return _extract_team_rows(match_data)[0]
+
+
+def parse_match_advanced_stats(match_data: dict) -> Optional[dict]:
+    """public.match_advanced_stats satırı (match_id hariç); stats yoksa None"""
+    return _extract_team_rows(match_data)[1]
+
+
+def parse_match_player_stats(match_data: dict, home_team_id: int, away_team_id: int) -> List[dict]:
+    """public.match_player_stats satırları (match_id hariç)"""
+    content = match_data.get('content', {})
+    player_stats_data = content.get('playerStats', {})
+    lineup = content.get('lineup', {})
+
+    if not player_stats_data:
+        return []
+
+    home_team_fotmob_id = lineup.get('homeTeam', {}).get('id')
+    away_team_fotmob_id = lineup.get('awayTeam', {}).get('id')
+
+    rows = []
+    for player_data in player_stats_data.values():
+        player_team_id = player_data.get('teamId')
+        if player_team_id == home_team_fotmob_id:
+            team_id = home_team_id
+        elif player_team_id == away_team_fotmob_id:
+            team_id = away_team_id
+        else:
+            continue
+        rows.append(_extract_player_row(player_data, team_id))
+    return rows
+
+
+def parse_match_period_stats(match_data: dict) -> List[dict]:
+    """
+    public.match_period_stats satırları (match_id hariç)
+    Periods altındaki 'All' dışındaki her blok (FirstHalf, SecondHalf, ...) bir satır
+    """
+    stats_data = match_data.get('content', {}).get('stats')
+    if not stats_data:
+        return []
+
+    rows = []
+    for period, block in (stats_data.get('Periods') or {}).items():
+        if period == 'All' or not block or not block.get('stats'):
+            continue
+        stats, advanced = _extract_team_rows(match_data, period)
+        rows.append({"period": period, **stats, **advanced})
+    return rows
+
+
+def extract_match_rows(match_data: dict, home_team_id: int, away_team_id: int) -> dict:
+    """
+    Maç detayından tüm istatistik satırlarını tek seferde çıkar
+
+    Returns:
+        {"stats": dict|None, "advanced": dict|None, "periods": [dict, ...], "players": [dict, ...]}
+    """
+    stats, advanced = _extract_team_rows(match_data)
+    return {
+        "stats": stats,
+        "advanced": advanced,
+        "periods": parse_match_period_stats(match_data),
+        "players": parse_match_player_stats(match_data, home_team_id, away_team_id),
+    }
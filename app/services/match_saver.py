@@ -5,49 +5,23 @@ fotmob_to_db.py'nin Python FastAPI versiyonu
 import json
 from typing import Optional, Dict, Any
 from datetime import datetime
-from app.services.db import execute_query, execute_insert
+from sqlalchemy import text
+from app.services.db import execute_query, execute_insert as _execute_insert, get_transaction, use_primary
+from app.services.ingest_metrics import stage, count_rows
+from app.services.ingest_version import bump_ingest_version
+from app.services.players import SEASON_UPSERT_SQL as PLAYER_SEASON_UPSERT_SQL
+from app.services.match_parser import parse_match_round, extract_match_rows, PERIOD_STATS_COLUMNS
+from app.services.ratings import rating_table
+from app.services.standings import invalidate_standings
 
 
-def parse_match_round(round_value) -> int:
-    """Round değerini integer'a çevir (turnuva formatları dahil)"""
-    if round_value is None:
-        return 0
-    
-    if isinstance(round_value, int):
-        return round_value
-    
-    round_str = str(round_value).strip()
-    if not round_str:
-        return 0
-    
-    # Tournament format: "1/16", "1/4", "1/2"
-    if '/' in round_str:
-        try:
-            parts = round_str.split('/')
-            if len(parts) == 2 and parts[0] == '1':
-                return int(parts[1])
-        except:
-            pass
-        return 0
-    
-    # Final
-    if round_str.lower() in ('final', 'finale'):
-        return 1
-    if 'semi' in round_str.lower():
-        return 2
-    if 'quarter' in round_str.lower():
-        return 4
-    
-    try:
-        return int(round_str)
-    except ValueError:
-        import re
-        numbers = re.findall(r'\d+', round_str)
-        if numbers:
-            return int(numbers[0])
-        return 0
+def execute_insert(sql: str, params: dict = None) -> dict | None:
+    """db.execute_insert + aktif ingest aşamasına satır sayısı"""
+    count_rows()
+    return _execute_insert(sql, params)
 
 
+@stage("save_league")
 def save_league(match_data: dict) -> int:
     """Ligi kaydet veya mevcut ID'yi döndür"""
     general = match_data.get('general', {})
@@ -75,6 +49,7 @@ def save_league(match_data: dict) -> int:
     return result['id'] if result else None
 
 
+@stage("save_team")
 def save_team(team_data: dict, league_id: int) -> int:
     """Takımı kaydet veya mevcut ID'yi döndür"""
     check_query = f"SELECT id FROM public.teams WHERE fotmob_team_id = {team_data['id']}"
@@ -98,6 +73,7 @@ def save_team(team_data: dict, league_id: int) -> int:
     return result['id'] if result else None
 
 
+@stage("save_match")
 def save_match(match_data: dict, home_team_id: int, away_team_id: int, league_id: int) -> int:
     """Maçı kaydet veya güncelle"""
     general = match_data.get('general', {})
@@ -170,60 +146,12 @@ def save_match(match_data: dict, home_team_id: int, away_team_id: int, league_id
     return result['id'] if result else None
 
 
-def save_match_stats(match_id: int, match_data: dict):
-    """Maç istatistiklerini kaydet"""
-    content = match_data.get('content', {})
-    stats_data = content.get('stats')
-    
-    if not stats_data:
+@stage("save_match_stats")
+def save_match_stats(match_id: int, row: Optional[dict]):
+    """Maç istatistiklerini kaydet (row: extract_match_rows()["stats"])"""
+    if row is None:
         return
     
-    # Default values
-    home_xg = away_xg = 0.0
-    home_shots = away_shots = 0
-    home_shots_on_target = away_shots_on_target = 0
-    home_possession = away_possession = 50.0
-    home_corners = away_corners = 0
-    home_fouls = away_fouls = 0
-    home_yellow = away_yellow = 0
-    home_red = away_red = 0
-    
-    periods = stats_data.get('Periods', {})
-    all_stats = periods.get('All', {}).get('stats', [])
-    
-    for stat_group in all_stats:
-        for stat in stat_group.get('stats', []):
-            key = stat.get('key', '')
-            stats_arr = stat.get('stats', [None, None])
-            
-            home_val = stats_arr[0] if len(stats_arr) > 0 else None
-            away_val = stats_arr[1] if len(stats_arr) > 1 else None
-            
-            if key == 'expected_goals':
-                home_xg = float(home_val) if home_val else 0.0
-                away_xg = float(away_val) if away_val else 0.0
-            elif key == 'total_shots':
-                home_shots = int(home_val) if home_val else 0
-                away_shots = int(away_val) if away_val else 0
-            elif key in ('ShotsOnTarget', 'shots_on_target'):
-                home_shots_on_target = int(home_val) if home_val else 0
-                away_shots_on_target = int(away_val) if away_val else 0
-            elif key in ('BallPossesion', 'BallPossession', 'Ball possession', 'possession_percentage'):
-                home_possession = float(str(home_val).replace('%', '')) if home_val else 50.0
-                away_possession = float(str(away_val).replace('%', '')) if away_val else 50.0
-            elif key == 'corners':
-                home_corners = int(home_val) if home_val else 0
-                away_corners = int(away_val) if away_val else 0
-            elif key == 'fouls':
-                home_fouls = int(home_val) if home_val else 0
-                away_fouls = int(away_val) if away_val else 0
-            elif key == 'yellow_cards':
-                home_yellow = int(home_val) if home_val else 0
-                away_yellow = int(away_val) if away_val else 0
-            elif key == 'red_cards':
-                home_red = int(home_val) if home_val else 0
-                away_red = int(away_val) if away_val else 0
-    
     query = """
         INSERT INTO public.match_stats (
             match_id, home_xg, away_xg, home_shots, away_shots,
@@ -237,7 +165,7 @@ def save_match_stats(match_id: int, match_data: dict):
                 :home_shots_on_target, :away_shots_on_target,
                 :home_possession, :away_possession,
                 :home_corners, :away_corners, :home_fouls, :away_fouls,
-                :home_yellow, :away_yellow, :home_red, :away_red)
+                :home_yellow_cards, :away_yellow_cards, :home_red_cards, :away_red_cards)
         ON CONFLICT (match_id) DO UPDATE SET
             home_xg = EXCLUDED.home_xg,
             away_xg = EXCLUDED.away_xg,
@@ -248,19 +176,10 @@ def save_match_stats(match_id: int, match_data: dict):
             home_possession = EXCLUDED.home_possession,
             away_possession = EXCLUDED.away_possession
     """
-    execute_insert(query, {
-        "match_id": match_id,
-        "home_xg": home_xg, "away_xg": away_xg,
-        "home_shots": home_shots, "away_shots": away_shots,
-        "home_shots_on_target": home_shots_on_target, "away_shots_on_target": away_shots_on_target,
-        "home_possession": home_possession, "away_possession": away_possession,
-        "home_corners": home_corners, "away_corners": away_corners,
-        "home_fouls": home_fouls, "away_fouls": away_fouls,
-        "home_yellow": home_yellow, "away_yellow": away_yellow,
-        "home_red": home_red, "away_red": away_red
-    })
+    execute_insert(query, {"match_id": match_id, **row})
 
 
+@stage("save_match_context")
 def save_match_context(match_id: int, match_data: dict):
     """Stadyum, hakem, hava durumu bilgilerini kaydet"""
     check_query = f"SELECT match_id FROM public.match_context WHERE match_id = {match_id}"
@@ -320,6 +239,7 @@ def save_match_context(match_id: int, match_data: dict):
     })
 
 
+@stage("save_match_formations")
 def save_match_formations(match_id: int, match_data: dict):
     """Diziliş bilgilerini kaydet"""
     check_query = f"SELECT match_id FROM public.match_formations WHERE match_id = {match_id}"
@@ -350,6 +270,7 @@ def save_match_formations(match_id: int, match_data: dict):
         })
 
 
+@stage("save_match_lineups")
 def save_match_lineups(match_id: int, match_data: dict, home_team_id: int, away_team_id: int):
     """Kadro bilgilerini kaydet"""
     check_query = f"SELECT COUNT(*) as cnt FROM public.match_lineups WHERE match_id = {match_id}"
@@ -436,6 +357,7 @@ def save_match_lineups(match_id: int, match_data: dict, home_team_id: int, away_
             })
 
 
+@stage("save_match_events")
 def save_match_events(match_id: int, match_data: dict, home_team_id: int, away_team_id: int):
     """Maç olaylarını kaydet (gol, kart, değişiklik)"""
     check_query = f"SELECT COUNT(*) as cnt FROM public.match_events WHERE match_id = {match_id}"
@@ -522,50 +444,86 @@ def save_match_events(match_id: int, match_data: dict, home_team_id: int, away_t
         })
 
 
+# Takımın son bilinen eksikleri (migrations/007); eski tarihli maç yeni snapshot'ı ezmez
+TEAM_AVAILABILITY_UPSERT = """
+    INSERT INTO public.team_availability AS ta (team_id, match_id, match_date, players, updated_at)
+    SELECT :team_id, m.id, m.match_date, CAST(:players AS jsonb), NOW()
+    FROM public.matches m
+    WHERE m.id = :match_id
+    ON CONFLICT (team_id) DO UPDATE SET
+        match_id = EXCLUDED.match_id,
+        match_date = EXCLUDED.match_date,
+        players = EXCLUDED.players,
+        updated_at = NOW()
+    WHERE ta.match_date IS NULL
+       OR EXCLUDED.match_date >= ta.match_date
+"""
+
+
+@stage("save_player_availability")
 def save_player_availability(match_id: int, match_data: dict, home_team_id: int, away_team_id: int):
-    """Sakatlık/ceza bilgilerini kaydet"""
-    check_query = f"SELECT COUNT(*) as cnt FROM public.player_availability WHERE match_id = {match_id}"
-    existing = execute_query(check_query)
-    if existing and existing[0]['cnt'] > 0:
-        return
-    
+    """Sakatlık/ceza bilgilerini kaydet (maç satırları + takımın son snapshot'ı)"""
     content = match_data.get('content', {})
     lineup = content.get('lineup', {})
     
     if not lineup:
         return
     
+    teams = []
     for team_key, team_id in [('homeTeam', home_team_id), ('awayTeam', away_team_id)]:
         team_data = lineup.get(team_key, {})
         
         if not team_data:
             continue
         
-        unavailable = team_data.get('unavailable', [])
-        for player in unavailable:
+        players = []
+        for player in team_data.get('unavailable', []):
             if not player:
                 continue
             
-            player_name = player.get('name', '')
             reason = player.get('injuryStatus', 'Unknown')
             if not reason or reason == 'Unknown':
                 reason = player.get('reason', 'Unknown')
             
-            query = """
-                INSERT INTO public.player_availability (
-                    match_id, team_id, player_name, status, reason
-                )
-                VALUES (:match_id, :team_id, :player_name, :status, :reason)
-            """
+            players.append({
+                "player_id": player.get('id'),
+                "name": player.get('name', ''),
+                "status": 'UNAVAILABLE',
+                "reason": reason
+            })
+        teams.append((team_id, players))
+    
+    # Snapshot: kadrosu gelen takımın eksik listesi (boş liste = eksik yok), daha yeni maç varsa dokunmaz
+    for team_id, players in teams:
+        execute_insert(TEAM_AVAILABILITY_UPSERT, {
+            "team_id": team_id,
+            "match_id": match_id,
+            "players": json.dumps(players, ensure_ascii=False)
+        })
+    
+    check_query = f"SELECT COUNT(*) as cnt FROM public.player_availability WHERE match_id = {match_id}"
+    existing = execute_query(check_query)
+    if existing and existing[0]['cnt'] > 0:
+        return
+    
+    query = """
+        INSERT INTO public.player_availability (
+            match_id, team_id, player_name, status, reason
+        )
+        VALUES (:match_id, :team_id, :player_name, :status, :reason)
+    """
+    for team_id, players in teams:
+        for player in players:
             execute_insert(query, {
                 "match_id": match_id,
                 "team_id": team_id,
-                "player_name": player_name,
-                "status": 'UNAVAILABLE',
-                "reason": reason
+                "player_name": player["name"],
+                "status": player["status"],
+                "reason": player["reason"]
             })
 
 
+@stage("save_h2h_stats")
 def save_h2h_stats(match_data: dict, home_team_id: int, away_team_id: int):
     """H2H istatistiklerini kaydet"""
     check_query = f"""
@@ -626,152 +584,16 @@ def save_h2h_stats(match_data: dict, home_team_id: int, away_team_id: int):
     })
 
 
-def save_match_advanced_stats(match_id: int, match_data: dict):
-    """Detaylı maç istatistiklerini kaydet"""
-    check_query = f"SELECT match_id FROM public.match_advanced_stats WHERE match_id = {match_id}"
-    if execute_query(check_query):
+@stage("save_match_advanced_stats")
+def save_match_advanced_stats(match_id: int, row: Optional[dict]):
+    """Detaylı maç istatistiklerini kaydet (row: extract_match_rows()["advanced"])"""
+    if row is None:
         return
     
-    content = match_data.get('content', {})
-    stats_data = content.get('stats')
-    
-    if not stats_data:
+    check_query = f"SELECT match_id FROM public.match_advanced_stats WHERE match_id = {match_id}"
+    if execute_query(check_query):
         return
     
-    periods = stats_data.get('Periods', {})
-    all_stats = periods.get('All', {}).get('stats', [])
-    
-    stats_dict = {}
-    
-    def parse_value(val):
-        if val is None:
-            return None
-        if isinstance(val, (int, float)):
-            return val
-        val_str = str(val)
-        if '(' in val_str:
-            num_part = val_str.split('(')[0].strip()
-            try:
-                return int(num_part)
-            except:
-                return None
-        if '%' in val_str:
-            try:
-                return float(val_str.replace('%', ''))
-            except:
-                return None
-        try:
-            return float(val_str) if '.' in val_str else int(val_str)
-        except:
-            return None
-    
-    def parse_pct(val):
-        if val is None:
-            return None
-        val_str = str(val)
-        if '(' in val_str and '%' in val_str:
-            try:
-                pct_part = val_str.split('(')[1].replace('%', '').replace(')', '')
-                return float(pct_part)
-            except:
-                return None
-        if '%' in val_str:
-            try:
-                return float(val_str.replace('%', ''))
-            except:
-                return None
-        return None
-    
-    for stat_group in all_stats:
-        for stat in stat_group.get('stats', []):
-            key = stat.get('key', '')
-            stats_arr = stat.get('stats', [None, None])
-            
-            home_val = stats_arr[0] if len(stats_arr) > 0 else None
-            away_val = stats_arr[1] if len(stats_arr) > 1 else None
-            
-            # Map keys to columns
-            if key == 'expected_goals_open_play':
-                stats_dict['home_open_play_xg'] = parse_value(home_val)
-                stats_dict['away_open_play_xg'] = parse_value(away_val)
-            elif key == 'expected_goals_set_play':
-                stats_dict['home_set_piece_xg'] = parse_value(home_val)
-                stats_dict['away_set_piece_xg'] = parse_value(away_val)
-            elif key == 'expected_goals_on_target':
-                stats_dict['home_xgot'] = parse_value(home_val)
-                stats_dict['away_xgot'] = parse_value(away_val)
-            elif key == 'blocked_shots':
-                stats_dict['home_shots_blocked'] = parse_value(home_val)
-                stats_dict['away_shots_blocked'] = parse_value(away_val)
-            elif key == 'ShotsOffTarget':
-                stats_dict['home_shots_off_target'] = parse_value(home_val)
-                stats_dict['away_shots_off_target'] = parse_value(away_val)
-            elif key == 'shots_inside_box':
-                stats_dict['home_shots_inside_box'] = parse_value(home_val)
-                stats_dict['away_shots_inside_box'] = parse_value(away_val)
-            elif key == 'shots_outside_box':
-                stats_dict['home_shots_outside_box'] = parse_value(home_val)
-                stats_dict['away_shots_outside_box'] = parse_value(away_val)
-            elif key == 'passes':
-                stats_dict['home_total_passes'] = parse_value(home_val)
-                stats_dict['away_total_passes'] = parse_value(away_val)
-            elif key == 'accurate_passes':
-                stats_dict['home_pass_accuracy'] = parse_pct(home_val)
-                stats_dict['away_pass_accuracy'] = parse_pct(away_val)
-            elif key == 'long_balls_accurate':
-                stats_dict['home_long_passes'] = parse_value(home_val)
-                stats_dict['away_long_passes'] = parse_value(away_val)
-                stats_dict['home_long_pass_accuracy'] = parse_pct(home_val)
-                stats_dict['away_long_pass_accuracy'] = parse_pct(away_val)
-            elif key == 'accurate_crosses':
-                stats_dict['home_crosses'] = parse_value(home_val)
-                stats_dict['away_crosses'] = parse_value(away_val)
-                stats_dict['home_cross_accuracy'] = parse_pct(home_val)
-                stats_dict['away_cross_accuracy'] = parse_pct(away_val)
-            elif key == 'own_half_passes':
-                stats_dict['home_passes_own_half'] = parse_value(home_val)
-                stats_dict['away_passes_own_half'] = parse_value(away_val)
-            elif key == 'opposition_half_passes':
-                stats_dict['home_passes_opp_half'] = parse_value(home_val)
-                stats_dict['away_passes_opp_half'] = parse_value(away_val)
-            elif key == 'touches_opp_box':
-                stats_dict['home_touches_in_box'] = parse_value(home_val)
-                stats_dict['away_touches_in_box'] = parse_value(away_val)
-            elif key == 'matchstats.headers.tackles':
-                stats_dict['home_tackles'] = parse_value(home_val)
-                stats_dict['away_tackles'] = parse_value(away_val)
-            elif key == 'interceptions':
-                stats_dict['home_interceptions'] = parse_value(home_val)
-                stats_dict['away_interceptions'] = parse_value(away_val)
-            elif key == 'shot_blocks':
-                stats_dict['home_blocks'] = parse_value(home_val)
-                stats_dict['away_blocks'] = parse_value(away_val)
-            elif key == 'clearances':
-                stats_dict['home_clearances'] = parse_value(home_val)
-                stats_dict['away_clearances'] = parse_value(away_val)
-            elif key == 'keeper_saves':
-                stats_dict['home_goalkeeper_saves'] = parse_value(home_val)
-                stats_dict['away_goalkeeper_saves'] = parse_value(away_val)
-            elif key == 'duel_won':
-                stats_dict['home_duels_won'] = parse_value(home_val)
-                stats_dict['away_duels_won'] = parse_value(away_val)
-            elif key == 'ground_duels_won':
-                stats_dict['home_duels_won_pct'] = parse_pct(home_val)
-                stats_dict['away_duels_won_pct'] = parse_pct(away_val)
-            elif key == 'aerials_won':
-                stats_dict['home_aerial_duels_won'] = parse_value(home_val)
-                stats_dict['away_aerial_duels_won'] = parse_value(away_val)
-                stats_dict['home_aerial_duels_pct'] = parse_pct(home_val)
-                stats_dict['away_aerial_duels_pct'] = parse_pct(away_val)
-            elif key == 'dribbles_succeeded':
-                stats_dict['home_dribbles_successful'] = parse_value(home_val)
-                stats_dict['away_dribbles_successful'] = parse_value(away_val)
-                stats_dict['home_dribbles_pct'] = parse_pct(home_val)
-                stats_dict['away_dribbles_pct'] = parse_pct(away_val)
-            elif key == 'Offsides':
-                stats_dict['home_offsides'] = parse_value(home_val)
-                stats_dict['away_offsides'] = parse_value(away_val)
-    
     query = """
         INSERT INTO public.match_advanced_stats (
             match_id,
@@ -790,7 +612,8 @@ def save_match_advanced_stats(match_id: int, match_data: dict):
             home_duels_won, away_duels_won, home_duels_won_pct, away_duels_won_pct,
             home_aerial_duels_won, away_aerial_duels_won, home_aerial_duels_pct, away_aerial_duels_pct,
             home_dribbles_successful, away_dribbles_successful, home_dribbles_pct, away_dribbles_pct,
-            home_offsides, away_offsides
+            home_offsides, away_offsides,
+            home_big_chances, away_big_chances, home_big_chances_missed, away_big_chances_missed
         )
         VALUES (
             :match_id,
@@ -809,202 +632,75 @@ def save_match_advanced_stats(match_id: int, match_data: dict):
             :home_duels_won, :away_duels_won, :home_duels_won_pct, :away_duels_won_pct,
             :home_aerial_duels_won, :away_aerial_duels_won, :home_aerial_duels_pct, :away_aerial_duels_pct,
             :home_dribbles_successful, :away_dribbles_successful, :home_dribbles_pct, :away_dribbles_pct,
-            :home_offsides, :away_offsides
+            :home_offsides, :away_offsides,
+            :home_big_chances, :away_big_chances, :home_big_chances_missed, :away_big_chances_missed
         )
     """
-    execute_insert(query, {
-        "match_id": match_id,
-        "home_open_play_xg": stats_dict.get('home_open_play_xg'),
-        "away_open_play_xg": stats_dict.get('away_open_play_xg'),
-        "home_set_piece_xg": stats_dict.get('home_set_piece_xg'),
-        "away_set_piece_xg": stats_dict.get('away_set_piece_xg'),
-        "home_xgot": stats_dict.get('home_xgot'),
-        "away_xgot": stats_dict.get('away_xgot'),
-        "home_shots_blocked": stats_dict.get('home_shots_blocked'),
-        "away_shots_blocked": stats_dict.get('away_shots_blocked'),
-        "home_shots_off_target": stats_dict.get('home_shots_off_target'),
-        "away_shots_off_target": stats_dict.get('away_shots_off_target'),
-        "home_shots_inside_box": stats_dict.get('home_shots_inside_box'),
-        "away_shots_inside_box": stats_dict.get('away_shots_inside_box'),
-        "home_shots_outside_box": stats_dict.get('home_shots_outside_box'),
-        "away_shots_outside_box": stats_dict.get('away_shots_outside_box'),
-        "home_total_passes": stats_dict.get('home_total_passes'),
-        "away_total_passes": stats_dict.get('away_total_passes'),
-        "home_pass_accuracy": stats_dict.get('home_pass_accuracy'),
-        "away_pass_accuracy": stats_dict.get('away_pass_accuracy'),
-        "home_long_passes": stats_dict.get('home_long_passes'),
-        "away_long_passes": stats_dict.get('away_long_passes'),
-        "home_long_pass_accuracy": stats_dict.get('home_long_pass_accuracy'),
-        "away_long_pass_accuracy": stats_dict.get('away_long_pass_accuracy'),
-        "home_crosses": stats_dict.get('home_crosses'),
-        "away_crosses": stats_dict.get('away_crosses'),
-        "home_cross_accuracy": stats_dict.get('home_cross_accuracy'),
-        "away_cross_accuracy": stats_dict.get('away_cross_accuracy'),
-        "home_passes_own_half": stats_dict.get('home_passes_own_half'),
-        "away_passes_own_half": stats_dict.get('away_passes_own_half'),
-        "home_passes_opp_half": stats_dict.get('home_passes_opp_half'),
-        "away_passes_opp_half": stats_dict.get('away_passes_opp_half'),
-        "home_touches_in_box": stats_dict.get('home_touches_in_box'),
-        "away_touches_in_box": stats_dict.get('away_touches_in_box'),
-        "home_tackles": stats_dict.get('home_tackles'),
-        "away_tackles": stats_dict.get('away_tackles'),
-        "home_interceptions": stats_dict.get('home_interceptions'),
-        "away_interceptions": stats_dict.get('away_interceptions'),
-        "home_blocks": stats_dict.get('home_blocks'),
-        "away_blocks": stats_dict.get('away_blocks'),
-        "home_clearances": stats_dict.get('home_clearances'),
-        "away_clearances": stats_dict.get('away_clearances'),
-        "home_goalkeeper_saves": stats_dict.get('home_goalkeeper_saves'),
-        "away_goalkeeper_saves": stats_dict.get('away_goalkeeper_saves'),
-        "home_duels_won": stats_dict.get('home_duels_won'),
-        "away_duels_won": stats_dict.get('away_duels_won'),
-        "home_duels_won_pct": stats_dict.get('home_duels_won_pct'),
-        "away_duels_won_pct": stats_dict.get('away_duels_won_pct'),
-        "home_aerial_duels_won": stats_dict.get('home_aerial_duels_won'),
-        "away_aerial_duels_won": stats_dict.get('away_aerial_duels_won'),
-        "home_aerial_duels_pct": stats_dict.get('home_aerial_duels_pct'),
-        "away_aerial_duels_pct": stats_dict.get('away_aerial_duels_pct'),
-        "home_dribbles_successful": stats_dict.get('home_dribbles_successful'),
-        "away_dribbles_successful": stats_dict.get('away_dribbles_successful'),
-        "home_dribbles_pct": stats_dict.get('home_dribbles_pct'),
-        "away_dribbles_pct": stats_dict.get('away_dribbles_pct'),
-        "home_offsides": stats_dict.get('home_offsides'),
-        "away_offsides": stats_dict.get('away_offsides')
-    })
+    execute_insert(query, {"match_id": match_id, **row})
 
 
-def save_match_player_stats(match_id: int, match_data: dict, home_team_id: int, away_team_id: int):
-    """Oyuncu istatistiklerini kaydet"""
-    check_query = f"SELECT COUNT(*) as cnt FROM public.match_player_stats WHERE match_id = {match_id}"
-    existing = execute_query(check_query)
-    if existing and existing[0]['cnt'] > 0:
-        return
-    
-    content = match_data.get('content', {})
-    player_stats_data = content.get('playerStats', {})
-    lineup = content.get('lineup', {})
-    
-    if not player_stats_data:
+# Kolon listesi match_parser.PERIOD_STATS_COLUMNS'tan üretilir (76 kolon)
+PERIOD_STATS_QUERY = """
+    INSERT INTO public.match_period_stats (match_id, period, {columns})
+    VALUES (:match_id, :period, {params})
+    ON CONFLICT (match_id, period) DO UPDATE SET
+        {updates},
+        updated_at = NOW()
+""".format(
+    columns=", ".join(PERIOD_STATS_COLUMNS),
+    params=", ".join(f":{c}" for c in PERIOD_STATS_COLUMNS),
+    updates=",\n        ".join(f"{c} = EXCLUDED.{c}" for c in PERIOD_STATS_COLUMNS),
+)
+
+
+@stage("save_match_period_stats")
+def save_match_period_stats(match_id: int, rows: list):
+    """Devre (FirstHalf/SecondHalf) istatistiklerini kaydet (rows: extract_match_rows()["periods"])"""
+    for row in rows:
+        execute_insert(PERIOD_STATS_QUERY, {"match_id": match_id, **row})
+
+
+@stage("save_match_player_stats")
+def save_match_player_stats(match_id: int, rows: list):
+    """Oyuncu istatistiklerini kaydet (rows: extract_match_rows()["players"])"""
+    if not rows:
         return
     
-    home_team = lineup.get('homeTeam', {})
-    away_team = lineup.get('awayTeam', {})
-    home_team_fotmob_id = home_team.get('id')
-    away_team_fotmob_id = away_team.get('id')
-    
-    def get_stat(stats_dict, key):
-        if not stats_dict:
-            return None
-        stat_obj = stats_dict.get(key, {})
-        if not stat_obj:
-            return None
-        stat_data = stat_obj.get('stat', {})
-        if not stat_data:
-            return None
-        return stat_data.get('value')
-    
-    def get_stat_total(stats_dict, key):
-        if not stats_dict:
-            return None
-        stat_obj = stats_dict.get(key, {})
-        if not stat_obj:
-            return None
-        stat_data = stat_obj.get('stat', {})
-        if not stat_data:
-            return None
-        return stat_data.get('total')
-    
-    for player_id, player_data in player_stats_data.items():
-        player_name = player_data.get('name', '')
-        player_team_id = player_data.get('teamId')
-        is_goalkeeper = player_data.get('isGoalkeeper', False)
-        
-        if player_team_id == home_team_fotmob_id:
-            team_id = home_team_id
-        elif player_team_id == away_team_fotmob_id:
-            team_id = away_team_id
-        else:
-            continue
-        
-        all_stats = {}
-        for stat_group in player_data.get('stats', []):
-            group_stats = stat_group.get('stats', {})
-            all_stats.update(group_stats)
-        
-        rating = get_stat(all_stats, 'FotMob rating') or get_stat(all_stats, 'rating_title')
-        minutes_played = get_stat(all_stats, 'Minutes played') or get_stat(all_stats, 'minutes_played')
-        
-        goals = get_stat(all_stats, 'Goals') or get_stat(all_stats, 'goals') or 0
-        assists = get_stat(all_stats, 'Assists') or get_stat(all_stats, 'assists') or 0
-        xg = get_stat(all_stats, 'Expected goals (xG)') or get_stat(all_stats, 'expected_goals')
-        xa = get_stat(all_stats, 'Expected assists (xA)') or get_stat(all_stats, 'expected_assists')
-        total_shots = get_stat(all_stats, 'Total shots') or get_stat(all_stats, 'total_shots') or 0
-        shots_on_target = get_stat(all_stats, 'Shots on target') or get_stat(all_stats, 'ShotsOnTarget') or 0
-        touches = get_stat(all_stats, 'Touches') or get_stat(all_stats, 'touches') or 0
-        total_passes = get_stat_total(all_stats, 'Accurate passes') or get_stat_total(all_stats, 'accurate_passes') or 0
-        accurate_passes = get_stat(all_stats, 'Accurate passes') or get_stat(all_stats, 'accurate_passes') or 0
-        key_passes = get_stat(all_stats, 'Key passes') or get_stat(all_stats, 'key_passes') or 0
-        
-        tackles = get_stat(all_stats, 'Tackles') or get_stat(all_stats, 'tackles') or 0
-        interceptions = get_stat(all_stats, 'Interceptions') or get_stat(all_stats, 'interceptions') or 0
-        clearances = get_stat(all_stats, 'Clearances') or get_stat(all_stats, 'clearances') or 0
-        duels_won = get_stat(all_stats, 'Duels won') or get_stat(all_stats, 'duels_won') or 0
-        duels_lost = get_stat(all_stats, 'Duels lost') or get_stat(all_stats, 'duels_lost') or 0
-        fouls_committed = get_stat(all_stats, 'Fouls') or get_stat(all_stats, 'fouls') or 0
-        fouls_won = get_stat(all_stats, 'Was fouled') or get_stat(all_stats, 'was_fouled') or 0
-        
-        # GK stats
-        saves = None
-        goals_conceded = None
-        if is_goalkeeper:
-            saves = get_stat(all_stats, 'Saves') or get_stat(all_stats, 'saves') or 0
-            goals_conceded = get_stat(all_stats, 'Goals conceded') or get_stat(all_stats, 'goals_conceded')
+    query = """
+        INSERT INTO public.match_player_stats (
+            match_id, team_id, fotmob_player_id, player_name, rating, minutes_played, position,
+            goals, assists, xg, xa, total_shots, shots_on_target,
+            touches, total_passes, accurate_passes, key_passes,
+            tackles, interceptions, clearances,
+            duels_won, duels_lost, fouls_committed, fouls_won,
+            saves, goals_conceded
+        )
+        VALUES (
+            :match_id, :team_id, :fotmob_player_id, :player_name, :rating, :minutes_played, :position,
+            :goals, :assists, :xg, :xa, :total_shots, :shots_on_target,
+            :touches, :total_passes, :accurate_passes, :key_passes,
+            :tackles, :interceptions, :clearances,
+            :duels_won, :duels_lost, :fouls_committed, :fouls_won,
+            :saves, :goals_conceded
+        )
+    """
+    # Satırlar ve sezon toplamları tek transaction: yarıda kalırsa ikisi de yazılmaz,
+    # tekrar denemede var-mı kontrolü toplamları atlamaz
+    with get_transaction() as conn:
+        # Aynı maçın eşzamanlı ingest'leri sıraya girer: ikincisi kontrolde ilkinin satırlarını görür
+        # (READ COMMITTED'da her statement yeni snapshot alır), toplamlar iki kez eklenmez
+        conn.execute(text("SELECT 1 FROM public.matches WHERE id = :match_id FOR UPDATE"), {"match_id": match_id})
+        existing = conn.execute(
+            text("SELECT COUNT(*) FROM public.match_player_stats WHERE match_id = :match_id"),
+            {"match_id": match_id},
+        ).scalar()
+        if existing:
+            return
         
-        query = """
-            INSERT INTO public.match_player_stats (
-                match_id, team_id, player_name, rating, minutes_played, position,
-                goals, assists, xg, xa, total_shots, shots_on_target,
-                touches, total_passes, accurate_passes, key_passes,
-                tackles, interceptions, clearances,
-                duels_won, duels_lost, fouls_committed, fouls_won,
-                saves, goals_conceded
-            )
-            VALUES (
-                :match_id, :team_id, :player_name, :rating, :minutes_played, :position,
-                :goals, :assists, :xg, :xa, :total_shots, :shots_on_target,
-                :touches, :total_passes, :accurate_passes, :key_passes,
-                :tackles, :interceptions, :clearances,
-                :duels_won, :duels_lost, :fouls_committed, :fouls_won,
-                :saves, :goals_conceded
-            )
-        """
-        execute_insert(query, {
-            "match_id": match_id,
-            "team_id": team_id,
-            "player_name": player_name,
-            "rating": rating,
-            "minutes_played": minutes_played,
-            "position": None,
-            "goals": goals,
-            "assists": assists,
-            "xg": xg,
-            "xa": xa,
-            "total_shots": total_shots,
-            "shots_on_target": shots_on_target,
-            "touches": touches,
-            "total_passes": total_passes,
-            "accurate_passes": accurate_passes,
-            "key_passes": key_passes,
-            "tackles": tackles,
-            "interceptions": interceptions,
-            "clearances": clearances,
-            "duels_won": duels_won,
-            "duels_lost": duels_lost,
-            "fouls_committed": fouls_committed,
-            "fouls_won": fouls_won,
-            "saves": saves,
-            "goals_conceded": goals_conceded
-        })
+        conn.execute(text(query), [{"match_id": match_id, **row} for row in rows])
+        # Sezon toplamları: satırlar maç başına bir kez yazıldığı için artımlı eklemek güvenli
+        conn.execute(text(PLAYER_SEASON_UPSERT_SQL), {"match_id": match_id})
+        count_rows(len(rows) + 1)
 
 
 def save_full_match_data(match_data: dict) -> int:
@@ -1015,6 +711,22 @@ def save_full_match_data(match_data: dict) -> int:
     Returns:
         match_id: Kaydedilen maçın ID'si
     """
+    # Var mı kontrolleri az önce yazılan satırları görmeli
+    with use_primary():
+        match_id = _save_full_match_data(match_data)
+    
+    general = match_data.get('general', {})
+    league_id_value = general.get('parentLeagueId') or general.get('leagueId')
+    if league_id_value:
+        invalidate_standings(int(league_id_value))
+    # Tüm alt satırlar commit edildikten sonra (ingest sırasında cache'lenen eksik sonuçlar geçersizleşir)
+    bump_ingest_version(match_id)
+    rating_table.record_match(match_data)
+    
+    return match_id
+
+
+def _save_full_match_data(match_data: dict) -> int:
     general = match_data.get('general', {})
     
     # 1. Ligi kaydet/al
@@ -1030,13 +742,18 @@ def save_full_match_data(match_data: dict) -> int:
     # 3. Maçı kaydet
     match_id = save_match(match_data, home_team_id, away_team_id, league_id)
     
-    # 4. İlgili tüm verileri kaydet
-    save_match_stats(match_id, match_data)
-    save_match_advanced_stats(match_id, match_data)
+    # 4. İstatistik satırlarını tek geçişte çıkar
+    with stage("extract"):
+        rows = extract_match_rows(match_data, home_team_id, away_team_id)
+    
+    # 5. İlgili tüm verileri kaydet
+    save_match_stats(match_id, rows["stats"])
+    save_match_advanced_stats(match_id, rows["advanced"])
+    save_match_period_stats(match_id, rows["periods"])
     save_match_context(match_id, match_data)
     save_match_formations(match_id, match_data)
     save_match_lineups(match_id, match_data, home_team_id, away_team_id)
-    save_match_player_stats(match_id, match_data, home_team_id, away_team_id)
+    save_match_player_stats(match_id, rows["players"])
     save_match_events(match_id, match_data, home_team_id, away_team_id)
     save_player_availability(match_id, match_data, home_team_id, away_team_id)
     save_h2h_stats(match_data, home_team_id, away_team_id)
@@ -0,0 +1,141 @@
+"""
+Skor olasılık modeli - bağımsız Poisson, fikstür listesi için toplu
+
+Takım hücum/savunma gücü son N maçın goals_for/goals_against değerlerinden
+(get_team_form ile aynı view: greydb.vw_team_overall_form) çıkar ve az maçlı
+takımlar için ortalamaya doğru büzülür. Her fikstür için beklenen goller
+(λ ev, λ deplasman) -> (max_goals+1)² skor matrisi; 1X2, alt/üst ve KG
+olasılıkları bu matristen türetilir. Tüm fikstürler tek sorgu ve tek NumPy
+hesabıyla değerlendirilir.
+"""
+import math
+
+from app.services.db import execute_query
+
+# Takım başına ortalamaya büzülme ağırlığı (maç sayısı cinsinden)
+SHRINK_MATCHES = 3.0
+
+# Örneklemdeki ev/deplasman gol ortalamaları bu taban değerlerle harmanlanır
+BASELINE_HOME_GOALS = 1.5
+BASELINE_AWAY_GOALS = 1.2
+BASELINE_WEIGHT = 50.0
+
+OVER_UNDER_LINES = (0.5, 1.5, 2.5, 3.5, 4.5)
+
+_MIN_LAMBDA = 0.05
+
+FORM_GOALS_SQL = """
+    SELECT team_fotmob_id, venue, goals_for, goals_against
+    FROM greydb.vw_team_overall_form
+    WHERE team_fotmob_id = ANY(:team_ids)
+      AND match_rank <= :limit
+"""
+
+
+def team_strengths(team_ids: list[int], matches: int) -> tuple:
+    """
+    (attack, defense, avg_home_goals, avg_away_goals, played) - attack/defense/played
+    team_ids sırasında; played = takım başına kullanılan maç sayısı.
+    1.0 = ortalama; attack > 1 çok gol atar, defense > 1 çok gol yer.
+    """
+    import numpy as np
+
+    rows = execute_query(FORM_GOALS_SQL, {"team_ids": team_ids, "limit": matches})
+
+    position = {team_id: i for i, team_id in enumerate(team_ids)}
+    idx = np.fromiter((position[row["team_fotmob_id"]] for row in rows), dtype=np.int64, count=len(rows))
+    goals_for = np.fromiter((row["goals_for"] for row in rows), dtype=np.float64, count=len(rows))
+    goals_against = np.fromiter((row["goals_against"] for row in rows), dtype=np.float64, count=len(rows))
+    is_home = np.fromiter((row["venue"] == "home" for row in rows), dtype=bool, count=len(rows))
+
+    avg_home = (goals_for[is_home].sum() + BASELINE_HOME_GOALS * BASELINE_WEIGHT) / (is_home.sum() + BASELINE_WEIGHT)
+    avg_away = (goals_for[~is_home].sum() + BASELINE_AWAY_GOALS * BASELINE_WEIGHT) / ((~is_home).sum() + BASELINE_WEIGHT)
+    avg_goals = (avg_home + avg_away) / 2
+
+    played = np.bincount(idx, minlength=len(team_ids))
+    scored = np.bincount(idx, weights=goals_for, minlength=len(team_ids))
+    conceded = np.bincount(idx, weights=goals_against, minlength=len(team_ids))
+
+    attack = (scored + SHRINK_MATCHES * avg_goals) / (played + SHRINK_MATCHES) / avg_goals
+    defense = (conceded + SHRINK_MATCHES * avg_goals) / (played + SHRINK_MATCHES) / avg_goals
+    return attack, defense, float(avg_home), float(avg_away), played
+
+
+def score_matrices(lambda_home, lambda_away, max_goals: int):
+    """(F,) λ dizilerinden (F, G, G) skor olasılık matrisleri; [f, i, j] = P(ev i, dep j)"""
+    import numpy as np
+
+    goals = np.arange(max_goals + 1)
+    log_factorial = np.array([math.lgamma(k + 1) for k in goals])
+
+    def pmf(lam):
+        lam = np.maximum(lam, _MIN_LAMBDA)[:, None]
+        return np.exp(goals * np.log(lam) - lam - log_factorial)
+
+    return pmf(lambda_home)[:, :, None] * pmf(lambda_away)[:, None, :]
+
+
+def evaluate_fixtures(fixtures: list[tuple[int, int]], matches: int = 10, max_goals: int = 10) -> list[dict]:
+    """
+    Fikstür listesi için olasılıklar (tek sorgu, tek vektörel hesap)
+
+    Args:
+        fixtures: [(ev sahibi FotMob ID, deplasman FotMob ID), ...]
+        matches: Güç hesabında takım başına son maç sayısı
+        max_goals: Skor matrisinde takım başına en fazla gol (kalan olasılık kesilir)
+    """
+    import numpy as np
+
+    if not fixtures:
+        return []
+
+    team_ids = list(dict.fromkeys(team for fixture in fixtures for team in fixture))
+    attack, defense, avg_home, avg_away, played = team_strengths(team_ids, matches)
+
+    position = {team_id: i for i, team_id in enumerate(team_ids)}
+    home = np.array([position[h] for h, _ in fixtures])
+    away = np.array([position[a] for _, a in fixtures])
+
+    lambda_home = attack[home] * defense[away] * avg_home
+    lambda_away = attack[away] * defense[home] * avg_away
+    matrix = score_matrices(lambda_home, lambda_away, max_goals)
+
+    # Kesilen kuyruk nedeniyle toplam 1'in biraz altında olabilir: normalize et
+    matrix /= matrix.sum(axis=(1, 2), keepdims=True)
+
+    goals = np.arange(max_goals + 1)
+    diff = goals[:, None] - goals[None, :]
+    total = goals[:, None] + goals[None, :]
+
+    home_win = (matrix * (diff > 0)).sum(axis=(1, 2))
+    draw = (matrix * (diff == 0)).sum(axis=(1, 2))
+    away_win = (matrix * (diff < 0)).sum(axis=(1, 2))
+    overs = {line: (matrix * (total > line)).sum(axis=(1, 2)) for line in OVER_UNDER_LINES}
+    btts = matrix[:, 1:, 1:].sum(axis=(1, 2))
+    best = matrix.reshape(len(fixtures), -1).argmax(axis=1)
+
+    results = []
+    for f, (home_id, away_id) in enumerate(fixtures):
+        best_home, best_away = divmod(int(best[f]), max_goals + 1)
+        results.append({
+            "home_team_fotmob_id": home_id,
+            "away_team_fotmob_id": away_id,
+            "expected_goals": {"home": round(float(lambda_home[f]), 3), "away": round(float(lambda_away[f]), 3)},
+            "matches_used": {"home": int(played[home[f]]), "away": int(played[away[f]])},
+            "1x2": {
+                "home": round(float(home_win[f]), 4),
+                "draw": round(float(draw[f]), 4),
+                "away": round(float(away_win[f]), 4),
+            },
+            "over_under": {
+                str(line): {"over": round(float(overs[line][f]), 4), "under": round(1 - float(overs[line][f]), 4)}
+                for line in OVER_UNDER_LINES
+            },
+            "btts": {"yes": round(float(btts[f]), 4), "no": round(1 - float(btts[f]), 4)},
+            "most_likely_score": {
+                "home": best_home,
+                "away": best_away,
+                "probability": round(float(matrix[f, best_home, best_away]), 4),
+            },
+        })
+    return results
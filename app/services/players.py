@@ -0,0 +1,331 @@
+"""
+Oyuncu servisi - sezon toplamları, son maç formu ve lig krallıkları
+
+public.player_season_stats (oyuncu, lig, sezon) başına toplamları tutar; her
+ingest'te save_match_player_stats yeni maçın satırlarını tek UPSERT ile ekler
+(migrations/006). Krallık sorguları bu tablodaki lig-sezon index'ini okur,
+match_player_stats taranmaz. Sezon maç tarihinden türetilir (1 Temmuz başlangıç).
+
+Oyuncu satırları ve sezon UPSERT'ü aynı transaction'da yazılır. Sapma olursa
+rebuild_season_stats tabloyu match_player_stats'tan baştan hesaplar.
+
+Sonuçlar ingest versiyonuyla anahtarlanan TTL cache'te tutulur.
+"""
+from sqlalchemy import text
+
+from app.config import get_settings
+from app.services.cache import TTLCache
+from app.services.db import execute_query, get_transaction
+from app.services.ingest_version import current_ingest_version
+from app.services.standings import parse_season, season_label
+
+_players_cache = TTLCache(get_settings().player_stats_cache_ttl, max_entries=10_000)
+
+# Krallık metriği -> sıralama kolonu
+LEADER_METRICS = {
+    "goals": "s.goals",
+    "assists": "s.assists",
+    "xg": "s.xg",
+    "xa": "s.xa",
+    "shots": "s.total_shots",
+    "key_passes": "s.key_passes",
+}
+
+_SUM_COLUMNS = (
+    "minutes_played", "goals", "assists", "xg", "xa", "total_shots", "shots_on_target",
+    "key_passes", "total_passes", "accurate_passes", "tackles", "interceptions", "duels_won", "duels_lost",
+)
+
+# Maçın oyuncu satırlarını sezon toplamlarına ekle (maç başına bir kez: satırlar sadece ilk ingest'te yazılır)
+SEASON_UPSERT_SQL = """
+    INSERT INTO public.player_season_stats AS s (
+        fotmob_player_id, league_id, season_start_year, team_id, player_name, matches,
+        {columns}, rating_sum, rated_matches, last_match_date, updated_at
+    )
+    SELECT
+        ps.fotmob_player_id,
+        m.league_id,
+        CAST(EXTRACT(YEAR FROM m.match_date - INTERVAL '6 months') AS integer),
+        ps.team_id,
+        ps.player_name,
+        1,
+        {values},
+        CASE WHEN ps.rating > 0 THEN ps.rating ELSE 0 END,
+        CASE WHEN ps.rating > 0 THEN 1 ELSE 0 END,
+        m.match_date,
+        NOW()
+    FROM public.match_player_stats ps
+    JOIN public.matches m ON m.id = ps.match_id
+    WHERE ps.match_id = :match_id
+      AND ps.fotmob_player_id IS NOT NULL
+      AND m.league_id IS NOT NULL
+      AND m.match_date IS NOT NULL
+    ON CONFLICT (fotmob_player_id, league_id, season_start_year) DO UPDATE SET
+        matches = s.matches + 1,
+        {increments},
+        rating_sum = s.rating_sum + EXCLUDED.rating_sum,
+        rated_matches = s.rated_matches + EXCLUDED.rated_matches,
+        team_id = CASE WHEN EXCLUDED.last_match_date >= s.last_match_date THEN EXCLUDED.team_id ELSE s.team_id END,
+        player_name = CASE WHEN EXCLUDED.last_match_date >= s.last_match_date THEN EXCLUDED.player_name ELSE s.player_name END,
+        last_match_date = GREATEST(s.last_match_date, EXCLUDED.last_match_date),
+        updated_at = NOW()
+""".format(
+    columns=", ".join(_SUM_COLUMNS),
+    values=", ".join(f"COALESCE(ps.{c}, 0)" for c in _SUM_COLUMNS),
+    increments=",\n        ".join(f"{c} = s.{c} + EXCLUDED.{c}" for c in _SUM_COLUMNS),
+)
+
+# Tüm tabloyu match_player_stats'tan yeniden hesapla (migrations/006 ilk doldurmasıyla aynı toplama)
+REBUILD_SEASON_STATS_SQL = """
+    INSERT INTO public.player_season_stats (
+        fotmob_player_id, league_id, season_start_year, team_id, player_name, matches,
+        {columns}, rating_sum, rated_matches, last_match_date, updated_at
+    )
+    SELECT
+        ps.fotmob_player_id,
+        m.league_id,
+        CAST(EXTRACT(YEAR FROM m.match_date - INTERVAL '6 months') AS integer),
+        (ARRAY_AGG(ps.team_id ORDER BY m.match_date DESC))[1],
+        (ARRAY_AGG(ps.player_name ORDER BY m.match_date DESC))[1],
+        COUNT(*),
+        {sums},
+        COALESCE(SUM(ps.rating) FILTER (WHERE ps.rating > 0), 0),
+        COUNT(*) FILTER (WHERE ps.rating > 0),
+        MAX(m.match_date),
+        NOW()
+    FROM public.match_player_stats ps
+    JOIN public.matches m ON m.id = ps.match_id
+    WHERE ps.fotmob_player_id IS NOT NULL
+      AND m.league_id IS NOT NULL
+      AND m.match_date IS NOT NULL
+    GROUP BY ps.fotmob_player_id, m.league_id, CAST(EXTRACT(YEAR FROM m.match_date - INTERVAL '6 months') AS integer)
+""".format(
+    columns=", ".join(_SUM_COLUMNS),
+    sums=",\n        ".join(f"COALESCE(SUM(ps.{c}), 0)" for c in _SUM_COLUMNS),
+)
+
+LEADERS_SQL = """
+    WITH league AS (
+        SELECT id, fotmob_league_id, name FROM public.leagues WHERE fotmob_league_id = :league_id
+    ),
+    season AS (
+        SELECT COALESCE(
+            CAST(:season_year AS integer),
+            (SELECT MAX(season_start_year) FROM public.player_season_stats
+             WHERE league_id IN (SELECT id FROM league))
+        ) AS start_year
+    )
+    SELECT
+        s.season_start_year,
+        s.fotmob_player_id, s.player_name,
+        t.fotmob_team_id AS team_fotmob_id, t.name AS team_name,
+        s.matches, s.minutes_played, s.goals, s.assists, s.xg, s.xa,
+        s.total_shots, s.shots_on_target, s.key_passes
+    FROM public.player_season_stats s
+    JOIN league l ON l.id = s.league_id
+    JOIN season ON season.start_year = s.season_start_year
+    LEFT JOIN public.teams t ON t.id = s.team_id
+    WHERE s.minutes_played >= :min_minutes
+    ORDER BY {order} DESC, s.minutes_played, s.player_name
+    LIMIT :limit
+"""
+
+PLAYER_SEASONS_SQL = """
+    SELECT
+        s.*,
+        l.fotmob_league_id, l.name AS league_name,
+        t.fotmob_team_id AS team_fotmob_id, t.name AS team_name
+    FROM public.player_season_stats s
+    JOIN public.leagues l ON l.id = s.league_id
+    LEFT JOIN public.teams t ON t.id = s.team_id
+    WHERE s.fotmob_player_id = :player_id
+      AND s.season_start_year = COALESCE(
+          CAST(:season_year AS integer),
+          (SELECT MAX(season_start_year) FROM public.player_season_stats WHERE fotmob_player_id = :player_id)
+      )
+    ORDER BY s.minutes_played DESC
+"""
+
+PLAYER_MATCHES_SQL = """
+    SELECT
+        m.fotmob_match_id, m.match_date, m.home_score, m.away_score,
+        (m.home_team_id = ps.team_id) AS is_home,
+        opp.name AS opponent,
+        ps.player_name, ps.position, ps.rating, ps.minutes_played,
+        ps.goals, ps.assists, ps.xg, ps.xa, ps.total_shots, ps.shots_on_target, ps.key_passes
+    FROM public.match_player_stats ps
+    JOIN public.matches m ON m.id = ps.match_id
+    LEFT JOIN public.teams opp
+        ON opp.id = CASE WHEN m.home_team_id = ps.team_id THEN m.away_team_id ELSE m.home_team_id END
+    WHERE ps.fotmob_player_id = :player_id
+    ORDER BY m.match_date DESC
+    LIMIT :limit
+"""
+
+
+def rebuild_season_stats() -> int:
+    """
+    Sezon toplamlarını match_player_stats'tan baştan hesapla (periyodik düzeltme).
+    Tablo kilitlenir: süren ingest'lerin UPSERT'leri bitene kadar beklenir, yenileri
+    yeniden hesaplama commit edilene kadar bekler (aynı maç iki kez sayılmaz).
+
+    Returns:
+        Yazılan (oyuncu, lig, sezon) satırı sayısı
+    """
+    with get_transaction() as conn:
+        conn.execute(text("LOCK TABLE public.player_season_stats IN SHARE ROW EXCLUSIVE MODE"))
+        conn.execute(text("DELETE FROM public.player_season_stats"))
+        rows = conn.execute(text(REBUILD_SEASON_STATS_SQL)).rowcount
+    _players_cache.clear()
+    return rows
+
+
+def _num(value, digits: int = 2):
+    return round(float(value), digits) if value is not None else None
+
+
+def _per90(value, minutes) -> float | None:
+    return round(float(value) * 90 / minutes, 2) if minutes else None
+
+
+def _season_entry(row: dict) -> dict:
+    minutes = int(row["minutes_played"])
+    return {
+        "season": season_label(row["season_start_year"]),
+        "league_id": row["fotmob_league_id"],
+        "league_name": row["league_name"],
+        "team_fotmob_id": row["team_fotmob_id"],
+        "team_name": row["team_name"],
+        "matches": int(row["matches"]),
+        "minutes_played": minutes,
+        "goals": int(row["goals"]),
+        "assists": int(row["assists"]),
+        "xg": _num(row["xg"]),
+        "xa": _num(row["xa"]),
+        "total_shots": int(row["total_shots"]),
+        "shots_on_target": int(row["shots_on_target"]),
+        "key_passes": int(row["key_passes"]),
+        "pass_accuracy": round(100 * int(row["accurate_passes"]) / int(row["total_passes"]), 1) if row["total_passes"] else None,
+        "tackles": int(row["tackles"]),
+        "interceptions": int(row["interceptions"]),
+        "duels_won": int(row["duels_won"]),
+        "duels_lost": int(row["duels_lost"]),
+        "avg_rating": round(float(row["rating_sum"]) / row["rated_matches"], 2) if row["rated_matches"] else None,
+        "goals_per90": _per90(row["goals"], minutes),
+        "xg_per90": _per90(row["xg"], minutes),
+    }
+
+
+def _match_entry(row: dict) -> dict:
+    return {
+        "fotmob_match_id": row["fotmob_match_id"],
+        "match_date": row["match_date"].isoformat() if row["match_date"] else None,
+        "opponent": row["opponent"],
+        "venue": "home" if row["is_home"] else "away",
+        "score": f"{row['home_score']}-{row['away_score']}" if row["home_score"] is not None else None,
+        "position": row["position"],
+        "rating": _num(row["rating"]),
+        "minutes_played": row["minutes_played"],
+        "goals": row["goals"],
+        "assists": row["assists"],
+        "xg": _num(row["xg"]),
+        "xa": _num(row["xa"]),
+        "total_shots": row["total_shots"],
+        "shots_on_target": row["shots_on_target"],
+        "key_passes": row["key_passes"],
+    }
+
+
+def get_player_form(player_id: int, season: str | None = None, matches: int = 5) -> dict | None:
+    """
+    Oyuncunun sezon toplamları (lig başına) ve son `matches` maçı
+
+    Args:
+        player_id: Oyuncu FotMob ID
+        season: '2024/2025' veya '2024'; boşsa oyuncunun son sezonu
+        matches: Son maç listesi uzunluğu
+
+    Returns:
+        Oyuncunun hiç satırı yoksa None
+    """
+    season_year = parse_season(season)
+    key = ("form", player_id, season_year, matches, current_ingest_version())
+    cached = _players_cache.get(key)
+    if cached is not None:
+        return cached
+
+    recent = execute_query(PLAYER_MATCHES_SQL, {"player_id": player_id, "limit": matches})
+    if not recent:
+        return None
+    seasons = execute_query(PLAYER_SEASONS_SQL, {"player_id": player_id, "season_year": season_year})
+
+    ratings = [float(row["rating"]) for row in recent if row["rating"]]
+    result = {
+        "player_id": player_id,
+        "player_name": recent[0]["player_name"],
+        "season": season_label(seasons[0]["season_start_year"]) if seasons else season_label(season_year),
+        "seasons": [_season_entry(row) for row in seasons],
+        "form": {
+            "matches": len(recent),
+            "goals": sum(row["goals"] or 0 for row in recent),
+            "assists": sum(row["assists"] or 0 for row in recent),
+            "xg": round(sum(float(row["xg"] or 0) for row in recent), 2),
+            "avg_rating": round(sum(ratings) / len(ratings), 2) if ratings else None,
+        },
+        "recent_matches": [_match_entry(row) for row in recent],
+    }
+    _players_cache.set(key, result)
+    return result
+
+
+def get_league_leaders(league_fotmob_id: int, metric: str = "goals", season: str | None = None,
+                       limit: int = 20, min_minutes: int = 0) -> dict:
+    """
+    Lig krallığı (gol, xG, asist ...) - player_season_stats'tan
+
+    Raises:
+        ValueError: Bilinmeyen metrik veya geçersiz sezon
+    """
+    if metric not in LEADER_METRICS:
+        raise ValueError(f"metric şunlardan biri olmalı: {', '.join(LEADER_METRICS)}")
+    season_year = parse_season(season)
+
+    key = ("leaders", league_fotmob_id, metric, season_year, limit, min_minutes, current_ingest_version())
+    cached = _players_cache.get(key)
+    if cached is not None:
+        return cached
+
+    rows = execute_query(LEADERS_SQL.format(order=LEADER_METRICS[metric]), {
+        "league_id": league_fotmob_id,
+        "season_year": season_year,
+        "min_minutes": min_minutes,
+        "limit": limit,
+    })
+    result = {
+        "league_id": league_fotmob_id,
+        "season": season_label(rows[0]["season_start_year"]) if rows else season_label(season_year),
+        "metric": metric,
+        "leaders": [
+            {
+                "rank": rank,
+                "player_id": row["fotmob_player_id"],
+                "player_name": row["player_name"],
+                "team_fotmob_id": row["team_fotmob_id"],
+                "team_name": row["team_name"],
+                "matches": int(row["matches"]),
+                "minutes_played": int(row["minutes_played"]),
+                "goals": int(row["goals"]),
+                "assists": int(row["assists"]),
+                "xg": _num(row["xg"]),
+                "xa": _num(row["xa"]),
+                "total_shots": int(row["total_shots"]),
+                "shots_on_target": int(row["shots_on_target"]),
+                "key_passes": int(row["key_passes"]),
+                "goals_per90": _per90(row["goals"], int(row["minutes_played"])),
+                "xg_per90": _per90(row["xg"], int(row["minutes_played"])),
+            }
+            for rank, row in enumerate(rows, start=1)
+        ],
+    }
+    _players_cache.set(key, result)
+    return result
@@ -0,0 +1,184 @@
+"""
+Yavaş sorgu logu - engine seviyesinde SQL süre ölçümü
+
+Tüm SQL (query_to_df, execute_query, execute_insert, get_transaction ...)
+engine üzerinden geçtiği için cursor event'leriyle ölçülür. Eşiği aşan
+sorgular loglanır ve normalize edilmiş hâlleriyle (sabitler -> ?) gruplanır.
+SELECT sorguları düşük bir oranla EXPLAIN (ANALYZE, BUFFERS) ile ayrı bir
+bağlantıda, arka planda yeniden çalıştırılıp plan saklanır.
+"""
+import logging
+import random
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from sqlalchemy import event
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?\b")
+_IN_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+_DATA_MODIFYING = re.compile(r"\b(insert|update|delete|merge|truncate|create|drop|alter|copy)\b", re.IGNORECASE)
+# SELECT olsa da yazan / kilitleyen ifadeler: hot standby'de hata verir, EXPLAIN ANALYZE'de yan etki yapar
+_SIDE_EFFECTS = re.compile(
+    r"\b(nextval|setval|pg_(?:try_)?advisory_\w+)\s*\(|\bfor\s+(?:no\s+key\s+)?update\b|\bfor\s+(?:key\s+)?share\b",
+    re.IGNORECASE,
+)
+
+# Gruplanan farklı sorgu sayısı sınırı (en az toplam süreye sahip olan atılır)
+_MAX_STATEMENTS = 500
+
+
+def normalize_sql(statement: str) -> str:
+    """Sabitleri ? ile değiştir, IN listelerini daralt, boşlukları tekle"""
+    sql = _STRING_LITERAL.sub("?", statement)
+    sql = _NUMBER_LITERAL.sub("?", sql)
+    sql = _IN_LIST.sub("(?, ...)", sql)
+    return _WHITESPACE.sub(" ", sql).strip()
+
+
+def param_shape(parameters) -> object:
+    """Parametre değerleri yerine tipleri (PII loglamamak için)"""
+    def shape(value):
+        if isinstance(value, (list, tuple)):
+            return f"{type(value).__name__}[{len(value)}]"
+        return type(value).__name__
+
+    if isinstance(parameters, dict):
+        return {key: shape(value) for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        if parameters and isinstance(parameters[0], dict):
+            return f"executemany[{len(parameters)}]"
+        return [shape(value) for value in parameters]
+    return None
+
+
+def is_read_only(statement: str) -> bool:
+    head = statement.lstrip().lower()
+    return (
+        (head.startswith("select") or head.startswith("with"))
+        and not _DATA_MODIFYING.search(statement)
+        and not _SIDE_EFFECTS.search(statement)
+    )
+
+
+class SlowQueryLog:
+    """Normalize edilmiş sorgu başına yavaş çalışma istatistikleri"""
+
+    def __init__(self, threshold_ms: float, explain_sample_rate: float):
+        self.threshold_ms = threshold_ms
+        self.explain_sample_rate = explain_sample_rate
+        self._lock = threading.Lock()
+        self._statements: dict[str, dict] = {}
+        self._explainer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="explain")
+        self._explain_pending = False
+
+    def install(self, engine) -> None:
+        if self.threshold_ms <= 0:
+            return
+        event.listen(engine, "before_cursor_execute", self._before)
+        event.listen(engine, "after_cursor_execute", self._after)
+        event.listen(engine, "handle_error", self._on_error)
+
+    def _before(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    def _after(self, conn, cursor, statement, parameters, context, executemany):
+        started = conn.info["query_start"].pop()
+        duration_ms = (time.perf_counter() - started) * 1000
+        if duration_ms >= self.threshold_ms:
+            # PreparedStatement: "EXECUTE name(...)" yerine asıl SQL (EXPLAIN başka bağlantıda da çalışır)
+            if context is not None:
+                statement = context.execution_options.get("source_statement", statement)
+            self.record(statement, parameters, duration_ms, explain_engine=None if executemany else conn.engine)
+
+    def _on_error(self, exception_context):
+        # Hatalı sorguda after_cursor_execute çağrılmaz; başlangıç zamanını temizle
+        conn = exception_context.connection
+        if conn is not None and conn.info.get("query_start"):
+            conn.info["query_start"].pop()
+
+    def record(self, statement: str, parameters, duration_ms: float, explain_engine=None) -> None:
+        normalized = normalize_sql(statement)
+        shape = param_shape(parameters)
+        logger.warning("Slow query (%.0fms): %s params=%s", duration_ms, normalized[:500], shape)
+
+        with self._lock:
+            entry = self._statements.get(normalized)
+            if entry is None:
+                if len(self._statements) >= _MAX_STATEMENTS:
+                    evict = min(self._statements, key=lambda key: self._statements[key]["total_ms"])
+                    del self._statements[evict]
+                entry = self._statements[normalized] = {
+                    "statement": normalized, "count": 0, "total_ms": 0.0, "max_ms": 0.0,
+                    "params": None, "last_seen": None, "plan": None, "plan_sampled_ms": None,
+                }
+            entry["count"] += 1
+            entry["total_ms"] += duration_ms
+            entry["max_ms"] = max(entry["max_ms"], duration_ms)
+            entry["params"] = shape
+            entry["last_seen"] = datetime.now().isoformat()
+
+            sample = (
+                explain_engine is not None
+                and self.explain_sample_rate > 0
+                and not self._explain_pending
+                and is_read_only(statement)
+                and random.random() < self.explain_sample_rate
+            )
+            if sample:
+                self._explain_pending = True
+
+        if sample:
+            self._explainer.submit(self._explain, explain_engine, normalized, statement, parameters, duration_ms)
+
+    def _explain(self, engine, normalized: str, statement: str, parameters, duration_ms: float) -> None:
+        """
+        Sorguyu aynı engine'de (primary/replica) ayrı bağlantıda EXPLAIN (ANALYZE, BUFFERS) ile yeniden çalıştır.
+        Ham DBAPI cursor'ı kullanılır: driver formatındaki statement/parametreler
+        aynen geçer ve cursor event'leri tetiklenmez.
+        """
+        try:
+            with engine.connect() as conn:
+                cursor = conn.connection.cursor()
+                try:
+                    cursor.execute("EXPLAIN (ANALYZE, BUFFERS) " + statement, parameters)
+                    rows = cursor.fetchall()
+                finally:
+                    cursor.close()
+                    conn.rollback()
+            plan = "\n".join(row[0] for row in rows)
+            with self._lock:
+                entry = self._statements.get(normalized)
+                if entry is not None:
+                    entry["plan"] = plan
+                    entry["plan_sampled_ms"] = round(duration_ms, 2)
+        except Exception as e:
+            logger.warning("EXPLAIN failed for slow query: %s", e)
+        finally:
+            with self._lock:
+                self._explain_pending = False
+
+    def top(self, limit: int = 20, order_by: str = "total_ms") -> list[dict]:
+        with self._lock:
+            entries = [
+                {**entry, "avg_ms": round(entry["total_ms"] / entry["count"], 2),
+                 "total_ms": round(entry["total_ms"], 2), "max_ms": round(entry["max_ms"], 2)}
+                for entry in self._statements.values()
+            ]
+        return sorted(entries, key=lambda entry: entry[order_by], reverse=True)[:limit]
+
+    def reset(self) -> None:
+        with self._lock:
+            self._statements.clear()
+
+
+_settings = get_settings()
+slow_query_log = SlowQueryLog(_settings.slow_query_ms, _settings.slow_query_explain_sample_rate)
@@ -0,0 +1,250 @@
+"""
+Takım gücü (Elo) servisi - bellekte dizi tabanlı rating tablosu
+
+İlk kullanımda public.matches'teki tüm bitmiş maçlar tarih sırasıyla bir kez
+oynatılır; sonra her save_full_match_data sonucu artımlı uygular. Ratingler
+takım indeksine göre NumPy dizilerinde tutulur, okumalar bellekten döner.
+
+Worker başına ayrı tablo: ingest yapmayan worker'lar ratings_sync_interval'da
+bir updated_at'e göre yeni/güncellenmiş maçları çekip uygular. Aynı maç iki kez
+uygulanmaz; geç gelen eski tarihli maç o anki ratinglerle uygulanır (tam sıra
+için POST /api/ratings/rebuild).
+
+Elo: K=20, ev sahibi avantajı 60 puan, gol farkı çarpanı (World Football Elo).
+"""
+import logging
+import threading
+import time
+from datetime import datetime, timedelta
+
+from app.config import get_settings
+from app.services.db import execute_query
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+INITIAL_RATING = 1500.0
+K_FACTOR = 20.0
+HOME_ADVANTAGE = 60.0
+
+# Sync sorgusu bu kadar geriden başlar: updated_at transaction başlangıcıdır, geç commit
+# edilen satırlar kaçmasın (tekrar gelenler applied kümesiyle atlanır)
+_SYNC_OVERLAP = timedelta(minutes=5)
+
+# Lig listesinde: ligdeki son maçından bu yana ligin son maçına kadar geçen süre sınırı
+_LEAGUE_ACTIVE_SECONDS = 300 * 86400
+
+FINISHED_MATCHES_SQL = """
+    SELECT
+        m.fotmob_match_id,
+        ht.fotmob_team_id AS home_id, ht.name AS home_name,
+        at.fotmob_team_id AS away_id, at.name AS away_name,
+        m.home_score, m.away_score,
+        m.match_date,
+        l.fotmob_league_id AS league_id,
+        m.updated_at
+    FROM public.matches m
+    JOIN public.teams ht ON ht.id = m.home_team_id
+    JOIN public.teams at ON at.id = m.away_team_id
+    LEFT JOIN public.leagues l ON l.id = m.league_id
+    WHERE m.finished
+      AND m.home_score IS NOT NULL AND m.away_score IS NOT NULL
+      AND m.updated_at > :since
+    ORDER BY m.match_date, m.id
+"""
+
+
+def goal_multiplier(goal_diff: int) -> float:
+    goal_diff = abs(goal_diff)
+    if goal_diff <= 1:
+        return 1.0
+    if goal_diff == 2:
+        return 1.5
+    return (11 + goal_diff) / 8
+
+
+def _timestamp(value) -> float:
+    if isinstance(value, datetime):
+        return value.timestamp()
+    if isinstance(value, str) and value:
+        try:
+            return datetime.fromisoformat(value.replace('Z', '+00:00')).timestamp()
+        except ValueError:
+            pass
+    return time.time()
+
+
+class RatingTable:
+    """Takım indeksi -> rating / maç sayısı dizileri + lig üyeliği"""
+
+    def __init__(self):
+        # Diziler ilk rebuild'de kurulur (numpy startup'ta yüklenmesin)
+        self._lock = threading.RLock()
+        self._sync_lock = threading.Lock()
+        self.loaded = False
+        self.checked_at = 0.0
+
+    def _reset(self) -> None:
+        import numpy as np
+
+        self.ratings = np.full(256, INITIAL_RATING, dtype=np.float64)
+        self.matches = np.zeros(256, dtype=np.int32)
+        self.index: dict[int, int] = {}  # fotmob_team_id -> dizi indeksi
+        self.team_ids: list[int] = []
+        self.names: list[str] = []
+        self.league_teams: dict[int, dict[int, float]] = {}  # lig -> {indeks: ligdeki son maç zamanı}
+        self.league_last: dict[int, float] = {}
+        self.applied: set[int] = set()
+        self.synced_until = datetime.min  # görülen en büyük updated_at
+
+    def _team(self, fotmob_team_id: int, name: str) -> int:
+        import numpy as np
+
+        idx = self.index.get(fotmob_team_id)
+        if idx is None:
+            idx = len(self.team_ids)
+            if idx == len(self.ratings):
+                self.ratings = np.concatenate([self.ratings, np.full(idx, INITIAL_RATING)])
+                self.matches = np.concatenate([self.matches, np.zeros(idx, dtype=np.int32)])
+            self.index[fotmob_team_id] = idx
+            self.team_ids.append(fotmob_team_id)
+            self.names.append(name)
+        elif name:
+            self.names[idx] = name
+        return idx
+
+    def apply(self, fotmob_match_id: int, home_id: int, home_name: str, away_id: int, away_name: str,
+              home_score: int, away_score: int, league_id: int | None, played_at: float) -> bool:
+        """Tek maç sonucunu uygula; daha önce uygulandıysa False"""
+        if fotmob_match_id in self.applied:
+            return False
+        self.applied.add(fotmob_match_id)
+
+        h = self._team(int(home_id), home_name)
+        a = self._team(int(away_id), away_name)
+
+        expected = 1.0 / (1.0 + 10.0 ** ((self.ratings[a] - self.ratings[h] - HOME_ADVANTAGE) / 400.0))
+        score = 1.0 if home_score > away_score else 0.5 if home_score == away_score else 0.0
+        delta = K_FACTOR * goal_multiplier(home_score - away_score) * (score - expected)
+
+        self.ratings[h] += delta
+        self.ratings[a] -= delta
+        self.matches[h] += 1
+        self.matches[a] += 1
+
+        if league_id is not None:
+            members = self.league_teams.setdefault(int(league_id), {})
+            members[h] = max(members.get(h, 0.0), played_at)
+            members[a] = max(members.get(a, 0.0), played_at)
+            self.league_last[int(league_id)] = max(self.league_last.get(int(league_id), 0.0), played_at)
+        return True
+
+    def _apply_rows(self, rows: list[dict]) -> int:
+        applied = 0
+        for row in rows:
+            applied += self.apply(
+                row["fotmob_match_id"], row["home_id"], row["home_name"], row["away_id"], row["away_name"],
+                row["home_score"], row["away_score"], row["league_id"], _timestamp(row["match_date"]),
+            )
+            if row["updated_at"] is not None and row["updated_at"] > self.synced_until:
+                self.synced_until = row["updated_at"]
+        return applied
+
+    def rebuild(self) -> int:
+        """Tüm bitmiş maçları baştan oynat"""
+        rows = execute_query(FINISHED_MATCHES_SQL, {"since": datetime.min})
+        with self._lock:
+            self._reset()
+            applied = self._apply_rows(rows)
+            self.loaded = True
+            self.checked_at = time.monotonic()
+        logger.info("Ratings rebuilt: %d matches, %d teams", applied, len(self.team_ids))
+        return applied
+
+    def sync(self) -> int:
+        """Son senkrondan beri eklenen/güncellenen bitmiş maçları uygula"""
+        since = max(self.synced_until, datetime.min + _SYNC_OVERLAP) - _SYNC_OVERLAP
+        rows = execute_query(FINISHED_MATCHES_SQL, {"since": since})
+        with self._lock:
+            self.checked_at = time.monotonic()
+            return self._apply_rows(rows)
+
+    def ensure_fresh(self) -> None:
+        if not self.loaded:
+            with self._lock:
+                if not self.loaded:
+                    self.rebuild()
+        elif time.monotonic() - self.checked_at >= settings.ratings_sync_interval and self._sync_lock.acquire(blocking=False):
+            # Tek thread senkronlar; hata olursa son ratinglerle devam
+            try:
+                self.sync()
+            except Exception as e:
+                self.checked_at = time.monotonic()
+                logger.warning("Ratings sync failed: %s", e)
+            finally:
+                self._sync_lock.release()
+
+    def record_match(self, match_data: dict) -> bool:
+        """Ingest kancası: FotMob payload'ındaki bitmiş maçı uygula (tablo yüklü değilse no-op)"""
+        general = match_data.get('general', {})
+        teams = match_data.get('header', {}).get('teams', [])
+        if not self.loaded or not general.get('finished') or len(teams) < 2:
+            return False
+
+        home, away = general.get('homeTeam', {}), general.get('awayTeam', {})
+        home_score, away_score = teams[0].get('score'), teams[1].get('score')
+        if home.get('id') is None or away.get('id') is None or home_score is None or away_score is None:
+            return False
+
+        with self._lock:
+            return self.apply(
+                int(general.get('matchId', 0)), home['id'], home.get('name', ''), away['id'], away.get('name', ''),
+                int(home_score), int(away_score),
+                general.get('parentLeagueId') or general.get('leagueId'),
+                _timestamp(general.get('matchTimeUTCDate')),
+            )
+
+    def _entry(self, idx: int, rank: int) -> dict:
+        return {
+            "team_fotmob_id": self.team_ids[idx],
+            "team_name": self.names[idx],
+            "rating": round(float(self.ratings[idx]), 1),
+            "matches": int(self.matches[idx]),
+            "rank": rank,
+        }
+
+    def team(self, fotmob_team_id: int) -> dict | None:
+        self.ensure_fresh()
+        with self._lock:
+            idx = self.index.get(fotmob_team_id)
+            if idx is None:
+                return None
+            n = len(self.team_ids)
+            rank = int((self.ratings[:n] > self.ratings[idx]).sum()) + 1
+            return {**self._entry(idx, rank), "total_teams": n}
+
+    def league(self, league_id: int, limit: int | None = None) -> list[dict]:
+        """Ligde son sezonda oynamış takımlar, ratinge göre azalan"""
+        import numpy as np
+
+        self.ensure_fresh()
+        with self._lock:
+            members = self.league_teams.get(league_id, {})
+            cutoff = self.league_last.get(league_id, 0.0) - _LEAGUE_ACTIVE_SECONDS
+            idx = np.fromiter((i for i, last in members.items() if last >= cutoff), dtype=np.int64)
+            order = idx[np.argsort(-self.ratings[idx], kind="stable")][:limit]
+            return [self._entry(int(i), rank) for rank, i in enumerate(order, start=1)]
+
+    def status(self) -> dict:
+        with self._lock:
+            if not self.loaded:
+                return {"loaded": False}
+            return {
+                "loaded": self.loaded,
+                "teams": len(self.team_ids),
+                "matches_applied": len(self.applied),
+                "synced_until": self.synced_until.isoformat(),
+            }
+
+
+rating_table = RatingTable()
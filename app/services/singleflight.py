@@ -0,0 +1,82 @@
+"""
+Single-flight servisi - aynı anahtarlı eşzamanlı hesaplamaları birleştirir
+
+Büyük maç başlangıçlarında aynı /api/h2h/8637/8695 isteği yüzlerce kez
+aynı anda gelir. Aynı anahtar için sadece ilk çağrı sorguyu çalıştırır,
+diğerleri onun sonucunu bekler. DB yükü istek sayısıyla değil farklı
+anahtar sayısıyla orantılı olur.
+"""
+import copy
+import threading
+from functools import wraps
+
+
+class _Call:
+    """Devam eden tek bir hesaplama"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Anahtar başına tek uçuşta hesaplama"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: dict = {}
+
+    def do(self, key, fn, *args, **kwargs):
+        """
+        fn'i key için bir kez çalıştır, eşzamanlı bekleyenlere sonucu dağıt.
+
+        Bekleyenler sonucun kopyasını alır; böylece çağıranlardan biri dönen
+        dict'i değiştirirse (örn: get_team_form_by_name) diğerleri etkilenmez.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                leader = False
+            else:
+                call = _Call()
+                self._calls[key] = call
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return copy.deepcopy(call.result)
+
+        try:
+            call.result = fn(*args, **kwargs)
+            return call.result
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+
+    def in_flight(self) -> int:
+        """Şu an devam eden hesaplama sayısı"""
+        with self._lock:
+            return len(self._calls)
+
+
+_group = SingleFlight()
+
+
+def single_flight(fn):
+    """
+    Fonksiyonu single-flight ile sar. Anahtar: fonksiyon adı + argümanlar.
+    Argümanlar hashable olmalı (int, str, bool, None).
+    """
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        key = (fn.__qualname__, args, tuple(sorted(kwargs.items())))
+        return _group.do(key, fn, *args, **kwargs)
+
+    return wrapper
@@ -0,0 +1,86 @@
+"""
+Skorjin servisi - konuşma kayıtlarının write-behind yazma yolu
+
+Buffer modunda konuşma ID'leri sequence'tan bloklar halinde önceden alınır,
+böylece istek ID'yi (feedback için conversation_id) hemen döndürebilir ve
+satırlar daha sonra tek multi-row INSERT ile yazılır.
+"""
+import logging
+import threading
+
+from sqlalchemy import text
+
+from app.services.db import execute_query, get_transaction, use_primary
+from app.services.write_buffer import WriteBuffer
+
+logger = logging.getLogger(__name__)
+
+CONVERSATION_COLUMNS = ("id", "user_id", "user_email", "user_message", "skorjin_response", "created_at")
+
+
+class _IdBlockAllocator:
+    """Sequence'tan blok halinde ID ayır - blok başına tek sorgu"""
+
+    def __init__(self, table: str, block_size: int):
+        self.table = table
+        self.block_size = block_size
+        self._ids: list[int] = []
+        self._lock = threading.Lock()
+
+    def next_id(self) -> int:
+        with self._lock:
+            if not self._ids:
+                # nextval yazar: replica (hot standby) değil primary
+                with use_primary():
+                    rows = execute_query("""
+                        SELECT nextval(pg_get_serial_sequence(:table, 'id')) AS id
+                        FROM generate_series(1, :n)
+                    """, {"table": self.table, "n": self.block_size})
+                self._ids = [int(row["id"]) for row in rows]
+                self._ids.reverse()
+            return self._ids.pop()
+
+
+def insert_conversations(rows: list[dict]) -> None:
+    """Konuşmaları tek multi-row INSERT ile yaz (tek commit)"""
+    values = []
+    params = {}
+    for i, row in enumerate(rows):
+        values.append("(" + ", ".join(f":{col}_{i}" for col in CONVERSATION_COLUMNS) + ")")
+        params.update({f"{col}_{i}": row[col] for col in CONVERSATION_COLUMNS})
+
+    sql = f"""
+        INSERT INTO greydb.skorjin_conversations ({", ".join(CONVERSATION_COLUMNS)})
+        VALUES {", ".join(values)}
+        ON CONFLICT (id) DO NOTHING
+    """
+    with get_transaction() as conn:
+        conn.execute(text(sql), params)
+
+
+def flush_conversations(rows: list[dict]) -> int:
+    """Buffer flush - batch hata verirse satırları tek tek dene; yazılamayan satır sayısı"""
+    try:
+        insert_conversations(rows)
+        return 0
+    except Exception:
+        if len(rows) == 1:
+            raise
+
+    failed = 0
+    for row in rows:
+        try:
+            insert_conversations([row])
+        except Exception as e:
+            failed += 1
+            logger.error("Conversation write error for id %s: %s", row["id"], e)
+    return failed
+
+
+# Write-behind modu (config: write_buffer_enabled)
+conversation_buffer = WriteBuffer("skorjin_conversations", flush_conversations)
+_conversation_ids = _IdBlockAllocator("greydb.skorjin_conversations", conversation_buffer.max_batch)
+
+
+def reserve_conversation_id() -> int:
+    return _conversation_ids.next_id()
@@ -0,0 +1,190 @@
+"""
+Puan durumu servisi - ingest edilen maçlardan (public.matches) lig tablosu
+
+Lig/sezon için tüm bitmiş maçlar tek sorguda takım başına ev/deplasman
+toplamlarına indirgenir; puan, averaj ve sıralama NumPy ile hesaplanır.
+Sezon maç tarihinden türetilir (1 Temmuz başlangıç: 2024/2025 = 2024-07-01 .. 2025-07-01).
+Takvim yılı ile oynanan liglerde sezon iki yıla bölünür.
+
+Sonuçlar lig başına cache'lenir; save_full_match_data ligin cache'ini düşürür.
+Cache worker başınadır: diğer worker'lar en geç standings_cache_ttl sonra yeniler.
+"""
+import threading
+
+from app.config import get_settings
+from app.services.cache import TTLCache
+from app.services.db import execute_query
+from app.services.singleflight import single_flight
+
+# Lig FotMob ID -> {sezon başlangıç yılı (None = son sezon): puan durumu}
+_standings_cache = TTLCache(get_settings().standings_cache_ttl, max_entries=1000)
+
+# Lig başına invalidation sayacı: hesaplama sürerken gelen ingest eski sonucu cache'letmesin
+_versions: dict[int, int] = {}
+_versions_lock = threading.Lock()
+
+STANDINGS_SQL = """
+    WITH league AS (
+        SELECT id FROM public.leagues WHERE fotmob_league_id = :league_id
+    ),
+    season AS (
+        SELECT COALESCE(
+            CAST(:season_year AS integer),
+            (SELECT CAST(EXTRACT(YEAR FROM MAX(m.match_date) - INTERVAL '6 months') AS integer)
+             FROM public.matches m
+             WHERE m.league_id IN (SELECT id FROM league) AND m.finished)
+        ) AS start_year
+    ),
+    league_matches AS (
+        SELECT m.home_team_id, m.away_team_id, m.home_score, m.away_score
+        FROM public.matches m, season s
+        WHERE m.league_id IN (SELECT id FROM league)
+          AND m.finished
+          AND m.home_score IS NOT NULL AND m.away_score IS NOT NULL
+          AND m.match_date >= make_date(s.start_year, 7, 1)
+          AND m.match_date < make_date(s.start_year + 1, 7, 1)
+    ),
+    sides AS (
+        SELECT home_team_id AS team_id, TRUE AS is_home, home_score AS gf, away_score AS ga FROM league_matches
+        UNION ALL
+        SELECT away_team_id, FALSE, away_score, home_score FROM league_matches
+    )
+    SELECT
+        (SELECT start_year FROM season) AS season_start_year,
+        t.fotmob_team_id,
+        t.name,
+        COUNT(*) FILTER (WHERE is_home AND gf > ga) AS home_won,
+        COUNT(*) FILTER (WHERE is_home AND gf = ga) AS home_drawn,
+        COUNT(*) FILTER (WHERE is_home AND gf < ga) AS home_lost,
+        COALESCE(SUM(gf) FILTER (WHERE is_home), 0) AS home_gf,
+        COALESCE(SUM(ga) FILTER (WHERE is_home), 0) AS home_ga,
+        COUNT(*) FILTER (WHERE NOT is_home AND gf > ga) AS away_won,
+        COUNT(*) FILTER (WHERE NOT is_home AND gf = ga) AS away_drawn,
+        COUNT(*) FILTER (WHERE NOT is_home AND gf < ga) AS away_lost,
+        COALESCE(SUM(gf) FILTER (WHERE NOT is_home), 0) AS away_gf,
+        COALESCE(SUM(ga) FILTER (WHERE NOT is_home), 0) AS away_ga
+    FROM sides s
+    JOIN public.teams t ON t.id = s.team_id
+    GROUP BY t.fotmob_team_id, t.name
+    ORDER BY t.name
+"""
+
+# SQL kolonlarının sırası: (won, drawn, lost, gf, ga)
+_SPLIT_COLUMNS = ("won", "drawn", "lost", "gf", "ga")
+
+
+def parse_season(season: str | None) -> int | None:
+    """'2024/2025' veya '2024' -> 2024 (sezon başlangıç yılı)"""
+    if not season:
+        return None
+    try:
+        return int(season.split("/")[0])
+    except ValueError:
+        raise ValueError(f"Geçersiz sezon: {season} (örn. 2024/2025)")
+
+
+def season_label(start_year: int | None) -> str | None:
+    return f"{start_year}/{start_year + 1}" if start_year is not None else None
+
+
+def _split(matrix, offset: int) -> dict:
+    """(won, drawn, lost, gf, ga) kolonlarından played/points dahil sütun dizileri"""
+    won, drawn, lost, gf, ga = (matrix[:, offset + i] for i in range(len(_SPLIT_COLUMNS)))
+    return {
+        "played": won + drawn + lost,
+        "won": won,
+        "drawn": drawn,
+        "lost": lost,
+        "goals_for": gf,
+        "goals_against": ga,
+        "goal_diff": gf - ga,
+        "points": won * 3 + drawn,
+    }
+
+
+def _row(split: dict, i: int) -> dict:
+    return {key: int(values[i]) for key, values in split.items()}
+
+
+def compute_standings(rows: list[dict]) -> list[dict]:
+    """
+    Takım başına ev/deplasman toplamlarından sıralı puan tablosu.
+
+    Sıralama: puan, averaj, atılan gol, galibiyet (hepsi azalan), sonra takım adı
+    (rows isme göre sıralı gelir). İkili averaj uygulanmaz.
+    """
+    import numpy as np
+
+    if not rows:
+        return []
+
+    columns = [f"{side}_{column}" for side in ("home", "away") for column in _SPLIT_COLUMNS]
+    matrix = np.array([[row[column] for column in columns] for row in rows], dtype=np.int64)
+    home = _split(matrix, 0)
+    away = _split(matrix, len(_SPLIT_COLUMNS))
+    total = {key: home[key] + away[key] for key in home}
+
+    # lexsort son anahtara göre birincil sıralar; ilk anahtar (isim sırası) son tie-break
+    order = np.lexsort((
+        np.arange(len(rows)),
+        -total["won"],
+        -total["goals_for"],
+        -total["goal_diff"],
+        -total["points"],
+    ))
+
+    return [
+        {
+            "position": position,
+            "team_fotmob_id": int(rows[i]["fotmob_team_id"]),
+            "team_name": rows[i]["name"],
+            **_row(total, i),
+            "home": _row(home, i),
+            "away": _row(away, i),
+        }
+        for position, i in enumerate(order, start=1)
+    ]
+
+
+@single_flight
+def _load_standings(league_fotmob_id: int, season_year: int | None) -> dict:
+    rows = execute_query(STANDINGS_SQL, {"league_id": league_fotmob_id, "season_year": season_year})
+    start_year = rows[0]["season_start_year"] if rows else season_year
+    return {
+        "league_id": league_fotmob_id,
+        "season": season_label(start_year),
+        "standings": compute_standings(rows),
+    }
+
+
+def get_standings(league_fotmob_id: int, season: str | None = None) -> dict:
+    """
+    Lig puan durumu (cache'li)
+
+    Args:
+        league_fotmob_id: Lig FotMob ID
+        season: '2024/2025' veya '2024'; boşsa ligin son bitmiş maçının sezonu
+    """
+    season_year = parse_season(season)
+
+    seasons = _standings_cache.get(league_fotmob_id) or {}
+    if season_year in seasons:
+        return seasons[season_year]
+
+    with _versions_lock:
+        version = _versions.get(league_fotmob_id, 0)
+
+    result = _load_standings(league_fotmob_id, season_year)
+
+    with _versions_lock:
+        if _versions.get(league_fotmob_id, 0) == version:
+            seasons = _standings_cache.get(league_fotmob_id) or {}
+            _standings_cache.set(league_fotmob_id, {**seasons, season_year: result})
+    return result
+
+
+def invalidate_standings(league_fotmob_id: int) -> None:
+    """Ligin tüm sezonlarının cache'ini düşür (ingest sonrası)"""
+    with _versions_lock:
+        _versions[league_fotmob_id] = _versions.get(league_fotmob_id, 0) + 1
+        _standings_cache.delete(league_fotmob_id)
@@ -1,11 +1,97 @@
 """
 İstatistik hesaplama servisi - pandas ile
 """
-import pandas as pd
-import numpy as np
-from app.services.db import query_to_df
+from app.services.db import PreparedStatement, execute_query, query_to_df
+from app.services.singleflight import single_flight
 
 
+FORM_VIEWS = {
+    "home": "greydb.vw_team_home_form",
+    "away": "greydb.vw_team_away_form",
+    "league": "greydb.vw_team_league_form",
+    "overall": "greydb.vw_team_overall_form",
+}
+
+
+def _form_sql(view: str, by_league: bool) -> str:
+    return f"""
+        SELECT * FROM {view}
+        WHERE team_fotmob_id = :team_id
+        {"AND league_fotmob_id = :league_id" if by_league else ""}
+        AND match_rank <= :limit
+        ORDER BY match_date DESC
+    """
+
+
+# (view anahtarı, lig filtresi) -> prepared statement
+FORM_STATEMENTS = {
+    (key, by_league): PreparedStatement(f"form_{key}{'_by_league' if by_league else ''}", _form_sql(view, by_league))
+    for key, view in FORM_VIEWS.items()
+    for by_league in (False, True)
+}
+
+# Takım kartı: genel, ev, deplasman ve lig başına son :limit maçın birleşimi
+FORM_SUMMARY_STATEMENT = PreparedStatement("form_summary", """
+    SELECT * FROM (
+        SELECT
+            f.*,
+            ROW_NUMBER() OVER (PARTITION BY venue ORDER BY match_date DESC) AS venue_rank,
+            ROW_NUMBER() OVER (PARTITION BY league_fotmob_id ORDER BY match_date DESC) AS league_rank
+        FROM greydb.vw_team_overall_form f
+        WHERE team_fotmob_id = :team_id
+    ) ranked
+    WHERE match_rank <= :limit OR venue_rank <= :limit OR league_rank <= :limit
+    ORDER BY match_date DESC
+""")
+
+H2H_STATEMENT = PreparedStatement("h2h", """
+    SELECT * FROM greydb.vw_h2h
+    WHERE (home_fotmob_id = :team1 AND away_fotmob_id = :team2)
+       OR (home_fotmob_id = :team2 AND away_fotmob_id = :team1)
+    ORDER BY match_date DESC
+    LIMIT :limit
+""")
+
+# Sırasız takım çiftleri (team_a < team_b) için son :limit karşılaşma, tek sorguda
+H2H_MATRIX_STATEMENT = PreparedStatement("h2h_matrix", """
+    SELECT p.team_a, p.team_b, h.*
+    FROM unnest(CAST(:team_a AS integer[]), CAST(:team_b AS integer[])) AS p(team_a, team_b)
+    CROSS JOIN LATERAL (
+        SELECT home_fotmob_id, away_fotmob_id, home_score, away_score, total_goals, btts, match_date
+        FROM greydb.vw_h2h
+        WHERE (home_fotmob_id = p.team_a AND away_fotmob_id = p.team_b)
+           OR (home_fotmob_id = p.team_b AND away_fotmob_id = p.team_a)
+        ORDER BY match_date DESC
+        LIMIT :limit
+    ) h
+""")
+
+# Lig haftasının eşleşmeleri (public.matches); sezon = o haftanın en son oynandığı sezon
+ROUND_FIXTURES_SQL = """
+    WITH round_matches AS (
+        SELECT m.match_date, ht.fotmob_team_id AS home_id, at.fotmob_team_id AS away_id
+        FROM public.matches m
+        JOIN public.leagues l ON l.id = m.league_id
+        JOIN public.teams ht ON ht.id = m.home_team_id
+        JOIN public.teams at ON at.id = m.away_team_id
+        WHERE l.fotmob_league_id = :league_id AND m.round = :round
+    )
+    SELECT home_id, away_id
+    FROM round_matches
+    WHERE EXTRACT(YEAR FROM match_date - INTERVAL '6 months') =
+          (SELECT MAX(EXTRACT(YEAR FROM match_date - INTERVAL '6 months')) FROM round_matches)
+    ORDER BY match_date, home_id
+"""
+
+H2H_HOME_STATEMENT = PreparedStatement("h2h_home", """
+    SELECT * FROM greydb.vw_h2h_home
+    WHERE home_fotmob_id = :team1 AND away_fotmob_id = :team2
+    AND match_rank <= :limit
+    ORDER BY match_date DESC
+""")
+
+
+@single_flight
 def get_team_form(team_fotmob_id: int, limit: int = 5, venue: str = None, league_fotmob_id: int = None) -> dict:
     """
     Takım formu hesapla
@@ -16,34 +102,28 @@ def get_team_form(team_fotmob_id: int, limit: int = 5, venue: str = None, league
         venue: 'home', 'away' veya None (genel)
         league_fotmob_id: Lig filtresi (opsiyonel)
     """
-    if venue == "home":
-        view = "greydb.vw_team_home_form"
-    elif venue == "away":
-        view = "greydb.vw_team_away_form"
+    if venue in ("home", "away"):
+        view = venue
     elif league_fotmob_id:
-        view = "greydb.vw_team_league_form"
+        view = "league"
     else:
-        view = "greydb.vw_team_overall_form"
-    
-    sql = f"""
-        SELECT * FROM {view}
-        WHERE team_fotmob_id = :team_id
-        {"AND league_fotmob_id = :league_id" if league_fotmob_id else ""}
-        AND match_rank <= :limit
-        ORDER BY match_date DESC
-    """
+        view = "overall"
     
     params = {"team_id": team_fotmob_id, "limit": limit}
     if league_fotmob_id:
         params["league_id"] = league_fotmob_id
     
-    df = query_to_df(sql, params)
+    df = FORM_STATEMENTS[(view, bool(league_fotmob_id))].to_df(params)
     
     if df.empty:
         return {"matches": [], "stats": None}
     
-    # İstatistikler
-    stats = {
+    return {"matches": _form_matches(df), "stats": _form_stats(df)}
+
+
+def _form_stats(df) -> dict:
+    """Form satırlarından (match_date azalan) özet istatistikler"""
+    return {
         "played": len(df),
         "wins": int((df["result"] == "W").sum()),
         "draws": int((df["result"] == "D").sum()),
@@ -58,8 +138,9 @@ def get_team_form(team_fotmob_id: int, limit: int = 5, venue: str = None, league
         "btts_pct": round(df["btts"].mean() * 100, 1) if "btts" in df.columns else None,
         "form_string": "".join(df["result"].tolist())  # "WWDLW"
     }
-    
-    # Maç listesi
+
+
+def _form_matches(df) -> list[dict]:
     matches = df[[
         "match_date", "opponent", "goals_for", "goals_against", 
         "result", "league_name", "fotmob_url"
@@ -69,7 +150,52 @@ def get_team_form(team_fotmob_id: int, limit: int = 5, venue: str = None, league
     for m in matches:
         m["match_date"] = m["match_date"].isoformat() if m["match_date"] else None
     
-    return {"matches": matches, "stats": stats}
+    return matches
+
+
+@single_flight
+def get_team_form_summary(team_fotmob_id: int, windows: tuple = (5, 10), league_fotmob_id: int = None) -> dict:
+    """
+    Takım kartı: genel/ev/deplasman/lig formu, her pencere için (tek sorgu)
+    
+    Args:
+        team_fotmob_id: Takım FotMob ID
+        windows: Maç sayıları, örn (5, 10)
+        league_fotmob_id: Lig formu için lig (None = takımın son maçının ligi)
+    """
+    import pandas as pd
+    
+    windows = tuple(sorted(set(windows)))
+    df = FORM_SUMMARY_STATEMENT.to_df({"team_id": team_fotmob_id, "limit": windows[-1]})
+    
+    if df.empty:
+        return {"windows": list(windows), "league_fotmob_id": league_fotmob_id, "form": None, "matches": []}
+    
+    if league_fotmob_id is None:
+        latest_league = df["league_fotmob_id"].iloc[0]
+        league_fotmob_id = int(latest_league) if pd.notna(latest_league) else None
+    
+    # Satırlar match_date azalan; her görünüm maske + ilk N satır
+    views = {
+        "overall": df[df["match_rank"] <= windows[-1]],
+        "home": df[df["venue"] == "home"],
+        "away": df[df["venue"] == "away"],
+        "league": df[df["league_fotmob_id"] == league_fotmob_id],
+    }
+    form = {
+        view: {
+            str(window): _form_stats(rows.iloc[:window]) if not rows.empty else None
+            for window in windows
+        }
+        for view, rows in views.items()
+    }
+    
+    return {
+        "windows": list(windows),
+        "league_fotmob_id": league_fotmob_id,
+        "form": form,
+        "matches": _form_matches(views["overall"]),
+    }
 
 
 # Bilinen takım alias'ları (FotMob isimleri -> DB isimleri)
@@ -134,6 +260,7 @@ TEAM_ALIASES = {
 }
 
 
+@single_flight
 def find_team_by_name(team_name: str) -> dict | None:
     """
     Takım adından FotMob ID bul (alias + fuzzy match)
@@ -197,10 +324,11 @@ def get_team_form_by_name(team_name: str, limit: int = 5, venue: str = None) ->
         venue=venue
     )
     
-    result["team"] = team
-    return result
+    # Sonuç single-flight ile paylaşılıyor olabilir, yerinde değiştirme
+    return {**result, "team": team}
 
 
+@single_flight
 def get_h2h(team1_fotmob_id: int, team2_fotmob_id: int, limit: int = 10, home_only: bool = False) -> dict:
     """
     İki takım arası H2H istatistikleri
@@ -211,23 +339,8 @@ def get_h2h(team1_fotmob_id: int, team2_fotmob_id: int, limit: int = 10, home_on
         limit: Maç sayısı (default 10)
         home_only: Sadece team1 ev sahibiyken
     """
-    if home_only:
-        sql = """
-            SELECT * FROM greydb.vw_h2h_home
-            WHERE home_fotmob_id = :team1 AND away_fotmob_id = :team2
-            AND match_rank <= :limit
-            ORDER BY match_date DESC
-        """
-    else:
-        sql = """
-            SELECT * FROM greydb.vw_h2h
-            WHERE (home_fotmob_id = :team1 AND away_fotmob_id = :team2)
-               OR (home_fotmob_id = :team2 AND away_fotmob_id = :team1)
-            ORDER BY match_date DESC
-            LIMIT :limit
-        """
-    
-    df = query_to_df(sql, {"team1": team1_fotmob_id, "team2": team2_fotmob_id, "limit": limit})
+    statement = H2H_HOME_STATEMENT if home_only else H2H_STATEMENT
+    df = statement.to_df({"team1": team1_fotmob_id, "team2": team2_fotmob_id, "limit": limit})
     
     if df.empty:
         return {"matches": [], "stats": None}
@@ -261,3 +374,80 @@ def get_h2h(team1_fotmob_id: int, team2_fotmob_id: int, limit: int = 10, home_on
     
     return {"matches": matches, "stats": stats}
 
+
+def get_round_fixtures(league_fotmob_id: int, round_number: int) -> list[tuple[int, int]]:
+    """Lig haftasındaki (ev sahibi, deplasman) FotMob ID çiftleri"""
+    rows = execute_query(ROUND_FIXTURES_SQL, {"league_id": league_fotmob_id, "round": round_number})
+    return [(row["home_id"], row["away_id"]) for row in rows]
+
+
+@single_flight
+def get_h2h_matrix(fixtures: tuple, limit: int = 10) -> list[dict]:
+    """
+    Fikstür listesi için H2H özetleri (tek sorgu, tek groupby)
+    
+    Args:
+        fixtures: ((team1 FotMob ID, team2 FotMob ID), ...) - team1 genelde ev sahibi
+        limit: Çift başına son maç sayısı
+    
+    Çiftler sırasız anahtarla (küçük ID, büyük ID) bir kez sorgulanır; sonuç
+    her fikstürün team1/team2 yönüne çevrilir. Stats anahtarları get_h2h ile aynı.
+    """
+    import numpy as np
+    
+    if not fixtures:
+        return []
+    
+    pairs = list(dict.fromkeys((min(t1, t2), max(t1, t2)) for t1, t2 in fixtures))
+    df = H2H_MATRIX_STATEMENT.to_df({
+        "team_a": [a for a, _ in pairs],
+        "team_b": [b for _, b in pairs],
+        "limit": limit,
+    })
+    
+    summaries = {}
+    if not df.empty:
+        a_home = (df["home_fotmob_id"] == df["team_a"]).to_numpy()
+        a_goals = np.where(a_home, df["home_score"], df["away_score"])
+        b_goals = np.where(a_home, df["away_score"], df["home_score"])
+        df = df.assign(
+            a_goals=a_goals,
+            b_goals=b_goals,
+            a_win=(a_goals > b_goals).astype(int),
+            b_win=(a_goals < b_goals).astype(int),
+            draw=(a_goals == b_goals).astype(int),
+        )
+        grouped = df.groupby(["team_a", "team_b"]).agg(
+            total_matches=("match_date", "size"),
+            a_wins=("a_win", "sum"),
+            b_wins=("b_win", "sum"),
+            draws=("draw", "sum"),
+            a_goals=("a_goals", "sum"),
+            b_goals=("b_goals", "sum"),
+            avg_total_goals=("total_goals", "mean"),
+            btts=("btts", "mean"),
+            last_match_date=("match_date", "max"),
+        )
+        summaries = {(int(a), int(b)): row for (a, b), row in zip(grouped.index, grouped.to_dict(orient="records"))}
+    
+    results = []
+    for team1, team2 in fixtures:
+        summary = summaries.get((min(team1, team2), max(team1, team2)))
+        stats = None
+        if summary is not None:
+            # team1 çiftin küçük ID'si değilse a/b yer değiştirir
+            first, second = ("a", "b") if team1 < team2 else ("b", "a")
+            stats = {
+                "total_matches": int(summary["total_matches"]),
+                "team1_wins": int(summary[f"{first}_wins"]),
+                "team2_wins": int(summary[f"{second}_wins"]),
+                "draws": int(summary["draws"]),
+                "team1_goals": int(summary[f"{first}_goals"]),
+                "team2_goals": int(summary[f"{second}_goals"]),
+                "avg_total_goals": round(float(summary["avg_total_goals"]), 2),
+                "btts_pct": round(float(summary["btts"]) * 100, 1),
+                "last_match_date": summary["last_match_date"].isoformat() if summary["last_match_date"] is not None else None,
+            }
+        results.append({"team1_fotmob_id": team1, "team2_fotmob_id": team2, "stats": stats})
+    
+    return results
@@ -0,0 +1,134 @@
+"""
+Takım rolling metrikleri - son N bitmiş maçın xG, şut, topla oynama ortalamaları
+
+Kaynak: public.match_stats (xG, şut, isabetli şut, topla oynama) ve
+public.match_advanced_stats (büyük fırsatlar). Değerler takımın gözünden
+çevrilir: ev sahibiyken home_*, deplasmandayken away_* "for" olur.
+
+Takım başına son N maç ev/deplasman index'lerinden (migrations/005) LATERAL
+ile alınır; birden fazla takım tek sorguda hesaplanır. İstatistiği olmayan
+maçlar `matches`'e sayılır ama ortalamalara girmez (matches_with_stats).
+
+Sonuçlar (takım, pencere, ingest versiyonu) anahtarıyla cache'lenir: yeni
+ingest versiyonu değiştirir, eski kayıtlar TTL ile düşer.
+"""
+from app.config import get_settings
+from app.services.cache import TTLCache
+from app.services.db import execute_query
+from app.services.ingest_version import current_ingest_version
+
+_metrics_cache = TTLCache(get_settings().team_metrics_cache_ttl, max_entries=20_000)
+
+METRIC_COLUMNS = (
+    "xg_for", "xg_against",
+    "shots_for", "shots_against",
+    "shots_on_target_for", "shots_on_target_against",
+    "possession",
+    "big_chances_for", "big_chances_against",
+)
+
+TEAM_METRICS_SQL = """
+    WITH teams AS (
+        SELECT id, fotmob_team_id, name
+        FROM public.teams
+        WHERE fotmob_team_id = ANY(:team_ids)
+    ),
+    recent AS (
+        SELECT t.fotmob_team_id, t.name, r.match_id, r.match_date, r.is_home
+        FROM teams t
+        CROSS JOIN LATERAL (
+            SELECT * FROM (
+                (SELECT m.id AS match_id, m.match_date, TRUE AS is_home
+                 FROM public.matches m
+                 WHERE m.home_team_id = t.id AND m.finished AND m.match_date IS NOT NULL
+                 ORDER BY m.match_date DESC
+                 LIMIT :window)
+                UNION ALL
+                (SELECT m.id, m.match_date, FALSE
+                 FROM public.matches m
+                 WHERE m.away_team_id = t.id AND m.finished AND m.match_date IS NOT NULL
+                 ORDER BY m.match_date DESC
+                 LIMIT :window)
+            ) sides
+            ORDER BY match_date DESC
+            LIMIT :window
+        ) r
+    )
+    SELECT
+        r.fotmob_team_id,
+        MAX(r.name) AS team_name,
+        COUNT(*) AS matches,
+        COUNT(ms.match_id) AS matches_with_stats,
+        MIN(r.match_date) AS first_match_date,
+        MAX(r.match_date) AS last_match_date,
+        AVG(CASE WHEN r.is_home THEN ms.home_xg ELSE ms.away_xg END) AS xg_for,
+        AVG(CASE WHEN r.is_home THEN ms.away_xg ELSE ms.home_xg END) AS xg_against,
+        AVG(CASE WHEN r.is_home THEN ms.home_shots ELSE ms.away_shots END) AS shots_for,
+        AVG(CASE WHEN r.is_home THEN ms.away_shots ELSE ms.home_shots END) AS shots_against,
+        AVG(CASE WHEN r.is_home THEN ms.home_shots_on_target ELSE ms.away_shots_on_target END) AS shots_on_target_for,
+        AVG(CASE WHEN r.is_home THEN ms.away_shots_on_target ELSE ms.home_shots_on_target END) AS shots_on_target_against,
+        AVG(CASE WHEN r.is_home THEN ms.home_possession ELSE ms.away_possession END) AS possession,
+        AVG(CASE WHEN r.is_home THEN mas.home_big_chances ELSE mas.away_big_chances END) AS big_chances_for,
+        AVG(CASE WHEN r.is_home THEN mas.away_big_chances ELSE mas.home_big_chances END) AS big_chances_against
+    FROM recent r
+    LEFT JOIN public.match_stats ms ON ms.match_id = r.match_id
+    LEFT JOIN public.match_advanced_stats mas ON mas.match_id = r.match_id
+    GROUP BY r.fotmob_team_id
+"""
+
+
+def _metrics_entry(team_id: int, row: dict | None, window: int) -> dict:
+    if row is None:
+        return {
+            "team_fotmob_id": team_id,
+            "team_name": None,
+            "window": window,
+            "matches": 0,
+            "matches_with_stats": 0,
+            "first_match_date": None,
+            "last_match_date": None,
+            **{column: None for column in METRIC_COLUMNS},
+        }
+    return {
+        "team_fotmob_id": team_id,
+        "team_name": row["team_name"],
+        "window": window,
+        "matches": int(row["matches"]),
+        "matches_with_stats": int(row["matches_with_stats"]),
+        "first_match_date": row["first_match_date"].isoformat() if row["first_match_date"] else None,
+        "last_match_date": row["last_match_date"].isoformat() if row["last_match_date"] else None,
+        **{
+            column: round(float(row[column]), 2) if row[column] is not None else None
+            for column in METRIC_COLUMNS
+        },
+    }
+
+
+def get_team_metrics_many(team_ids: list[int], window: int = 10) -> list[dict]:
+    """
+    Takım listesi için son `window` bitmiş maçın ortalamaları (team_ids sırasında)
+
+    Bitmiş maçı olmayan takımlar matches=0 ve boş metriklerle döner.
+    """
+    team_ids = list(dict.fromkeys(team_ids))
+    if not team_ids:
+        return []
+
+    version = current_ingest_version()
+    found, missing = _metrics_cache.get_many([(team_id, window, version) for team_id in team_ids])
+    if missing:
+        missing_ids = [team_id for team_id, _, _ in missing]
+        rows = execute_query(TEAM_METRICS_SQL, {"team_ids": missing_ids, "window": window})
+        by_team = {row["fotmob_team_id"]: row for row in rows}
+        computed = {
+            (team_id, window, version): _metrics_entry(team_id, by_team.get(team_id), window)
+            for team_id in missing_ids
+        }
+        _metrics_cache.set_many(computed)
+        found.update(computed)
+
+    return [found[(team_id, window, version)] for team_id in team_ids]
+
+
+def get_team_metrics(team_id: int, window: int = 10) -> dict:
+    return get_team_metrics_many([team_id], window)[0]
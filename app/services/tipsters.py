@@ -0,0 +1,185 @@
+"""
+Tahminci (tipster) sıralaması - yazar başına sonuç toplamları
+
+greydb.tipster_stats (created_by_email) başına won/lost/void, isabet oranı,
+ROI ve serileri tutar (migrations/008). Bir tahminin sonucu değiştiğinde
+(check_prediction_results, update_prediction, silme) sadece o yazarların
+satırı kendi tahminlerinden (created_by_email index'i) yeniden hesaplanır;
+sıralama okuması tablo taraması değil küçük tablonun sıralamasıdır.
+
+Seriler sıraya bağlı olduğu ve sonuçlar sonradan düzeltilebildiği için
+yazar satırı delta ile değil yazarın tahminlerinden tam hesaplanır.
+
+ROI birim bahis üzerinden: kazanan +(oran - 1), kaybeden -1, void 0;
+oranı olmayan tahminler ROI'ye girmez.
+"""
+from app.services.db import execute_insert, execute_query
+
+# Sıralama ölçütü -> ORDER BY ifadesi
+LEADERBOARD_ORDERS = {
+    "roi": "roi DESC NULLS LAST, profit DESC",
+    "profit": "profit DESC, roi DESC NULLS LAST",
+    "hit_rate": "hit_rate DESC NULLS LAST, won DESC",
+    "won": "won DESC, hit_rate DESC NULLS LAST",
+}
+
+# {authors}: email kolonlu yazar kümesi (parametre listesi veya tüm yazarlar)
+_REFRESH_SQL = """
+    WITH authors AS (
+        {authors}
+    ),
+    settled AS (
+        SELECT p.id, p.created_by_email AS email, p.result, p.odds, p.match_date
+        FROM greydb.predictions p
+        JOIN authors a ON a.email = p.created_by_email
+        WHERE p.result IN ('won', 'lost', 'void')
+    ),
+    totals AS (
+        SELECT
+            email,
+            COUNT(*) AS settled,
+            COUNT(*) FILTER (WHERE result = 'won') AS won,
+            COUNT(*) FILTER (WHERE result = 'lost') AS lost,
+            COUNT(*) FILTER (WHERE result = 'void') AS void,
+            COUNT(*) FILTER (WHERE result IN ('won', 'lost') AND odds IS NOT NULL) AS staked,
+            COALESCE(SUM(CASE result WHEN 'won' THEN odds - 1 WHEN 'lost' THEN -1 END)
+                     FILTER (WHERE odds IS NOT NULL), 0) AS profit,
+            MAX(match_date) AS last_match_date
+        FROM settled
+        GROUP BY email
+    ),
+    -- Seriler: void atlanır; ardışık aynı sonuçlar (en yeniden geriye) tek ada
+    decided AS (
+        SELECT
+            email, result,
+            ROW_NUMBER() OVER (PARTITION BY email ORDER BY match_date DESC, id DESC)
+            - ROW_NUMBER() OVER (PARTITION BY email, result ORDER BY match_date DESC, id DESC) AS island
+        FROM settled
+        WHERE result IN ('won', 'lost')
+    ),
+    islands AS (
+        SELECT email, result, island, COUNT(*) AS length
+        FROM decided
+        GROUP BY email, result, island
+    ),
+    streaks AS (
+        SELECT
+            email,
+            MAX(length) FILTER (WHERE result = 'won') AS longest_win_streak,
+            MAX(length) FILTER (WHERE result = 'lost') AS longest_loss_streak,
+            -- En yeni sonucun adası: island = 0 ve (sonuç başına) tek
+            MAX(CASE WHEN island = 0 THEN result END) AS current_streak_result,
+            MAX(CASE WHEN island = 0 THEN length END) AS current_streak
+        FROM islands
+        GROUP BY email
+    ),
+    upserted AS (
+        INSERT INTO greydb.tipster_stats AS t (
+            created_by_email, settled, won, lost, void, staked, profit, hit_rate, roi,
+            current_streak, current_streak_result, longest_win_streak, longest_loss_streak,
+            last_match_date, updated_at
+        )
+        SELECT
+            a.email,
+            COALESCE(tt.settled, 0),
+            COALESCE(tt.won, 0),
+            COALESCE(tt.lost, 0),
+            COALESCE(tt.void, 0),
+            COALESCE(tt.staked, 0),
+            COALESCE(tt.profit, 0),
+            CASE WHEN tt.won + tt.lost > 0 THEN CAST(tt.won AS numeric) / (tt.won + tt.lost) END,
+            CASE WHEN tt.staked > 0 THEN tt.profit / tt.staked END,
+            COALESCE(s.current_streak, 0),
+            s.current_streak_result,
+            COALESCE(s.longest_win_streak, 0),
+            COALESCE(s.longest_loss_streak, 0),
+            tt.last_match_date,
+            NOW()
+        FROM authors a
+        LEFT JOIN totals tt ON tt.email = a.email
+        LEFT JOIN streaks s ON s.email = a.email
+        ON CONFLICT (created_by_email) DO UPDATE SET
+            settled = EXCLUDED.settled,
+            won = EXCLUDED.won,
+            lost = EXCLUDED.lost,
+            void = EXCLUDED.void,
+            staked = EXCLUDED.staked,
+            profit = EXCLUDED.profit,
+            hit_rate = EXCLUDED.hit_rate,
+            roi = EXCLUDED.roi,
+            current_streak = EXCLUDED.current_streak,
+            current_streak_result = EXCLUDED.current_streak_result,
+            longest_win_streak = EXCLUDED.longest_win_streak,
+            longest_loss_streak = EXCLUDED.longest_loss_streak,
+            last_match_date = EXCLUDED.last_match_date,
+            updated_at = NOW()
+        RETURNING 1
+    )
+    SELECT COUNT(*) AS authors FROM upserted
+"""
+
+REFRESH_AUTHORS_SQL = _REFRESH_SQL.format(
+    authors="SELECT DISTINCT unnest(CAST(:emails AS text[])) AS email"
+)
+REBUILD_SQL = _REFRESH_SQL.format(
+    authors="SELECT DISTINCT created_by_email AS email FROM greydb.predictions"
+)
+
+LEADERBOARD_SQL = """
+    SELECT *
+    FROM greydb.tipster_stats
+    WHERE settled >= :min_settled
+    ORDER BY {order}, created_by_email
+    LIMIT :limit
+"""
+
+
+def refresh_tipster_stats(emails) -> None:
+    """Sonucu değişen tahminlerin yazarlarının satırlarını yeniden hesapla"""
+    emails = sorted({email for email in emails if email})
+    if emails:
+        execute_insert(REFRESH_AUTHORS_SQL, {"emails": emails})
+
+
+def rebuild_tipster_stats() -> int:
+    """Tüm yazarları yeniden hesapla (ilk kurulum / periyodik düzeltme); yazar sayısı"""
+    result = execute_insert(REBUILD_SQL)
+    return int(result["authors"]) if result else 0
+
+
+def _num(value, digits: int):
+    return round(float(value), digits) if value is not None else None
+
+
+def get_leaderboard(order_by: str = "roi", min_settled: int = 10, limit: int = 20) -> list[dict]:
+    """
+    Tahminci sıralaması
+
+    Raises:
+        ValueError: Bilinmeyen sıralama ölçütü
+    """
+    if order_by not in LEADERBOARD_ORDERS:
+        raise ValueError(f"order_by şunlardan biri olmalı: {', '.join(LEADERBOARD_ORDERS)}")
+
+    rows = execute_query(LEADERBOARD_SQL.format(order=LEADERBOARD_ORDERS[order_by]), {
+        "min_settled": min_settled,
+        "limit": limit,
+    })
+    return [
+        {
+            "rank": rank,
+            "created_by_email": row["created_by_email"],
+            "settled": row["settled"],
+            "won": row["won"],
+            "lost": row["lost"],
+            "void": row["void"],
+            "hit_rate": _num(row["hit_rate"] * 100 if row["hit_rate"] is not None else None, 1),
+            "profit": _num(row["profit"], 2),
+            "roi": _num(row["roi"] * 100 if row["roi"] is not None else None, 1),
+            "current_streak": {"result": row["current_streak_result"], "length": row["current_streak"]},
+            "longest_win_streak": row["longest_win_streak"],
+            "longest_loss_streak": row["longest_loss_streak"],
+            "last_match_date": row["last_match_date"].isoformat() if row["last_match_date"] else None,
+        }
+        for rank, row in enumerate(rows, start=1)
+    ]
@@ -0,0 +1,70 @@
+"""
+Worker warm-up - lifespan başında, worker istek kabul etmeden önce çalışır
+
+- warmup_imports: lazy import edilen ağır modüller (pandas ...) önceden yüklenir
+- Bağlantı havuzu (primary + replica'lar) warmup_connections bağlantıyla doldurulur
+- Kayıtlı PreparedStatement'lar bu bağlantılarda PREPARE edilir
+
+Hatalar loglanır ama başlangıcı durdurmaz; ilk istekler eksik kalanı tamamlar.
+"""
+import importlib
+import logging
+import time
+from contextlib import ExitStack
+
+from app.config import get_settings
+from app.services.db import PREPARED_STATEMENTS, engine, replicas
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+
+def _preload_imports() -> list[str]:
+    loaded = []
+    for module in settings.warmup_imports:
+        try:
+            importlib.import_module(module)
+            loaded.append(module)
+        except ImportError as e:
+            logger.warning("Warm-up import failed: %s (%s)", module, e)
+    return loaded
+
+
+def _warm_engine(target_engine, connections: int) -> dict:
+    """Havuzdan aynı anda `connections` bağlantı aç, statement'ları hazırla, geri bırak"""
+    opened = 0
+    prepared = 0
+    with ExitStack() as stack:
+        for _ in range(connections):
+            conn = stack.enter_context(target_engine.connect())
+            opened += 1
+            if not settings.db_prepared_statements:
+                continue
+            for statement in PREPARED_STATEMENTS.values():
+                try:
+                    statement.prepare(conn)
+                    prepared += 1
+                except Exception as e:
+                    conn.rollback()
+                    logger.warning("Warm-up PREPARE failed for %s: %s", statement.name, e)
+            conn.rollback()
+    return {"connections": opened, "prepared": prepared}
+
+
+def warm_up() -> dict:
+    """Senkron warm-up; lifespan'de asyncio.to_thread ile çağrılır"""
+    started = time.perf_counter()
+    result = {"imports": _preload_imports(), "engines": {}}
+
+    connections = min(settings.warmup_connections, settings.db_pool_size)
+    targets = [("primary", engine)] + [(f"replica:{replica.host}", replica.engine) for replica in replicas]
+    for name, target_engine in targets:
+        try:
+            result["engines"][name] = _warm_engine(target_engine, connections)
+        except Exception as e:
+            result["engines"][name] = {"error": str(e)}
+            logger.warning("Warm-up failed for %s: %s", name, e)
+
+    result["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 1)
+    logger.info("Warm-up done in %.0fms: %s", result["elapsed_ms"], result)
+    return result
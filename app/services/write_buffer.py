@@ -0,0 +1,125 @@
+"""
+Write-behind buffer servisi - küçük yazmaları toplayıp toplu flush eder
+
+İstek yolu kaydı kuyruğa koyar ve hemen döner; arka plandaki flush task'ı
+kayıtları batch boyutuna veya zaman eşiğine ulaşınca tek transaction'da
+yazar. Kuyruk sınırlıdır: dolduğunda put() bekler (backpressure).
+Uygulama kapanırken kuyruktaki her şey flush edilir.
+"""
+import asyncio
+import logging
+import time
+from typing import Callable
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+_buffers: list["WriteBuffer"] = []
+
+# Kuyruğa konan durma işareti - önündeki tüm kayıtlar flush edildikten sonra okunur
+_STOP = object()
+
+
+class WriteBuffer:
+    """Sınırlı kuyruk + boyut/zaman eşikli toplu flush"""
+
+    def __init__(self, name: str, flush_fn: Callable[[list], int | None]):
+        """flush_fn batch'i yazar; tek tek denemede düşen kayıt sayısını döndürür (None = 0)"""
+        settings = get_settings()
+        self.name = name
+        self.flush_fn = flush_fn
+        self.enabled = settings.write_buffer_enabled
+        self.max_batch = settings.write_buffer_max_batch
+        self.flush_interval = settings.write_buffer_flush_interval_ms / 1000
+        self.max_queue = settings.write_buffer_max_queue
+
+        self._queue: asyncio.Queue | None = None
+        self._task: asyncio.Task | None = None
+        self._stats = {"queued": 0, "flushed": 0, "batches": 0, "failed": 0}
+
+        _buffers.append(self)
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def put(self, item) -> None:
+        """Kaydı kuyruğa ekle - kuyruk doluysa yer açılana kadar bekler"""
+        await self._queue.put(item)
+        self._stats["queued"] += 1
+
+    async def start(self) -> None:
+        if self.running:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_queue)
+        self._task = asyncio.create_task(self._run(), name=f"write-buffer-{self.name}")
+
+    async def stop(self) -> None:
+        """Flush task'ına durma işareti gönder; kuyrukta kalanlar yazıldıktan sonra döner"""
+        if not self.running:
+            return
+        await self._queue.put(_STOP)
+        await self._task
+
+    async def _run(self) -> None:
+        while True:
+            item = await self._queue.get()
+            if item is _STOP:
+                return
+            batch = [item]
+            deadline = time.monotonic() + self.flush_interval
+            stopping = False
+
+            while len(batch) < self.max_batch:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+
+            await self._flush(batch)
+            if stopping:
+                return
+
+    async def _flush(self, batch: list) -> None:
+        try:
+            failed = await asyncio.to_thread(self.flush_fn, batch) or 0
+            self._stats["flushed"] += len(batch) - failed
+            self._stats["failed"] += failed
+            self._stats["batches"] += 1
+        except Exception as e:
+            self._stats["failed"] += len(batch)
+            logger.error("Write buffer %s flush error (%d kayıt): %s", self.name, len(batch), e)
+
+    def stats(self) -> dict:
+        return {
+            "name": self.name,
+            "enabled": self.enabled,
+            "running": self.running,
+            "pending": self._queue.qsize() if self._queue else 0,
+            **self._stats,
+        }
+
+
+async def start_buffers() -> None:
+    """Aktif buffer'ları başlat (lifespan startup)"""
+    for buffer in _buffers:
+        if buffer.enabled:
+            await buffer.start()
+
+
+async def stop_buffers() -> None:
+    """Tüm buffer'ları durdur ve flush et (lifespan shutdown)"""
+    for buffer in _buffers:
+        await buffer.stop()
+
+
+def buffer_stats() -> list[dict]:
+    return [buffer.stats() for buffer in _buffers]
@@ -0,0 +1,99 @@
+"""
+match_parser mikro benchmark'ı - payload corpus'u üzerinde parse hızı (maç/sn)
+
+DB gerekmez. Corpus: benchmarks/payloads/*.json (kayıtlı FotMob payload'ları
+veya `python -m benchmarks.fixtures` çıktısı); klasör yoksa sentetik üretilir.
+
+Kullanım:
+    python -m benchmarks.bench_parsers
+    python -m benchmarks.bench_parsers --corpus benchmarks/payloads --json parsers_before.json
+    python -m benchmarks.bench_parsers --compare parsers_before.json
+"""
+import argparse
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+from app.services import match_parser
+from benchmarks.fixtures import load_corpus
+
+
+def _home_away_ids(match_data: dict) -> tuple:
+    lineup = match_data.get('content', {}).get('lineup', {})
+    return lineup.get('homeTeam', {}).get('id'), lineup.get('awayTeam', {}).get('id')
+
+
+def _parse_all(match_data: dict) -> None:
+    match_parser.parse_match_round(match_data.get('general', {}).get('matchRound'))
+    match_parser.extract_match_rows(match_data, *_home_away_ids(match_data))
+
+
+CASES = {
+    "parse_match_round": lambda m: match_parser.parse_match_round(m.get('general', {}).get('matchRound')),
+    "parse_match_stats": match_parser.parse_match_stats,
+    "parse_match_advanced_stats": match_parser.parse_match_advanced_stats,
+    "parse_match_period_stats": match_parser.parse_match_period_stats,
+    "parse_match_player_stats": lambda m: match_parser.parse_match_player_stats(m, *_home_away_ids(m)),
+    "all": _parse_all,
+}
+
+
+def bench(fn, corpus: list, rounds: int, min_time: float) -> dict:
+    """Corpus'u en az min_time sürecek kadar tekrar ederek round başına maç/sn"""
+    # Isınma + iterasyon sayısını kalibre et
+    started = time.perf_counter()
+    for match_data in corpus:
+        fn(match_data)
+    one_pass = max(time.perf_counter() - started, 1e-9)
+    passes = max(1, int(min_time / one_pass))
+
+    rates = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        for _ in range(passes):
+            for match_data in corpus:
+                fn(match_data)
+        elapsed = time.perf_counter() - started
+        rates.append(passes * len(corpus) / elapsed)
+
+    return {
+        "matches_per_sec": round(statistics.median(rates), 1),
+        "min": round(min(rates), 1),
+        "max": round(max(rates), 1),
+        "us_per_match": round(1e6 / statistics.median(rates), 2),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="match_parser benchmark")
+    parser.add_argument("--corpus", type=Path, default=Path("benchmarks/payloads"))
+    parser.add_argument("--count", type=int, default=50, help="Corpus yoksa üretilecek payload sayısı")
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--min-time", type=float, default=0.5, help="Round başına minimum süre (sn)")
+    parser.add_argument("--case", action="append", choices=list(CASES))
+    parser.add_argument("--json", help="Sonuçları bu dosyaya yaz")
+    parser.add_argument("--compare", help="Önceki --json çıktısıyla karşılaştır")
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.corpus, args.count)
+    baseline = json.loads(Path(args.compare).read_text())["results"] if args.compare else {}
+
+    results = {}
+    print(f"corpus: {len(corpus)} maç")
+    print(f"{'case':30} {'maç/sn':>12} {'µs/maç':>10} {'fark':>8}")
+    for name in args.case or list(CASES):
+        results[name] = bench(CASES[name], corpus, args.rounds, args.min_time)
+        diff = ""
+        if name in baseline:
+            diff = f"{results[name]['matches_per_sec'] / baseline[name]['matches_per_sec']:.2f}x"
+        print(f"{name:30} {results[name]['matches_per_sec']:>12} {results[name]['us_per_match']:>10} {diff:>8}")
+
+    if args.json:
+        Path(args.json).write_text(json.dumps({"corpus_size": len(corpus), "results": results}, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
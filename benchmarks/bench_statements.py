@@ -0,0 +1,159 @@
+"""
+Sık sorgular için statement benchmark'ı - text() / önbellekli text() / PREPARE karşılaştırması
+
+Her case aynı bağlantıda üç modda çalıştırılır:
+    text      her çağrıda yeni text() (eski yol: SQL her seferinde derlenir ve sunucuda parse edilir)
+    cached    önbellekli text() nesnesi (client tarafı derleme atlanır)
+    prepared  PreparedStatement (EXECUTE; sunucuda parse/analyze da atlanır)
+
+Çağrı başına süre ikiye ayrılır: driver (cursor.execute + fetch, sunucu dahil) ve
+client (SQLAlchemy derleme/bind + sonuç satırları). Sunucu planlama süresi
+EXPLAIN (ANALYZE, SUMMARY) çıktısındaki "Planning Time" ile ölçülür.
+
+Seed edilmiş benchmark veritabanı gerekir (bkz. benchmarks/seed.py).
+
+Kullanım:
+    python -m benchmarks.bench_statements --dsn postgresql://postgres@localhost/greydb_bench
+    python -m benchmarks.bench_statements --dsn ... --iterations 2000 --json statements.json
+"""
+import argparse
+import json
+import os
+import re
+import sys
+import time
+from pathlib import Path
+
+from benchmarks.seed import CONTENT_TYPES, LEAGUE_ID_BASE, team_id
+
+MODES = ("text", "cached", "prepared")
+
+_PLANNING_TIME = re.compile(r"Planning Time: ([\d.]+) ms")
+
+
+def _cases() -> dict:
+    """case adı -> (PreparedStatement, parametreler)"""
+    from app.routers.predictions import PREDICTION_BY_ID
+    from app.services.feedback import COUNTS_STATEMENT
+    from app.services.stats import FORM_STATEMENTS, H2H_HOME_STATEMENT, H2H_STATEMENT
+
+    return {
+        "form_overall": (FORM_STATEMENTS[("overall", False)], {"team_id": team_id(1, 1), "limit": 5}),
+        "form_league": (
+            FORM_STATEMENTS[("league", True)],
+            {"team_id": team_id(1, 1), "league_id": LEAGUE_ID_BASE + 1, "limit": 5},
+        ),
+        "h2h": (H2H_STATEMENT, {"team1": team_id(1, 1), "team2": team_id(1, 2), "limit": 10}),
+        "h2h_home": (H2H_HOME_STATEMENT, {"team1": team_id(1, 1), "team2": team_id(1, 2), "limit": 10}),
+        "feedback_counts": (
+            COUNTS_STATEMENT,
+            {"content_types": [CONTENT_TYPES[0]] * 20, "content_ids": [str(i) for i in range(1, 21)]},
+        ),
+        "prediction_by_id": (PREDICTION_BY_ID, {"id": 1}),
+    }
+
+
+class DriverTimer:
+    """cursor event'leriyle driver süresini (sunucu round trip dahil) biriktir"""
+
+    def __init__(self):
+        self.total = 0.0
+        self._started = 0.0
+
+    def before(self, *args):
+        self._started = time.perf_counter()
+
+    def after(self, *args):
+        self.total += time.perf_counter() - self._started
+
+
+def bench_mode(conn, timer: DriverTimer, statement, params: dict, mode: str, iterations: int) -> dict:
+    from sqlalchemy import text
+
+    from app.services.db import _compiled
+
+    if mode == "text":
+        run = lambda: conn.execute(text(statement.sql), params).fetchall()
+    elif mode == "cached":
+        run = lambda: conn.execute(_compiled(statement.sql), params).fetchall()
+    else:
+        run = lambda: statement.execute(conn, params).fetchall()
+
+    # Isınma: PREPARE ve generic plan seçimi (Postgres 5 custom plan sonrası karar verir)
+    for _ in range(10):
+        run()
+
+    timer.total = 0.0
+    started = time.perf_counter()
+    for _ in range(iterations):
+        run()
+    total = time.perf_counter() - started
+
+    return {
+        "us_per_call": round(total / iterations * 1e6, 1),
+        "driver_us": round(timer.total / iterations * 1e6, 1),
+        "client_us": round((total - timer.total) / iterations * 1e6, 1),
+    }
+
+
+def planning_ms(conn, statement, params: dict, prepared: bool, samples: int = 20) -> float:
+    """EXPLAIN (ANALYZE, SUMMARY) planlama süresi ortalaması"""
+    from sqlalchemy import text
+
+    sql = statement.execute_sql if prepared else statement.sql
+    total = 0.0
+    for _ in range(samples):
+        rows = conn.execute(text("EXPLAIN (ANALYZE, SUMMARY) " + sql), params).fetchall()
+        plan = "\n".join(row[0] for row in rows)
+        match = _PLANNING_TIME.search(plan)
+        total += float(match.group(1)) if match else 0.0
+    return round(total / samples, 4)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Prepared statement benchmark")
+    parser.add_argument("--dsn", default=os.environ.get("DATABASE_URL"), help="Benchmark veritabanı")
+    parser.add_argument("--iterations", type=int, default=1000)
+    parser.add_argument("--case", action="append")
+    parser.add_argument("--json", help="Sonuçları bu dosyaya yaz")
+    args = parser.parse_args()
+
+    if not args.dsn:
+        parser.error("--dsn veya DATABASE_URL gerekli")
+
+    # app modülleri engine'i import sırasında settings'ten kurar
+    os.environ["DATABASE_URL"] = args.dsn
+    os.environ["DATABASE_REPLICA_URLS"] = "[]"
+    os.environ["DB_PREPARED_STATEMENTS"] = "true"
+
+    from sqlalchemy import event
+
+    from app.services.db import engine
+
+    cases = _cases()
+    names = args.case or list(cases)
+
+    timer = DriverTimer()
+    event.listen(engine, "before_cursor_execute", timer.before)
+    event.listen(engine, "after_cursor_execute", timer.after)
+
+    results = {}
+    print(f"{'case':18} {'mode':9} {'µs/çağrı':>10} {'driver µs':>10} {'client µs':>10} {'plan ms':>9}")
+    with engine.connect() as conn:
+        for name in names:
+            statement, params = cases[name]
+            results[name] = {}
+            for mode in MODES:
+                row = bench_mode(conn, timer, statement, params, mode, args.iterations)
+                row["plan_ms"] = planning_ms(conn, statement, params, prepared=(mode == "prepared"))
+                results[name][mode] = row
+                print(f"{name:18} {mode:9} {row['us_per_call']:>10} {row['driver_us']:>10} {row['client_us']:>10} {row['plan_ms']:>9}")
+            conn.rollback()
+
+    if args.json:
+        Path(args.json).write_text(json.dumps({"iterations": args.iterations, "results": results}, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
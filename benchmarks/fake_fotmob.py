@@ -0,0 +1,91 @@
+"""
+Sahte FotMob sunucusu - fetch_match_details için /api/matchDetails
+
+Seed edilen benchmark takımlarıyla deterministik, "bitmiş" maç payload'ları
+döner. API'yi FOTMOB_API_URL=http://127.0.0.1:8765/api ile başlatın.
+
+Kullanım:
+    python -m benchmarks.fake_fotmob --port 8765 --latency-ms 80
+"""
+import argparse
+import json
+import time
+from datetime import datetime, timedelta
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from benchmarks.fixtures import make_match_details
+from benchmarks.seed import LEAGUE_ID_BASE, UPCOMING_MATCH_ID_BASE, team_id
+
+
+class _Config:
+    leagues = 5
+    teams = 20
+    latency = 0.0
+
+
+@lru_cache(maxsize=4096)
+def _payload(match_id: int) -> bytes:
+    n = match_id - UPCOMING_MATCH_ID_BASE
+    league = 1 + n % _Config.leagues
+    home = 1 + n % _Config.teams
+    away = 1 + (n + 1 + n // _Config.teams) % _Config.teams
+    if away == home:
+        away = 1 + home % _Config.teams
+    data = make_match_details(
+        match_id,
+        home_team_id=team_id(league, home),
+        away_team_id=team_id(league, away),
+        league_id=LEAGUE_ID_BASE + league,
+        match_date=datetime(2025, 8, 1) + timedelta(days=n % 280, hours=19),
+    )
+    return json.dumps(data).encode()
+
+
+class Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path != "/api/matchDetails":
+            self.send_error(404)
+            return
+        try:
+            match_id = int(parse_qs(url.query)["matchId"][0])
+        except (KeyError, ValueError):
+            self.send_error(400, "matchId gerekli")
+            return
+
+        if _Config.latency:
+            time.sleep(_Config.latency)
+
+        body = _payload(match_id)
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sahte FotMob API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--leagues", type=int, default=5, help="seed.py --leagues ile aynı")
+    parser.add_argument("--teams", type=int, default=20, help="seed.py --teams ile aynı")
+    parser.add_argument("--latency-ms", type=float, default=0, help="Yapay FotMob gecikmesi")
+    args = parser.parse_args()
+
+    _Config.leagues = args.leagues
+    _Config.teams = args.teams
+    _Config.latency = args.latency_ms / 1000
+
+    server = ThreadingHTTPServer((args.host, args.port), Handler)
+    print(f"Sahte FotMob: http://{args.host}:{args.port}/api")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
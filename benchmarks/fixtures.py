@@ -0,0 +1,297 @@
+"""
+Sentetik FotMob matchDetails payload'ları
+
+Benchmark'lar ve sahte FotMob sunucusu için gerçek API yanıtının şeklini
+taklit eden deterministik payload üretir (aynı match_id -> aynı payload).
+match_saver'ın okuduğu tüm bloklar dolu: stats (All/FirstHalf/SecondHalf),
+playerStats, lineup, matchFacts, weather, h2h.
+
+Kayıtlı gerçek payload'lar da kullanılabilir: public.matches.raw_match_details
+kolonundan JSON dosyalarına export edip benchmark'lara --corpus ile verin.
+
+Kullanım:
+    python -m benchmarks.fixtures --out benchmarks/payloads --count 50
+"""
+import argparse
+import json
+import random
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# (key, title, üretici) - değerler FotMob'daki formatlarıyla (string yüzdeler dahil)
+_MATCH_STATS = [
+    ("expected_goals", "Expected goals (xG)", lambda r: f"{r.uniform(0.2, 3.2):.2f}"),
+    ("total_shots", "Total shots", lambda r: r.randint(3, 25)),
+    ("ShotsOnTarget", "Shots on target", lambda r: r.randint(0, 10)),
+    ("BallPossesion", "Ball possession", lambda r: r.randint(30, 70)),
+    ("corners", "Corners", lambda r: r.randint(0, 12)),
+    ("fouls", "Fouls committed", lambda r: r.randint(5, 20)),
+    ("yellow_cards", "Yellow cards", lambda r: r.randint(0, 5)),
+    ("red_cards", "Red cards", lambda r: r.randint(0, 1)),
+    ("expected_goals_open_play", "xG open play", lambda r: f"{r.uniform(0.1, 2.5):.2f}"),
+    ("expected_goals_set_play", "xG set play", lambda r: f"{r.uniform(0.0, 1.0):.2f}"),
+    ("expected_goals_on_target", "xG on target (xGOT)", lambda r: f"{r.uniform(0.0, 2.8):.2f}"),
+    ("blocked_shots", "Blocked shots", lambda r: r.randint(0, 8)),
+    ("ShotsOffTarget", "Shots off target", lambda r: r.randint(0, 10)),
+    ("shots_inside_box", "Shots inside box", lambda r: r.randint(1, 15)),
+    ("shots_outside_box", "Shots outside box", lambda r: r.randint(0, 10)),
+    ("passes", "Passes", lambda r: r.randint(250, 750)),
+    ("accurate_passes", "Accurate passes", lambda r: _with_pct(r, 200, 650)),
+    ("long_balls_accurate", "Long balls", lambda r: _with_pct(r, 10, 40)),
+    ("accurate_crosses", "Crosses", lambda r: _with_pct(r, 2, 12)),
+    ("own_half_passes", "Own half", lambda r: r.randint(80, 300)),
+    ("opposition_half_passes", "Opposition half", lambda r: r.randint(100, 400)),
+    ("touches_opp_box", "Touches in opposition box", lambda r: r.randint(5, 45)),
+    ("matchstats.headers.tackles", "Tackles", lambda r: r.randint(5, 30)),
+    ("interceptions", "Interceptions", lambda r: r.randint(2, 20)),
+    ("shot_blocks", "Blocks", lambda r: r.randint(0, 8)),
+    ("clearances", "Clearances", lambda r: r.randint(5, 40)),
+    ("keeper_saves", "Keeper saves", lambda r: r.randint(0, 8)),
+    ("duel_won", "Duels won", lambda r: r.randint(30, 70)),
+    ("ground_duels_won", "Ground duels won", lambda r: _with_pct(r, 20, 50)),
+    ("aerials_won", "Aerial duels won", lambda r: _with_pct(r, 5, 25)),
+    ("dribbles_succeeded", "Successful dribbles", lambda r: _with_pct(r, 2, 15)),
+    ("Offsides", "Offsides", lambda r: r.randint(0, 6)),
+    ("big_chance", "Big chances", lambda r: r.randint(0, 6)),
+    ("big_chance_missed_title", "Big chances missed", lambda r: r.randint(0, 4)),
+]
+
+# (isim, anahtar, üretici) - oyuncu istatistikleri, match_saver'ın iki isimli fallback'leriyle
+_PLAYER_STATS = [
+    ("FotMob rating", "rating_title", lambda r: round(r.uniform(5.5, 9.0), 1)),
+    ("Minutes played", "minutes_played", lambda r: r.choice([90, 90, 90, 78, 65, 45, 20])),
+    ("Goals", "goals", lambda r: r.choice([0, 0, 0, 0, 1, 2])),
+    ("Assists", "assists", lambda r: r.choice([0, 0, 0, 1])),
+    ("Expected goals (xG)", "expected_goals", lambda r: round(r.uniform(0, 0.9), 2)),
+    ("Expected assists (xA)", "expected_assists", lambda r: round(r.uniform(0, 0.6), 2)),
+    ("Total shots", "total_shots", lambda r: r.randint(0, 5)),
+    ("Shots on target", "ShotsOnTarget", lambda r: r.randint(0, 3)),
+    ("Touches", "touches", lambda r: r.randint(15, 110)),
+    ("Key passes", "key_passes", lambda r: r.randint(0, 5)),
+    ("Tackles", "tackles", lambda r: r.randint(0, 6)),
+    ("Interceptions", "interceptions", lambda r: r.randint(0, 5)),
+    ("Clearances", "clearances", lambda r: r.randint(0, 8)),
+    ("Duels won", "duels_won", lambda r: r.randint(0, 10)),
+    ("Duels lost", "duels_lost", lambda r: r.randint(0, 10)),
+    ("Fouls", "fouls", lambda r: r.randint(0, 4)),
+    ("Was fouled", "was_fouled", lambda r: r.randint(0, 4)),
+]
+
+_GK_STATS = [
+    ("Saves", "saves", lambda r: r.randint(0, 8)),
+    ("Goals conceded", "goals_conceded", lambda r: r.randint(0, 4)),
+]
+
+_FIRST_NAMES = ["Ali", "Mert", "Kerem", "Arda", "Emre", "Hakan", "Cenk", "Burak", "Okan", "Deniz"]
+_LAST_NAMES = ["Yılmaz", "Kaya", "Demir", "Şahin", "Çelik", "Aydın", "Öztürk", "Arslan", "Doğan", "Kılıç"]
+
+
+def _with_pct(r: random.Random, low: int, high: int) -> str:
+    value = r.randint(low, high)
+    return f"{value} ({r.randint(30, 92)}%)"
+
+
+def _stat_block(r: random.Random, scale: float = 1.0) -> dict:
+    stats = []
+    for key, title, gen in _MATCH_STATS:
+        home, away = gen(r), gen(r)
+        if scale != 1.0 and isinstance(home, int) and key != "BallPossesion":
+            home, away = int(home * scale), int(away * scale)
+        if key == "BallPossesion":
+            away = 100 - home
+        stats.append({"key": key, "title": title, "stats": [home, away], "type": "text"})
+    # FotMob istatistikleri gruplar halinde döner
+    return {"stats": [
+        {"title": "Top stats", "key": "top_stats", "stats": stats[:8]},
+        {"title": "Shots", "key": "shots", "stats": stats[8:15]},
+        {"title": "Passes", "key": "passes", "stats": stats[15:22]},
+        {"title": "Defence", "key": "defence", "stats": stats[22:]},
+    ]}
+
+
+def _player_name(r: random.Random) -> str:
+    return f"{r.choice(_FIRST_NAMES)} {r.choice(_LAST_NAMES)}"
+
+
+def _lineup_player(r: random.Random, player_id: int, position_id: int) -> dict:
+    return {
+        "id": player_id,
+        "name": _player_name(r),
+        "shirtNumber": str(r.randint(1, 99)),
+        "positionId": position_id,
+        "marketValue": r.randint(200, 60000) * 1000,
+        "age": r.randint(18, 36),
+        "performance": {"seasonRating": round(r.uniform(6.0, 8.0), 2)},
+    }
+
+
+def _player_stats(r: random.Random, player: dict, team_id: int, is_goalkeeper: bool) -> dict:
+    stats = {}
+    for name, key, gen in _PLAYER_STATS + (_GK_STATS if is_goalkeeper else []):
+        stats[name] = {"key": key, "stat": {"value": gen(r), "type": "integer"}}
+    total = r.randint(10, 80)
+    stats["Accurate passes"] = {
+        "key": "accurate_passes",
+        "stat": {"value": r.randint(int(total * 0.5), total), "total": total, "type": "fractionWithPercentage"},
+    }
+    return {
+        "id": player["id"],
+        "name": player["name"],
+        "teamId": team_id,
+        "isGoalkeeper": is_goalkeeper,
+        "stats": [
+            {"title": "Top stats", "key": "top_stats", "stats": dict(list(stats.items())[:6])},
+            {"title": "Attack", "key": "attack", "stats": dict(list(stats.items())[6:11])},
+            {"title": "Defence", "key": "defence", "stats": dict(list(stats.items())[11:])},
+        ],
+    }
+
+
+def make_match_details(
+    match_id: int,
+    home_team_id: int | None = None,
+    away_team_id: int | None = None,
+    league_id: int = 71,
+    match_date: datetime | None = None,
+    finished: bool = True,
+) -> dict:
+    """Tek bir maç için FotMob /matchDetails yanıtı üret"""
+    r = random.Random(match_id)
+    home_team_id = home_team_id or r.randint(1000, 9999)
+    away_team_id = away_team_id or r.randint(1000, 9999)
+    match_date = match_date or datetime(2025, 1, 1) + timedelta(days=r.randint(0, 300), hours=r.randint(12, 21))
+    home_score, away_score = r.choice([0, 1, 1, 2, 2, 3]), r.choice([0, 0, 1, 1, 2, 3])
+
+    teams = [
+        {"id": home_team_id, "name": f"Team {home_team_id}", "shortName": f"T{home_team_id % 1000}"},
+        {"id": away_team_id, "name": f"Team {away_team_id}", "shortName": f"T{away_team_id % 1000}"},
+    ]
+
+    lineup = {}
+    player_stats = {}
+    next_player_id = match_id * 100
+    for side, team in zip(("homeTeam", "awayTeam"), teams):
+        positions = [11, 32, 34, 36, 38, 64, 66, 68, 83, 85, 115]
+        starters = []
+        for position_id in positions:
+            next_player_id += 1
+            player = _lineup_player(r, next_player_id, position_id)
+            starters.append(player)
+            player_stats[str(player["id"])] = _player_stats(r, player, team["id"], position_id == 11)
+        subs = []
+        for _ in range(5):
+            next_player_id += 1
+            subs.append(_lineup_player(r, next_player_id, r.choice([34, 66, 85])))
+        unavailable = [
+            {"id": next_player_id + i + 1, "name": _player_name(r),
+             "injuryStatus": r.choice(["Injured", "Doubtful"]), "reason": "Injury"}
+            for i in range(r.randint(0, 3))
+        ]
+        next_player_id += 10
+        lineup[side] = {
+            "id": team["id"],
+            "name": team["name"],
+            "formation": r.choice(["4-3-3", "4-2-3-1", "3-5-2", "4-4-2"]),
+            "starters": starters,
+            "subs": subs,
+            "unavailable": unavailable,
+        }
+
+    events = []
+    for is_home, goals in ((True, home_score), (False, away_score)):
+        for _ in range(goals):
+            events.append({
+                "type": "Goal", "isHome": is_home, "time": r.randint(1, 90),
+                "fullName": _player_name(r), "assistStr": f"assist by {_player_name(r)}",
+                "ownGoal": None, "goalDescription": r.choice(["", "Penalty"]),
+            })
+    for _ in range(r.randint(1, 6)):
+        events.append({
+            "type": "Card", "card": r.choice(["Yellow", "Yellow", "Red"]),
+            "isHome": r.random() < 0.5, "time": r.randint(1, 90), "fullName": _player_name(r),
+        })
+    for _ in range(r.randint(3, 10)):
+        events.append({
+            "type": "Substitution", "isHome": r.random() < 0.5, "time": r.randint(46, 90),
+            "swap": [{"name": _player_name(r)}, {"name": _player_name(r)}],
+        })
+    events.append({"type": "AddedTime", "time": 90, "minutesAddedStr": "+4"})
+    events.sort(key=lambda e: e["time"])
+
+    h2h_matches = [{"homeScore": r.randint(0, 3), "awayScore": r.randint(0, 3)} for _ in range(r.randint(0, 10))]
+    h2h_summary = [
+        sum(1 for m in h2h_matches if m["homeScore"] > m["awayScore"]),
+        sum(1 for m in h2h_matches if m["homeScore"] == m["awayScore"]),
+        sum(1 for m in h2h_matches if m["homeScore"] < m["awayScore"]),
+    ]
+
+    return {
+        "general": {
+            "matchId": str(match_id),
+            "matchRound": str(r.randint(1, 38)),
+            "leagueId": league_id,
+            "parentLeagueId": league_id,
+            "leagueName": f"League {league_id}",
+            "leagueRoundName": f"Round {r.randint(1, 38)}",
+            "countryCode": "TUR",
+            "homeTeam": teams[0],
+            "awayTeam": teams[1],
+            "matchTimeUTCDate": match_date.strftime("%Y-%m-%dT%H:%M:%S.000Z"),
+            "finished": finished,
+        },
+        "header": {
+            "teams": [
+                {**teams[0], "score": home_score if finished else None},
+                {**teams[1], "score": away_score if finished else None},
+            ],
+            "status": {"finished": finished, "started": finished},
+        },
+        "content": {
+            "stats": {"Periods": {
+                "All": _stat_block(r),
+                "FirstHalf": _stat_block(r, 0.5),
+                "SecondHalf": _stat_block(r, 0.5),
+            }},
+            "playerStats": player_stats,
+            "lineup": lineup,
+            "matchFacts": {
+                "infoBox": {
+                    "Stadium": {"name": f"Stadium {home_team_id}", "lat": 41.0, "long": 29.0, "capacity": 50000},
+                    "Referee": {"text": _player_name(r), "country": "Turkey"},
+                    "Attendance": f"{r.randint(5, 52)},{r.randint(100, 999)}",
+                },
+                "events": {"events": events},
+            },
+            "weather": {"condition": r.choice(["Clear", "Rain", "Cloudy"]), "temp": r.randint(-2, 32)},
+            "h2h": {"summary": h2h_summary, "matches": h2h_matches},
+        },
+    }
+
+
+def write_corpus(out_dir: Path, count: int, start_id: int = 4_000_000) -> list[Path]:
+    """count adet payload'ı out_dir altına <match_id>.json olarak yaz"""
+    out_dir.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for match_id in range(start_id, start_id + count):
+        path = out_dir / f"{match_id}.json"
+        path.write_text(json.dumps(make_match_details(match_id), ensure_ascii=False))
+        paths.append(path)
+    return paths
+
+
+def load_corpus(corpus_dir: Path | None, count: int = 50) -> list[dict]:
+    """Klasördeki *.json payload'ları yükle; klasör yoksa sentetik üret"""
+    if corpus_dir and corpus_dir.exists():
+        payloads = [json.loads(p.read_text()) for p in sorted(corpus_dir.glob("*.json"))]
+        if payloads:
+            return payloads
+    return [make_match_details(match_id) for match_id in range(4_000_000, 4_000_000 + count)]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Sentetik FotMob payload corpus'u üret")
+    parser.add_argument("--out", type=Path, default=Path("benchmarks/payloads"))
+    parser.add_argument("--count", type=int, default=50)
+    args = parser.parse_args()
+    written = write_corpus(args.out, args.count)
+    print(f"{len(written)} payload yazıldı: {args.out}")
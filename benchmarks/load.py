@@ -0,0 +1,217 @@
+"""
+Scriptli yük üreteci - sıcak endpoint'ler için gecikme ve throughput raporu
+
+Her senaryo sırayla --duration saniye boyunca --concurrency eşzamanlı
+istemciyle çalışır; endpoint başına p50/p95/p99 gecikme ve istek/sn raporlanır.
+ID'ler benchmarks/seed.py'nin ürettiği aralıklardan seçilir; dağılım
+"büyük maç" trafiğini taklit etmek için birkaç sıcak takıma ağırlıklıdır.
+
+Kurulum (ayrı terminallerde):
+    python -m benchmarks.seed --dsn postgresql://postgres@localhost/greydb_bench --reset
+    python -m benchmarks.fake_fotmob --port 8765
+    DATABASE_URL=postgresql://postgres@localhost/greydb_bench \\
+    FOTMOB_API_URL=http://127.0.0.1:8765/api FOTMOB_REQUEST_DELAY=0 \\
+        uvicorn app.main:app --port 8000 --workers 2
+
+Çalıştırma:
+    python -m benchmarks.load --base-url http://127.0.0.1:8000 --duration 20 --concurrency 32
+    python -m benchmarks.load --scenario form --scenario h2h --json bench_output.json
+"""
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from dataclasses import dataclass, field
+
+import httpx
+
+from benchmarks.seed import CONTENT_TYPES, team_id
+
+
+@dataclass
+class EndpointStats:
+    latencies: list = field(default_factory=list)
+    errors: int = 0
+    status_codes: dict = field(default_factory=dict)
+
+
+def percentile(sorted_values: list, pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+class Workload:
+    """Seed veri setine uygun rastgele istek üretici"""
+
+    def __init__(self, args):
+        self.rng = random.Random(args.seed)
+        self.leagues = args.leagues
+        self.teams = args.teams
+        self.users = args.users
+        self.contents = args.contents
+        # Büyük maç trafiği: isteklerin çoğu birkaç sıcak takıma gider
+        self.hot_teams = [team_id(1, 1), team_id(1, 2), team_id(1, 3), team_id(1, 4)]
+        self.hot_ratio = args.hot_ratio
+
+    def team(self) -> int:
+        if self.rng.random() < self.hot_ratio:
+            return self.rng.choice(self.hot_teams)
+        return team_id(self.rng.randint(1, self.leagues), self.rng.randint(1, self.teams))
+
+    def pair(self) -> tuple[int, int]:
+        if self.rng.random() < self.hot_ratio:
+            return self.hot_teams[0], self.hot_teams[1]
+        league = self.rng.randint(1, self.leagues)
+        home, away = self.rng.sample(range(1, self.teams + 1), 2)
+        return team_id(league, home), team_id(league, away)
+
+    def user(self) -> str:
+        return f"bench-user-{self.rng.randint(1, self.users)}"
+
+    def content_ids(self, n: int) -> list[str]:
+        return [str(self.rng.randint(1, self.contents)) for _ in range(n)]
+
+
+def _scenarios(w: Workload) -> dict:
+    """senaryo adı -> (endpoint etiketi, istek üretici) listesi"""
+    return {
+        "form": [
+            ("GET /api/form/{id}", lambda: ("GET", f"/api/form/{w.team()}", {"params": {"limit": 5}})),
+            ("GET /api/form/{id}/home", lambda: ("GET", f"/api/form/{w.team()}/home", {})),
+        ],
+        "h2h": [
+            ("GET /api/h2h/{t1}/{t2}", lambda: ("GET", "/api/h2h/{}/{}".format(*w.pair()), {})),
+        ],
+        "coupons": [
+            ("GET /api/coupons", lambda: ("GET", "/api/coupons", {"params": {"exclude_finished": "false", "limit": 20}})),
+            ("POST /api/coupons", lambda: ("POST", "/api/coupons", {"json": {
+                "type": "banko", "total_odds": 3.5, "status": "draft", "created_by_email": "bench@bench.local",
+                "matches": [{"home_team": "A", "away_team": "B", "prediction": "1", "odds": 1.8}],
+            }})),
+        ],
+        "feedback": [
+            ("POST /api/feedback", lambda: ("POST", "/api/feedback", {"json": {
+                "user_id": w.user(), "content_type": w.rng.choice(CONTENT_TYPES),
+                "content_id": w.content_ids(1)[0], "feedback_type": w.rng.choice(["like", "dislike"]),
+            }})),
+            ("GET /api/feedback/bulk-counts/{type}", lambda: ("GET", "/api/feedback/bulk-counts/prediction", {
+                "params": {"content_ids": ",".join(w.content_ids(20)), "user_id": w.user()},
+            })),
+            ("POST /api/feedback/bulk-counts", lambda: ("POST", "/api/feedback/bulk-counts", {"json": {
+                "items": {content_type: w.content_ids(10) for content_type in CONTENT_TYPES},
+                "user_id": w.user(),
+            }})),
+        ],
+        "process-finished": [
+            ("POST /api/match-data/process-finished", lambda: ("POST", "/api/match-data/process-finished", {
+                "params": {"limit_per_league": 2},
+            })),
+        ],
+    }
+
+
+# Ingest senaryosu veri tüketir ve sıralı çalışmalı
+SERIAL_SCENARIOS = {"process-finished"}
+
+
+async def _worker(client, requests, stats: dict, deadline: float, rng: random.Random):
+    while time.perf_counter() < deadline:
+        label, make = rng.choice(requests)
+        method, path, kwargs = make()
+        endpoint = stats.setdefault(label, EndpointStats())
+        started = time.perf_counter()
+        try:
+            response = await client.request(method, path, **kwargs)
+            elapsed = time.perf_counter() - started
+            endpoint.status_codes[response.status_code] = endpoint.status_codes.get(response.status_code, 0) + 1
+            if response.status_code >= 500:
+                endpoint.errors += 1
+            else:
+                endpoint.latencies.append(elapsed)
+        except httpx.HTTPError:
+            endpoint.errors += 1
+
+
+async def run_scenario(base_url: str, requests, duration: float, concurrency: int, seed: int) -> dict:
+    stats: dict = {}
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, timeout=60.0, limits=limits) as client:
+        deadline = time.perf_counter() + duration
+        await asyncio.gather(*[
+            _worker(client, requests, stats, deadline, random.Random(seed + i))
+            for i in range(concurrency)
+        ])
+    return stats
+
+
+def summarize(label: str, endpoint: EndpointStats, duration: float) -> dict:
+    latencies = sorted(endpoint.latencies)
+    ms = lambda v: round(v * 1000, 2)
+    return {
+        "endpoint": label,
+        "requests": len(latencies) + endpoint.errors,
+        "errors": endpoint.errors,
+        "rps": round(len(latencies) / duration, 1),
+        "p50_ms": ms(percentile(latencies, 50)),
+        "p95_ms": ms(percentile(latencies, 95)),
+        "p99_ms": ms(percentile(latencies, 99)),
+        "max_ms": ms(latencies[-1]) if latencies else 0.0,
+        "status_codes": {str(k): v for k, v in sorted(endpoint.status_codes.items())},
+    }
+
+
+def print_report(rows: list[dict]) -> None:
+    header = f"{'endpoint':45} {'req':>7} {'err':>5} {'rps':>8} {'p50':>8} {'p95':>8} {'p99':>8} {'max':>8}"
+    print(header)
+    print("-" * len(header))
+    for row in rows:
+        print(f"{row['endpoint']:45} {row['requests']:>7} {row['errors']:>5} {row['rps']:>8} "
+              f"{row['p50_ms']:>8} {row['p95_ms']:>8} {row['p99_ms']:>8} {row['max_ms']:>8}")
+    print("(gecikmeler ms)")
+
+
+async def main_async(args) -> list[dict]:
+    workload = Workload(args)
+    scenarios = _scenarios(workload)
+    selected = args.scenario or list(scenarios)
+
+    rows = []
+    for name in selected:
+        if name not in scenarios:
+            raise SystemExit(f"Bilinmeyen senaryo: {name} (seçenekler: {', '.join(scenarios)})")
+        concurrency = 1 if name in SERIAL_SCENARIOS else args.concurrency
+        print(f"> {name}: {args.duration}s, concurrency={concurrency}", file=sys.stderr)
+        stats = await run_scenario(args.base_url, scenarios[name], args.duration, concurrency, args.seed)
+        rows.extend(summarize(label, endpoint, args.duration) for label, endpoint in stats.items())
+    return rows
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="GreyDB API yük testi")
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--scenario", action="append", help="form, h2h, coupons, feedback, process-finished")
+    parser.add_argument("--duration", type=float, default=15.0, help="Senaryo başına süre (sn)")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--hot-ratio", type=float, default=0.7, help="Sıcak takımlara giden istek oranı")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--leagues", type=int, default=5, help="seed.py ile aynı")
+    parser.add_argument("--teams", type=int, default=20, help="seed.py ile aynı")
+    parser.add_argument("--users", type=int, default=5000, help="seed.py ile aynı")
+    parser.add_argument("--contents", type=int, default=500, help="seed.py ile aynı")
+    parser.add_argument("--json", help="Sonuçları JSON olarak bu dosyaya yaz")
+    args = parser.parse_args()
+
+    rows = asyncio.run(main_async(args))
+    print_report(rows)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"args": vars(args), "results": rows}, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
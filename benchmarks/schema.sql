@@ -0,0 +1,383 @@
+-- Benchmark fixture şeması
+-- Production DDL DEĞİLDİR: API'nin okuduğu/yazdığı tablo ve view'ların
+-- kolon düzeyinde uyumlu bir kopyası. Sadece benchmark veritabanında kullanın
+-- (benchmarks/seed.py). API'nin kendi tabloları migrations/ altından gelir.
+
+CREATE SCHEMA IF NOT EXISTS greydb;
+
+-- ============================================================
+-- greydb: referans veriler ve içerik
+-- ============================================================
+
+CREATE TABLE IF NOT EXISTS greydb.leagues (
+    id      INTEGER PRIMARY KEY,  -- FotMob league ID
+    name    TEXT NOT NULL,
+    country TEXT
+);
+
+CREATE TABLE IF NOT EXISTS greydb.teams (
+    fotmob_id  INTEGER PRIMARY KEY,
+    name       TEXT NOT NULL,
+    short_name TEXT
+);
+
+CREATE TABLE IF NOT EXISTS greydb.matches (
+    fotmob_id        BIGINT PRIMARY KEY,
+    league_fotmob_id INTEGER NOT NULL,
+    league_name      TEXT,
+    season           TEXT,
+    match_date       TIMESTAMP NOT NULL,
+    home_fotmob_id   INTEGER NOT NULL,
+    away_fotmob_id   INTEGER NOT NULL,
+    home_team        TEXT,
+    away_team        TEXT,
+    home_score       INTEGER,
+    away_score       INTEGER,
+    status           TEXT NOT NULL DEFAULT 'finished',
+    fotmob_url       TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_bench_matches_home ON greydb.matches (home_fotmob_id, match_date DESC);
+CREATE INDEX IF NOT EXISTS idx_bench_matches_away ON greydb.matches (away_fotmob_id, match_date DESC);
+
+CREATE TABLE IF NOT EXISTS greydb.feedbacks (
+    id            SERIAL PRIMARY KEY,
+    user_id       TEXT NOT NULL,
+    content_type  VARCHAR(50) NOT NULL,
+    content_id    VARCHAR(100) NOT NULL,
+    feedback_type VARCHAR(20) NOT NULL,
+    created_at    TIMESTAMP NOT NULL DEFAULT NOW()
+);
+CREATE INDEX IF NOT EXISTS idx_bench_feedbacks_content ON greydb.feedbacks (content_type, content_id);
+
+CREATE TABLE IF NOT EXISTS greydb.predictions (
+    id                  SERIAL PRIMARY KEY,
+    home_team           TEXT NOT NULL,
+    away_team           TEXT NOT NULL,
+    league              TEXT NOT NULL,
+    match_date          TIMESTAMP NOT NULL,
+    home_team_fotmob_id INTEGER,
+    away_team_fotmob_id INTEGER,
+    match_fotmob_id     BIGINT,
+    fotmob_url          TEXT,
+    market_name         TEXT NOT NULL,
+    pick                TEXT NOT NULL,
+    pick_name           TEXT,
+    odds                NUMERIC,
+    probability         NUMERIC,
+    prediction_type     TEXT NOT NULL DEFAULT 'text',
+    content             TEXT,
+    audio_url           TEXT,
+    audio_file_name     TEXT,
+    analysis            TEXT,
+    status              TEXT NOT NULL DEFAULT 'draft',
+    result              TEXT,
+    show_on_homepage    BOOLEAN,
+    created_by_email    TEXT NOT NULL,
+    created_at          TIMESTAMP NOT NULL DEFAULT NOW(),
+    updated_at          TIMESTAMP NOT NULL DEFAULT NOW()
+);
+
+CREATE TABLE IF NOT EXISTS greydb.coupons (
+    id               SERIAL PRIMARY KEY,
+    type             TEXT NOT NULL,
+    image_url        TEXT,
+    winnings         TEXT,
+    total_odds       NUMERIC NOT NULL,
+    status           TEXT NOT NULL DEFAULT 'draft',
+    created_by_email TEXT NOT NULL,
+    created_at       TIMESTAMP NOT NULL DEFAULT NOW(),
+    updated_at       TIMESTAMP NOT NULL DEFAULT NOW()
+);
+
+CREATE TABLE IF NOT EXISTS greydb.coupon_matches (
+    id            SERIAL PRIMARY KEY,
+    coupon_id     INTEGER NOT NULL REFERENCES greydb.coupons (id) ON DELETE CASCADE,
+    home_team     TEXT NOT NULL,
+    away_team     TEXT NOT NULL,
+    league        TEXT,
+    prediction    TEXT NOT NULL,
+    market_name   TEXT,
+    odds          NUMERIC,
+    match_date    TEXT,
+    prediction_id INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_bench_coupon_matches_coupon ON greydb.coupon_matches (coupon_id);
+
+CREATE TABLE IF NOT EXISTS greydb.skorjin_conversations (
+    id               SERIAL PRIMARY KEY,
+    user_id          TEXT NOT NULL,
+    user_email       TEXT,
+    user_message     TEXT NOT NULL,
+    skorjin_response TEXT NOT NULL,
+    created_at       TIMESTAMP NOT NULL DEFAULT NOW()
+);
+
+CREATE TABLE IF NOT EXISTS greydb.match_comments (
+    id               SERIAL PRIMARY KEY,
+    league           TEXT NOT NULL,
+    home_team        TEXT NOT NULL,
+    away_team        TEXT NOT NULL,
+    match_date       TIMESTAMP NOT NULL,
+    audio_url        TEXT,
+    summary          TEXT,
+    status           TEXT NOT NULL DEFAULT 'active',
+    created_at       TIMESTAMP NOT NULL DEFAULT NOW(),
+    created_by_email TEXT
+);
+
+-- ============================================================
+-- greydb: form ve H2H view'ları
+-- ============================================================
+
+CREATE OR REPLACE VIEW greydb.vw_team_matches AS
+SELECT
+    m.fotmob_id AS match_fotmob_id, m.match_date, m.league_fotmob_id, m.league_name, m.season, m.fotmob_url,
+    m.home_fotmob_id AS team_fotmob_id, m.away_team AS opponent, 'home' AS venue,
+    m.home_score AS goals_for, m.away_score AS goals_against
+FROM greydb.matches m
+WHERE m.status = 'finished'
+UNION ALL
+SELECT
+    m.fotmob_id, m.match_date, m.league_fotmob_id, m.league_name, m.season, m.fotmob_url,
+    m.away_fotmob_id, m.home_team, 'away',
+    m.away_score, m.home_score
+FROM greydb.matches m
+WHERE m.status = 'finished';
+
+CREATE OR REPLACE VIEW greydb.vw_team_form_base AS
+SELECT
+    t.*,
+    CASE WHEN goals_for > goals_against THEN 'W' WHEN goals_for = goals_against THEN 'D' ELSE 'L' END AS result,
+    CASE WHEN goals_for > goals_against THEN 3 WHEN goals_for = goals_against THEN 1 ELSE 0 END AS points,
+    goals_for + goals_against AS total_goals,
+    (goals_for > 0 AND goals_against > 0)::int AS btts
+FROM greydb.vw_team_matches t;
+
+CREATE OR REPLACE VIEW greydb.vw_team_overall_form AS
+SELECT b.*, ROW_NUMBER() OVER (PARTITION BY team_fotmob_id ORDER BY match_date DESC) AS match_rank
+FROM greydb.vw_team_form_base b;
+
+CREATE OR REPLACE VIEW greydb.vw_team_home_form AS
+SELECT b.*, ROW_NUMBER() OVER (PARTITION BY team_fotmob_id ORDER BY match_date DESC) AS match_rank
+FROM greydb.vw_team_form_base b
+WHERE venue = 'home';
+
+CREATE OR REPLACE VIEW greydb.vw_team_away_form AS
+SELECT b.*, ROW_NUMBER() OVER (PARTITION BY team_fotmob_id ORDER BY match_date DESC) AS match_rank
+FROM greydb.vw_team_form_base b
+WHERE venue = 'away';
+
+CREATE OR REPLACE VIEW greydb.vw_team_league_form AS
+SELECT b.*, ROW_NUMBER() OVER (PARTITION BY team_fotmob_id, league_fotmob_id ORDER BY match_date DESC) AS match_rank
+FROM greydb.vw_team_form_base b;
+
+CREATE OR REPLACE VIEW greydb.vw_h2h AS
+SELECT
+    m.*,
+    CASE WHEN home_score > away_score THEN 'H' WHEN home_score = away_score THEN 'D' ELSE 'A' END AS result,
+    home_score + away_score AS total_goals,
+    (home_score > 0 AND away_score > 0)::int AS btts
+FROM greydb.matches m
+WHERE m.status = 'finished';
+
+CREATE OR REPLACE VIEW greydb.vw_h2h_home AS
+SELECT h.*, ROW_NUMBER() OVER (PARTITION BY home_fotmob_id, away_fotmob_id ORDER BY match_date DESC) AS match_rank
+FROM greydb.vw_h2h h;
+
+-- ============================================================
+-- public: match_saver ingest tabloları
+-- ============================================================
+
+CREATE TABLE IF NOT EXISTS public.leagues (
+    id               SERIAL PRIMARY KEY,
+    fotmob_league_id INTEGER UNIQUE NOT NULL,
+    name             TEXT,
+    country          TEXT,
+    country_code     TEXT,
+    season           TEXT
+);
+
+CREATE TABLE IF NOT EXISTS public.teams (
+    id             SERIAL PRIMARY KEY,
+    fotmob_team_id INTEGER UNIQUE NOT NULL,
+    name           TEXT,
+    short_name     TEXT,
+    league_id      INTEGER
+);
+
+CREATE TABLE IF NOT EXISTS public.matches (
+    id                SERIAL PRIMARY KEY,
+    fotmob_match_id   BIGINT UNIQUE NOT NULL,
+    home_team_id      INTEGER,
+    away_team_id      INTEGER,
+    league_id         INTEGER,
+    round             INTEGER,
+    match_date        TIMESTAMPTZ,
+    home_score        INTEGER,
+    away_score        INTEGER,
+    finished          BOOLEAN,
+    raw_match_details JSONB,
+    created_at        TIMESTAMP NOT NULL DEFAULT NOW(),
+    updated_at        TIMESTAMP NOT NULL DEFAULT NOW()
+);
+
+CREATE TABLE IF NOT EXISTS public.match_stats (
+    match_id              INTEGER PRIMARY KEY,
+    home_xg               NUMERIC, away_xg NUMERIC,
+    home_shots            INTEGER, away_shots INTEGER,
+    home_shots_on_target  INTEGER, away_shots_on_target INTEGER,
+    home_possession       NUMERIC, away_possession NUMERIC,
+    home_corners          INTEGER, away_corners INTEGER,
+    home_fouls            INTEGER, away_fouls INTEGER,
+    home_yellow_cards     INTEGER, away_yellow_cards INTEGER,
+    home_red_cards        INTEGER, away_red_cards INTEGER
+);
+
+CREATE TABLE IF NOT EXISTS public.match_advanced_stats (
+    match_id INTEGER PRIMARY KEY,
+    home_open_play_xg NUMERIC, away_open_play_xg NUMERIC,
+    home_set_piece_xg NUMERIC, away_set_piece_xg NUMERIC,
+    home_xgot NUMERIC, away_xgot NUMERIC,
+    home_shots_blocked NUMERIC, away_shots_blocked NUMERIC,
+    home_shots_off_target NUMERIC, away_shots_off_target NUMERIC,
+    home_shots_inside_box NUMERIC, away_shots_inside_box NUMERIC,
+    home_shots_outside_box NUMERIC, away_shots_outside_box NUMERIC,
+    home_total_passes NUMERIC, away_total_passes NUMERIC,
+    home_pass_accuracy NUMERIC, away_pass_accuracy NUMERIC,
+    home_long_passes NUMERIC, away_long_passes NUMERIC,
+    home_long_pass_accuracy NUMERIC, away_long_pass_accuracy NUMERIC,
+    home_crosses NUMERIC, away_crosses NUMERIC,
+    home_cross_accuracy NUMERIC, away_cross_accuracy NUMERIC,
+    home_passes_own_half NUMERIC, away_passes_own_half NUMERIC,
+    home_passes_opp_half NUMERIC, away_passes_opp_half NUMERIC,
+    home_touches_in_box NUMERIC, away_touches_in_box NUMERIC,
+    home_tackles NUMERIC, away_tackles NUMERIC,
+    home_interceptions NUMERIC, away_interceptions NUMERIC,
+    home_blocks NUMERIC, away_blocks NUMERIC,
+    home_clearances NUMERIC, away_clearances NUMERIC,
+    home_goalkeeper_saves NUMERIC, away_goalkeeper_saves NUMERIC,
+    home_duels_won NUMERIC, away_duels_won NUMERIC,
+    home_duels_won_pct NUMERIC, away_duels_won_pct NUMERIC,
+    home_aerial_duels_won NUMERIC, away_aerial_duels_won NUMERIC,
+    home_aerial_duels_pct NUMERIC, away_aerial_duels_pct NUMERIC,
+    home_dribbles_successful NUMERIC, away_dribbles_successful NUMERIC,
+    home_dribbles_pct NUMERIC, away_dribbles_pct NUMERIC,
+    home_offsides NUMERIC, away_offsides NUMERIC
+);
+
+CREATE TABLE IF NOT EXISTS public.match_context (
+    match_id          INTEGER PRIMARY KEY,
+    stadium           TEXT,
+    stadium_lat       NUMERIC,
+    stadium_lon       NUMERIC,
+    stadium_capacity  INTEGER,
+    referee           TEXT,
+    referee_country   TEXT,
+    attendance        INTEGER,
+    weather_condition TEXT,
+    weather_temp      NUMERIC
+);
+
+CREATE TABLE IF NOT EXISTS public.match_formations (
+    match_id       INTEGER PRIMARY KEY,
+    home_formation TEXT,
+    away_formation TEXT
+);
+
+CREATE TABLE IF NOT EXISTS public.match_lineups (
+    id           SERIAL PRIMARY KEY,
+    match_id     INTEGER NOT NULL,
+    team_id      INTEGER,
+    player_name  TEXT,
+    shirt_number TEXT,
+    position     TEXT,
+    is_starter   BOOLEAN,
+    market_value NUMERIC,
+    age          INTEGER,
+    rating       NUMERIC
+);
+CREATE INDEX IF NOT EXISTS idx_bench_lineups_match ON public.match_lineups (match_id);
+
+CREATE TABLE IF NOT EXISTS public.match_player_stats (
+    id              SERIAL PRIMARY KEY,
+    match_id        INTEGER NOT NULL,
+    team_id         INTEGER,
+    player_name     TEXT,
+    rating          NUMERIC,
+    minutes_played  INTEGER,
+    position        TEXT,
+    goals           INTEGER,
+    assists         INTEGER,
+    xg              NUMERIC,
+    xa              NUMERIC,
+    total_shots     INTEGER,
+    shots_on_target INTEGER,
+    touches         INTEGER,
+    total_passes    INTEGER,
+    accurate_passes INTEGER,
+    key_passes      INTEGER,
+    tackles         INTEGER,
+    interceptions   INTEGER,
+    clearances      INTEGER,
+    duels_won       INTEGER,
+    duels_lost      INTEGER,
+    fouls_committed INTEGER,
+    fouls_won       INTEGER,
+    saves           INTEGER,
+    goals_conceded  INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_bench_player_stats_match ON public.match_player_stats (match_id);
+
+CREATE TABLE IF NOT EXISTS public.match_events (
+    id          SERIAL PRIMARY KEY,
+    match_id    INTEGER NOT NULL,
+    team_id     INTEGER,
+    event_type  TEXT,
+    minute      INTEGER,
+    added_time  INTEGER,
+    player_name TEXT,
+    assisted_by TEXT,
+    player_in   TEXT,
+    player_out  TEXT,
+    is_own_goal BOOLEAN,
+    is_penalty  BOOLEAN,
+    event_data  JSONB
+);
+CREATE INDEX IF NOT EXISTS idx_bench_events_match ON public.match_events (match_id);
+
+CREATE TABLE IF NOT EXISTS public.player_availability (
+    id          SERIAL PRIMARY KEY,
+    match_id    INTEGER NOT NULL,
+    team_id     INTEGER,
+    player_name TEXT,
+    status      TEXT,
+    reason      TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_bench_availability_match ON public.player_availability (match_id);
+
+CREATE TABLE IF NOT EXISTS public.h2h_stats (
+    id              SERIAL PRIMARY KEY,
+    team1_id        INTEGER,
+    team2_id        INTEGER,
+    total_matches   INTEGER,
+    team1_wins      INTEGER,
+    team2_wins      INTEGER,
+    draws           INTEGER,
+    avg_goals_team1 NUMERIC,
+    avg_goals_team2 NUMERIC
+);
+
+CREATE TABLE IF NOT EXISTS public.upcoming_matches (
+    id              SERIAL PRIMARY KEY,
+    fotmob_match_id BIGINT NOT NULL,
+    match_url       TEXT,
+    match_date      TIMESTAMP NOT NULL,
+    home_team_name  TEXT NOT NULL,
+    away_team_name  TEXT NOT NULL,
+    round           TEXT,
+    league_id       INTEGER NOT NULL,
+    is_processed    BOOLEAN NOT NULL DEFAULT FALSE,
+    updated_at      TIMESTAMP NOT NULL DEFAULT NOW()
+);
+CREATE INDEX IF NOT EXISTS idx_bench_upcoming_unprocessed ON public.upcoming_matches (league_id, match_date)
+    WHERE is_processed = FALSE;
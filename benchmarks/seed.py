@@ -0,0 +1,223 @@
+"""
+Benchmark veritabanını sentetik greydb verisiyle doldur
+
+Sırası: benchmarks/schema.sql (fixture şema) -> sentetik veri -> migrations/*.sql.
+Veri seti deterministiktir (--seed) ve boyutu parametrelerle ayarlanır.
+
+Güvenlik: veritabanı adı "bench" ile bitmiyorsa çalışmaz (--force ile aşılır).
+
+Kullanım:
+    createdb greydb_bench
+    python -m benchmarks.seed --dsn postgresql://postgres@localhost/greydb_bench --reset
+    python -m benchmarks.seed --dsn ... --reset --leagues 8 --teams 20 --seasons 5
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import make_url
+
+ROOT = Path(__file__).resolve().parent.parent
+SCHEMA_FILE = ROOT / "benchmarks" / "schema.sql"
+MIGRATIONS_DIR = ROOT / "migrations"
+
+PUBLIC_TABLES = [
+    "leagues", "teams", "matches", "match_stats", "match_advanced_stats", "match_period_stats", "match_context",
+    "match_formations", "match_lineups", "match_player_stats", "match_events",
+    "player_availability", "h2h_stats", "upcoming_matches",
+]
+
+# Benchmark ID aralıkları - load generator aynı aralıkları kullanır
+LEAGUE_ID_BASE = 1000
+TEAM_ID_BASE = 100_000
+MATCH_ID_BASE = 5_000_000
+UPCOMING_MATCH_ID_BASE = 6_000_000
+CONTENT_TYPES = ("prediction", "coupon", "newsletter")
+
+
+def team_id(league: int, team: int) -> int:
+    """Benchmark takım FotMob ID'si (league, team 1'den başlar)"""
+    return TEAM_ID_BASE + league * 100 + team
+
+
+def _run_sql_file(conn, path: Path) -> None:
+    conn.exec_driver_sql(path.read_text())
+
+
+def reset(conn) -> None:
+    conn.exec_driver_sql("DROP SCHEMA IF EXISTS greydb CASCADE")
+    for table in PUBLIC_TABLES:
+        conn.exec_driver_sql(f"DROP TABLE IF EXISTS public.{table} CASCADE")
+
+
+def seed_data(conn, args) -> None:
+    conn.execute(text("SELECT setseed(:seed)"), {"seed": args.seed})
+
+    conn.execute(text("""
+        INSERT INTO greydb.leagues (id, name, country)
+        SELECT :league_base + l, 'Bench League ' || l, 'Benchland'
+        FROM generate_series(1, :leagues) l
+    """), {"league_base": LEAGUE_ID_BASE, "leagues": args.leagues})
+
+    conn.execute(text("""
+        INSERT INTO greydb.teams (fotmob_id, name, short_name)
+        SELECT :team_base + l * 100 + t, 'Bench Team ' || l || '-' || t, 'B' || l || '-' || t
+        FROM generate_series(1, :leagues) l, generate_series(1, :teams) t
+    """), {"team_base": TEAM_ID_BASE, "leagues": args.leagues, "teams": args.teams})
+
+    # Her lig/sezon için çift devreli lig: her takım çifti bir kez evinde oynar
+    conn.execute(text("""
+        INSERT INTO greydb.matches (
+            fotmob_id, league_fotmob_id, league_name, season, match_date,
+            home_fotmob_id, away_fotmob_id, home_team, away_team,
+            home_score, away_score, status, fotmob_url
+        )
+        SELECT
+            :match_base + ROW_NUMBER() OVER (ORDER BY l, s, h, a),
+            :league_base + l,
+            'Bench League ' || l,
+            (2025 - s) || '/' || (2026 - s),
+            DATE '2025-08-01' - (s * 365) + (((h * 7 + a * 11) % 280) || ' days')::interval + INTERVAL '19 hours',
+            :team_base + l * 100 + h,
+            :team_base + l * 100 + a,
+            'Bench Team ' || l || '-' || h,
+            'Bench Team ' || l || '-' || a,
+            floor(random() * 4)::int,
+            floor(random() * 3.3)::int,
+            'finished',
+            'https://www.fotmob.com/match/bench'
+        FROM generate_series(1, :leagues) l,
+             generate_series(0, :seasons - 1) s,
+             generate_series(1, :teams) h,
+             generate_series(1, :teams) a
+        WHERE h <> a
+    """), {
+        "match_base": MATCH_ID_BASE, "league_base": LEAGUE_ID_BASE, "team_base": TEAM_ID_BASE,
+        "leagues": args.leagues, "teams": args.teams, "seasons": args.seasons,
+    })
+
+    conn.execute(text("""
+        INSERT INTO greydb.predictions (
+            home_team, away_team, league, match_date, home_team_fotmob_id, away_team_fotmob_id,
+            match_fotmob_id, market_name, pick, odds, status, result, show_on_homepage, created_by_email
+        )
+        SELECT
+            m.home_team, m.away_team, m.league_name, m.match_date, m.home_fotmob_id, m.away_fotmob_id,
+            m.fotmob_id, 'Maç Sonucu', (ARRAY['1', 'X', '2'])[1 + floor(random() * 3)::int],
+            round((1.3 + random() * 3)::numeric, 2), 'active',
+            (ARRAY['won', 'lost', 'void', NULL])[1 + floor(random() * 4)::int],
+            random() < 0.2,
+            'tipster' || (1 + floor(random() * 20)::int) || '@bench.local'
+        FROM greydb.matches m
+        ORDER BY m.fotmob_id
+        LIMIT :predictions
+    """), {"predictions": args.predictions})
+
+    conn.execute(text("""
+        INSERT INTO greydb.coupons (type, total_odds, status, created_by_email)
+        SELECT
+            (ARRAY['premium', 'banko', 'populer', 'editor'])[1 + floor(random() * 4)::int],
+            round((2 + random() * 20)::numeric, 2), 'active', 'editor@bench.local'
+        FROM generate_series(1, :coupons)
+    """), {"coupons": args.coupons})
+
+    conn.execute(text("""
+        INSERT INTO greydb.coupon_matches (
+            coupon_id, home_team, away_team, league, prediction, market_name, odds, match_date, prediction_id
+        )
+        SELECT c.id, p.home_team, p.away_team, p.league, p.pick, p.market_name, p.odds,
+               to_char(p.match_date, 'DD') || ' Ara 19:00', p.id
+        FROM greydb.coupons c
+        CROSS JOIN LATERAL (
+            SELECT * FROM greydb.predictions
+            WHERE id > (c.id * 7) % GREATEST(:predictions - 3, 1)
+            ORDER BY id
+            LIMIT 3
+        ) p
+    """), {"predictions": args.predictions})
+
+    conn.execute(text("""
+        INSERT INTO greydb.feedbacks (user_id, content_type, content_id, feedback_type)
+        SELECT DISTINCT ON (user_id, content_type, content_id) user_id, content_type, content_id, feedback_type
+        FROM (
+            SELECT
+                'bench-user-' || (1 + floor(random() * :users)::int) AS user_id,
+                (ARRAY['prediction', 'coupon', 'newsletter'])[1 + floor(random() * 3)::int] AS content_type,
+                (1 + floor(random() * :contents)::int)::text AS content_id,
+                CASE WHEN random() < 0.8 THEN 'like' ELSE 'dislike' END AS feedback_type
+            FROM generate_series(1, :feedbacks)
+        ) f
+    """), {"users": args.users, "contents": args.contents, "feedbacks": args.feedbacks})
+
+    # process-finished için: ingest edilmemiş, tarihi geçmiş maçlar (sahte FotMob bunları "bitti" döner)
+    conn.execute(text("""
+        INSERT INTO public.leagues (fotmob_league_id, name, country, country_code, season)
+        SELECT :league_base + l, 'Bench League ' || l, 'Benchland', 'BEN', '2024/2025'
+        FROM generate_series(1, :leagues) l
+    """), {"league_base": LEAGUE_ID_BASE, "leagues": args.leagues})
+
+    conn.execute(text("""
+        INSERT INTO public.upcoming_matches (
+            fotmob_match_id, match_url, match_date, home_team_name, away_team_name, round, league_id
+        )
+        SELECT
+            :upcoming_base + n,
+            'https://www.fotmob.com/match/' || (:upcoming_base + n),
+            NOW() - ((n % 72) || ' hours')::interval - INTERVAL '3 hours',
+            'Bench Home ' || n,
+            'Bench Away ' || n,
+            (1 + n % 38)::text,
+            l.id
+        FROM generate_series(1, :upcoming) n
+        JOIN public.leagues l ON l.fotmob_league_id = :league_base + 1 + (n % :leagues)
+    """), {"upcoming_base": UPCOMING_MATCH_ID_BASE, "league_base": LEAGUE_ID_BASE,
+           "leagues": args.leagues, "upcoming": args.upcoming})
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark veritabanını seed et")
+    parser.add_argument("--dsn", required=True, help="Benchmark veritabanı (adı 'bench' ile bitmeli)")
+    parser.add_argument("--reset", action="store_true", help="Fixture şemayı silip yeniden oluştur")
+    parser.add_argument("--force", action="store_true", help="Veritabanı adı kontrolünü atla")
+    parser.add_argument("--seed", type=float, default=0.42, help="random() seed'i (-1..1)")
+    parser.add_argument("--leagues", type=int, default=5)
+    parser.add_argument("--teams", type=int, default=20, help="Lig başına takım")
+    parser.add_argument("--seasons", type=int, default=3)
+    parser.add_argument("--predictions", type=int, default=2000)
+    parser.add_argument("--coupons", type=int, default=300)
+    parser.add_argument("--users", type=int, default=5000)
+    parser.add_argument("--contents", type=int, default=500, help="Tip başına içerik sayısı")
+    parser.add_argument("--feedbacks", type=int, default=100_000)
+    parser.add_argument("--upcoming", type=int, default=200, help="process-finished için bekleyen maç")
+    args = parser.parse_args()
+
+    database = make_url(args.dsn).database or ""
+    if not database.endswith("bench") and not args.force:
+        print(f"'{database}' bir benchmark veritabanı gibi görünmüyor (adı 'bench' ile bitmeli). --force?")
+        return 1
+
+    engine = create_engine(args.dsn)
+    started = time.perf_counter()
+    with engine.begin() as conn:
+        if args.reset:
+            reset(conn)
+        _run_sql_file(conn, SCHEMA_FILE)
+        seed_data(conn, args)
+        for migration in sorted(MIGRATIONS_DIR.glob("*.sql")):
+            _run_sql_file(conn, migration)
+        conn.exec_driver_sql("ANALYZE")
+
+    with engine.connect() as conn:
+        counts = {
+            table: conn.exec_driver_sql(f"SELECT COUNT(*) FROM {table}").scalar()
+            for table in ("greydb.matches", "greydb.predictions", "greydb.coupons",
+                          "greydb.feedbacks", "public.upcoming_matches")
+        }
+    print(f"Seed tamamlandı ({time.perf_counter() - started:.1f}s): {counts}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,124 @@
+"""
+Başlangıç süresi ölçümü - `import app.main` ve (opsiyonel) lifespan warm-up
+
+Her tekrar temiz bir Python süreci başlatır (modül cache'i yok), böylece
+ölçüm Railway cold start'ına yakındır. -X importtime çıktısından en pahalı
+modüller listelenir. Medyan --budget-ms'i aşarsa çıkış kodu 1 olur (CI'da kullanılabilir).
+
+Import ölçümü DB gerektirmez (engine bağlantıyı ilk kullanımda açar).
+--lifespan ile warm-up da ölçülür; DATABASE_URL erişilebilir olmalıdır.
+
+Kullanım:
+    python -m benchmarks.startup
+    python -m benchmarks.startup --runs 10 --budget-ms 1500 --json startup.json
+    DATABASE_URL=postgresql://postgres@localhost/greydb_bench python -m benchmarks.startup --lifespan
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Alt süreçte çalışır: import süresi ve startup sonunda yüklü ağır modüller
+_PROBE = """
+import json, sys, time
+started = time.perf_counter()
+import app.main
+imported = time.perf_counter()
+lifespan_ms = None
+if {lifespan!r}:
+    import asyncio
+    async def _startup():
+        async with app.main.app.router.lifespan_context(app.main.app):
+            pass
+    asyncio.run(_startup())
+    lifespan_ms = (time.perf_counter() - imported) * 1000
+print(json.dumps({{
+    "import_ms": (imported - started) * 1000,
+    "lifespan_ms": lifespan_ms,
+    "loaded": [name for name in {heavy!r} if name in sys.modules],
+}}))
+"""
+
+HEAVY_MODULES = ("pandas", "numpy", "httpx")
+
+
+def run_once(lifespan: bool, importtime: bool) -> tuple[dict, str]:
+    cmd = [sys.executable]
+    if importtime:
+        cmd += ["-X", "importtime"]
+    cmd += ["-c", _PROBE.format(lifespan=lifespan, heavy=HEAVY_MODULES)]
+    proc = subprocess.run(cmd, cwd=ROOT, capture_output=True, text=True, env=os.environ.copy())
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr[-2000:])
+    return json.loads(proc.stdout.strip().splitlines()[-1]), proc.stderr
+
+
+def top_imports(importtime_output: str, limit: int) -> list[tuple[str, float]]:
+    """
+    -X importtime çıktısından ('self [us] | cumulative | package') üst seviye paket
+    başına en büyük kümülatif süre (ms): fastapi, sqlalchemy, pandas ...
+    """
+    packages: dict[str, float] = {}
+    for line in importtime_output.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        package = name.strip().split(".")[0]
+        packages[package] = max(packages.get(package, 0.0), int(cumulative) / 1000)
+    return sorted(packages.items(), key=lambda item: item[1], reverse=True)[:limit]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Startup time benchmark")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=2000.0, help="Medyan import(+lifespan) süresi sınırı")
+    parser.add_argument("--lifespan", action="store_true", help="Lifespan warm-up'ı da ölç (DB gerekir)")
+    parser.add_argument("--top", type=int, default=15, help="En pahalı N import")
+    parser.add_argument("--json", help="Sonuçları bu dosyaya yaz")
+    args = parser.parse_args()
+
+    samples = []
+    for _ in range(args.runs):
+        sample, _ = run_once(args.lifespan, importtime=False)
+        samples.append(sample)
+    _, importtime_output = run_once(False, importtime=True)
+
+    import_ms = [sample["import_ms"] for sample in samples]
+    total_ms = [sample["import_ms"] + (sample["lifespan_ms"] or 0.0) for sample in samples]
+    result = {
+        "runs": args.runs,
+        "import_ms": {"median": round(statistics.median(import_ms), 1), "min": round(min(import_ms), 1)},
+        "total_ms": {"median": round(statistics.median(total_ms), 1), "min": round(min(total_ms), 1)},
+        "budget_ms": args.budget_ms,
+        "heavy_modules_loaded": samples[-1]["loaded"],
+        "top_imports": top_imports(importtime_output, args.top),
+    }
+    if args.lifespan:
+        lifespan_ms = [sample["lifespan_ms"] for sample in samples]
+        result["lifespan_ms"] = {"median": round(statistics.median(lifespan_ms), 1), "min": round(min(lifespan_ms), 1)}
+
+    print(f"import app.main: median {result['import_ms']['median']}ms (min {result['import_ms']['min']}ms)")
+    if args.lifespan:
+        print(f"lifespan warm-up: median {result['lifespan_ms']['median']}ms")
+    print(f"toplam: median {result['total_ms']['median']}ms / bütçe {args.budget_ms}ms")
+    print(f"yüklü ağır modüller: {', '.join(result['heavy_modules_loaded']) or '-'}")
+    print("\nen pahalı importlar (kümülatif ms):")
+    for name, ms in result["top_imports"]:
+        print(f"  {name:40} {ms:>8.1f}")
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(result, indent=2))
+
+    if result["total_ms"]["median"] > args.budget_ms:
+        print(f"\nBÜTÇE AŞILDI: {result['total_ms']['median']}ms > {args.budget_ms}ms")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
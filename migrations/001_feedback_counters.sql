@@ -0,0 +1,32 @@
+-- Feedback sayaç tablosu
+-- (content_type, content_id) başına beğeni/beğenmeme sayıları.
+-- Sayım okumaları COUNT(*) yerine primary key lookup olur.
+-- Sayaçlar feedback yazma yolunda aynı transaction içinde güncellenir,
+-- POST /api/feedback/reconcile-counters ile greydb.feedbacks'ten yeniden hesaplanır.
+
+CREATE TABLE IF NOT EXISTS greydb.feedback_counters (
+    content_type VARCHAR(50) NOT NULL,
+    content_id   VARCHAR(100) NOT NULL,
+    likes        INTEGER NOT NULL DEFAULT 0,
+    dislikes     INTEGER NOT NULL DEFAULT 0,
+    updated_at   TIMESTAMP NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (content_type, content_id)
+);
+
+-- Mevcut feedback'lerden ilk doldurma
+INSERT INTO greydb.feedback_counters (content_type, content_id, likes, dislikes)
+SELECT
+    content_type,
+    content_id,
+    COUNT(*) FILTER (WHERE feedback_type = 'like'),
+    COUNT(*) FILTER (WHERE feedback_type = 'dislike')
+FROM greydb.feedbacks
+GROUP BY content_type, content_id
+ON CONFLICT (content_type, content_id) DO UPDATE SET
+    likes = EXCLUDED.likes,
+    dislikes = EXCLUDED.dislikes,
+    updated_at = NOW();
+
+-- Kullanıcı feedback lookup'ları için
+CREATE INDEX IF NOT EXISTS idx_feedbacks_user_content
+    ON greydb.feedbacks (user_id, content_type, content_id);
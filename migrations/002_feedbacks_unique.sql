@@ -0,0 +1,30 @@
+-- Kullanıcı başına içerik başına tek feedback
+-- Çift tıklamalardan kalan tekrar eden satırları temizle (en yenisi kalır),
+-- sonra tek-statement toggle'ın ON CONFLICT hedefi olan unique index'i ekle.
+
+DELETE FROM greydb.feedbacks f
+USING greydb.feedbacks g
+WHERE f.user_id = g.user_id
+  AND f.content_type = g.content_type
+  AND f.content_id = g.content_id
+  AND f.id < g.id;
+
+CREATE UNIQUE INDEX IF NOT EXISTS uq_feedbacks_user_content
+    ON greydb.feedbacks (user_id, content_type, content_id);
+
+-- 001'deki index unique index tarafından karşılanıyor
+DROP INDEX IF EXISTS greydb.idx_feedbacks_user_content;
+
+-- Silinen tekrarlar sonrası sayaçları yeniden hesapla
+INSERT INTO greydb.feedback_counters (content_type, content_id, likes, dislikes)
+SELECT
+    content_type,
+    content_id,
+    COUNT(*) FILTER (WHERE feedback_type = 'like'),
+    COUNT(*) FILTER (WHERE feedback_type = 'dislike')
+FROM greydb.feedbacks
+GROUP BY content_type, content_id
+ON CONFLICT (content_type, content_id) DO UPDATE SET
+    likes = EXCLUDED.likes,
+    dislikes = EXCLUDED.dislikes,
+    updated_at = NOW();
@@ -0,0 +1,53 @@
+-- Devre bazlı maç istatistikleri
+-- FotMob stats.Periods altındaki FirstHalf/SecondHalf blokları (All zaten
+-- match_stats + match_advanced_stats'ta). Kolonlar bu iki tablonun birleşimi;
+-- match_saver ingest sırasında aynı geçişte yazar.
+-- Eski maçlar: POST /api/match-data/backfill-period-stats (raw_match_details'ten)
+
+CREATE TABLE IF NOT EXISTS public.match_period_stats (
+    match_id INTEGER NOT NULL,
+    period   VARCHAR(20) NOT NULL,
+    home_xg NUMERIC, away_xg NUMERIC,
+    home_shots INTEGER, away_shots INTEGER,
+    home_shots_on_target INTEGER, away_shots_on_target INTEGER,
+    home_possession NUMERIC, away_possession NUMERIC,
+    home_corners INTEGER, away_corners INTEGER,
+    home_fouls INTEGER, away_fouls INTEGER,
+    home_yellow_cards INTEGER, away_yellow_cards INTEGER,
+    home_red_cards INTEGER, away_red_cards INTEGER,
+    home_open_play_xg NUMERIC, away_open_play_xg NUMERIC,
+    home_set_piece_xg NUMERIC, away_set_piece_xg NUMERIC,
+    home_xgot NUMERIC, away_xgot NUMERIC,
+    home_shots_blocked NUMERIC, away_shots_blocked NUMERIC,
+    home_shots_off_target NUMERIC, away_shots_off_target NUMERIC,
+    home_shots_inside_box NUMERIC, away_shots_inside_box NUMERIC,
+    home_shots_outside_box NUMERIC, away_shots_outside_box NUMERIC,
+    home_total_passes NUMERIC, away_total_passes NUMERIC,
+    home_pass_accuracy NUMERIC, away_pass_accuracy NUMERIC,
+    home_long_passes NUMERIC, away_long_passes NUMERIC,
+    home_long_pass_accuracy NUMERIC, away_long_pass_accuracy NUMERIC,
+    home_crosses NUMERIC, away_crosses NUMERIC,
+    home_cross_accuracy NUMERIC, away_cross_accuracy NUMERIC,
+    home_passes_own_half NUMERIC, away_passes_own_half NUMERIC,
+    home_passes_opp_half NUMERIC, away_passes_opp_half NUMERIC,
+    home_touches_in_box NUMERIC, away_touches_in_box NUMERIC,
+    home_tackles NUMERIC, away_tackles NUMERIC,
+    home_interceptions NUMERIC, away_interceptions NUMERIC,
+    home_blocks NUMERIC, away_blocks NUMERIC,
+    home_clearances NUMERIC, away_clearances NUMERIC,
+    home_goalkeeper_saves NUMERIC, away_goalkeeper_saves NUMERIC,
+    home_duels_won NUMERIC, away_duels_won NUMERIC,
+    home_duels_won_pct NUMERIC, away_duels_won_pct NUMERIC,
+    home_aerial_duels_won NUMERIC, away_aerial_duels_won NUMERIC,
+    home_aerial_duels_pct NUMERIC, away_aerial_duels_pct NUMERIC,
+    home_dribbles_successful NUMERIC, away_dribbles_successful NUMERIC,
+    home_dribbles_pct NUMERIC, away_dribbles_pct NUMERIC,
+    home_offsides NUMERIC, away_offsides NUMERIC,
+    created_at TIMESTAMP NOT NULL DEFAULT NOW(),
+    updated_at TIMESTAMP NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (match_id, period)
+);
+
+-- Devreye göre tarama (örn. tüm ilk yarı xG'leri)
+CREATE INDEX IF NOT EXISTS idx_match_period_stats_period
+    ON public.match_period_stats (period, match_id);
@@ -0,0 +1,6 @@
+-- Lig/sezon bazlı bitmiş maç taraması (puan durumu: app/services/standings.py)
+-- Sezon filtresi match_date aralığıdır; index lig içinde sadece o sezonu okur.
+
+CREATE INDEX IF NOT EXISTS idx_matches_league_date_finished
+    ON public.matches (league_id, match_date)
+    WHERE finished;
@@ -0,0 +1,28 @@
+-- Takım rolling metrikleri (app/services/team_metrics.py)
+-- Büyük fırsatlar: FotMob big_chance / big_chance_missed_title, ingest sırasında yazılır.
+-- Eski maçlar için NULL kalır (ortalamaya katılmaz).
+
+ALTER TABLE public.match_advanced_stats
+    ADD COLUMN IF NOT EXISTS home_big_chances NUMERIC,
+    ADD COLUMN IF NOT EXISTS away_big_chances NUMERIC,
+    ADD COLUMN IF NOT EXISTS home_big_chances_missed NUMERIC,
+    ADD COLUMN IF NOT EXISTS away_big_chances_missed NUMERIC;
+
+ALTER TABLE public.match_period_stats
+    ADD COLUMN IF NOT EXISTS home_big_chances NUMERIC,
+    ADD COLUMN IF NOT EXISTS away_big_chances NUMERIC,
+    ADD COLUMN IF NOT EXISTS home_big_chances_missed NUMERIC,
+    ADD COLUMN IF NOT EXISTS away_big_chances_missed NUMERIC;
+
+-- Takımın son N bitmiş maçı (ev ve deplasman ayrı taranır)
+CREATE INDEX IF NOT EXISTS idx_matches_home_team_date_finished
+    ON public.matches (home_team_id, match_date DESC)
+    WHERE finished;
+
+CREATE INDEX IF NOT EXISTS idx_matches_away_team_date_finished
+    ON public.matches (away_team_id, match_date DESC)
+    WHERE finished;
+
+-- Ingest versiyonu: MAX(updated_at) index-only okunur
+CREATE INDEX IF NOT EXISTS idx_matches_updated_at
+    ON public.matches (updated_at);
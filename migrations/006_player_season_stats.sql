@@ -0,0 +1,97 @@
+-- Oyuncu sezon toplamları (app/services/players.py)
+-- match_player_stats'a FotMob oyuncu ID'si eklenir; player_season_stats her
+-- ingest'te yalnızca yeni maçın satırlarıyla artımlı güncellenir
+-- (save_match_player_stats). Sezon = maç tarihi, 1 Temmuz başlangıç (puan durumu ile aynı).
+
+ALTER TABLE public.match_player_stats
+    ADD COLUMN IF NOT EXISTS fotmob_player_id INTEGER;
+
+CREATE INDEX IF NOT EXISTS idx_match_player_stats_player
+    ON public.match_player_stats (fotmob_player_id);
+
+-- Eski satırlar: oyuncu ID'si raw_match_details'teki playerStats'tan (isim + takım eşleşmesi)
+UPDATE public.match_player_stats ps
+SET fotmob_player_id = (p.value->>'id')::integer
+FROM public.matches m,
+     public.teams t,
+     jsonb_each(CASE WHEN jsonb_typeof(m.raw_match_details->'content'->'playerStats') = 'object'
+                     THEN m.raw_match_details->'content'->'playerStats' END) p
+WHERE m.id = ps.match_id
+  AND t.id = ps.team_id
+  AND ps.fotmob_player_id IS NULL
+  AND p.value->>'name' = ps.player_name
+  AND (p.value->>'teamId')::integer = t.fotmob_team_id;
+
+CREATE TABLE IF NOT EXISTS public.player_season_stats (
+    fotmob_player_id  INTEGER NOT NULL,
+    league_id         INTEGER NOT NULL,  -- public.leagues.id
+    season_start_year INTEGER NOT NULL,
+    team_id           INTEGER,           -- son maçtaki takım (public.teams.id)
+    player_name       TEXT,
+    matches           INTEGER NOT NULL DEFAULT 0,
+    minutes_played    INTEGER NOT NULL DEFAULT 0,
+    goals             INTEGER NOT NULL DEFAULT 0,
+    assists           INTEGER NOT NULL DEFAULT 0,
+    xg                NUMERIC NOT NULL DEFAULT 0,
+    xa                NUMERIC NOT NULL DEFAULT 0,
+    total_shots       INTEGER NOT NULL DEFAULT 0,
+    shots_on_target   INTEGER NOT NULL DEFAULT 0,
+    key_passes        INTEGER NOT NULL DEFAULT 0,
+    total_passes      INTEGER NOT NULL DEFAULT 0,
+    accurate_passes   INTEGER NOT NULL DEFAULT 0,
+    tackles           INTEGER NOT NULL DEFAULT 0,
+    interceptions     INTEGER NOT NULL DEFAULT 0,
+    duels_won         INTEGER NOT NULL DEFAULT 0,
+    duels_lost        INTEGER NOT NULL DEFAULT 0,
+    rating_sum        NUMERIC NOT NULL DEFAULT 0,
+    rated_matches     INTEGER NOT NULL DEFAULT 0,
+    last_match_date   TIMESTAMPTZ,
+    updated_at        TIMESTAMP NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (fotmob_player_id, league_id, season_start_year)
+);
+
+-- Gol / xG krallığı: lig-sezon içinde sıralı index taraması
+CREATE INDEX IF NOT EXISTS idx_player_season_stats_goals
+    ON public.player_season_stats (league_id, season_start_year, goals DESC);
+
+CREATE INDEX IF NOT EXISTS idx_player_season_stats_xg
+    ON public.player_season_stats (league_id, season_start_year, xg DESC);
+
+-- İlk kurulum: mevcut satırlardan toplamlar (var olan kayıtlara dokunulmaz, tekrar çalıştırılabilir)
+INSERT INTO public.player_season_stats (
+    fotmob_player_id, league_id, season_start_year, team_id, player_name,
+    matches, minutes_played, goals, assists, xg, xa, total_shots, shots_on_target,
+    key_passes, total_passes, accurate_passes, tackles, interceptions, duels_won, duels_lost,
+    rating_sum, rated_matches, last_match_date
+)
+SELECT
+    ps.fotmob_player_id,
+    m.league_id,
+    CAST(EXTRACT(YEAR FROM m.match_date - INTERVAL '6 months') AS integer),
+    (ARRAY_AGG(ps.team_id ORDER BY m.match_date DESC))[1],
+    (ARRAY_AGG(ps.player_name ORDER BY m.match_date DESC))[1],
+    COUNT(*),
+    COALESCE(SUM(ps.minutes_played), 0),
+    COALESCE(SUM(ps.goals), 0),
+    COALESCE(SUM(ps.assists), 0),
+    COALESCE(SUM(ps.xg), 0),
+    COALESCE(SUM(ps.xa), 0),
+    COALESCE(SUM(ps.total_shots), 0),
+    COALESCE(SUM(ps.shots_on_target), 0),
+    COALESCE(SUM(ps.key_passes), 0),
+    COALESCE(SUM(ps.total_passes), 0),
+    COALESCE(SUM(ps.accurate_passes), 0),
+    COALESCE(SUM(ps.tackles), 0),
+    COALESCE(SUM(ps.interceptions), 0),
+    COALESCE(SUM(ps.duels_won), 0),
+    COALESCE(SUM(ps.duels_lost), 0),
+    COALESCE(SUM(ps.rating) FILTER (WHERE ps.rating > 0), 0),
+    COUNT(*) FILTER (WHERE ps.rating > 0),
+    MAX(m.match_date)
+FROM public.match_player_stats ps
+JOIN public.matches m ON m.id = ps.match_id
+WHERE ps.fotmob_player_id IS NOT NULL
+  AND m.league_id IS NOT NULL
+  AND m.match_date IS NOT NULL
+GROUP BY ps.fotmob_player_id, m.league_id, CAST(EXTRACT(YEAR FROM m.match_date - INTERVAL '6 months') AS integer)
+ON CONFLICT (fotmob_player_id, league_id, season_start_year) DO NOTHING;
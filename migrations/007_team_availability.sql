@@ -0,0 +1,28 @@
+-- Takım başına son bilinen eksikler (sakat/cezalı) - app/services/availability.py
+-- save_player_availability her ingest'te takımın satırını maç tarihi daha yeniyse
+-- değiştirir; okuma tek PK lookup'ı, player_availability geçmişi taranmaz.
+
+CREATE TABLE IF NOT EXISTS public.team_availability (
+    team_id    INTEGER PRIMARY KEY,   -- public.teams.id
+    match_id   INTEGER NOT NULL,      -- snapshot'ın geldiği maç (public.matches.id)
+    match_date TIMESTAMPTZ,
+    players    JSONB NOT NULL DEFAULT '[]',  -- [{player_id, name, status, reason}, ...]
+    updated_at TIMESTAMP NOT NULL DEFAULT NOW()
+);
+
+-- İlk kurulum: eksik kaydı olan son maçtan (eksiksiz maçlar eski tabloda iz bırakmaz)
+INSERT INTO public.team_availability (team_id, match_id, match_date, players)
+SELECT DISTINCT ON (pa.team_id)
+    pa.team_id,
+    pa.match_id,
+    m.match_date,
+    (SELECT jsonb_agg(jsonb_build_object(
+                'player_id', NULL, 'name', p.player_name, 'status', p.status, 'reason', p.reason
+            ) ORDER BY p.id)
+     FROM public.player_availability p
+     WHERE p.match_id = pa.match_id AND p.team_id = pa.team_id)
+FROM public.player_availability pa
+JOIN public.matches m ON m.id = pa.match_id
+WHERE pa.team_id IS NOT NULL
+ORDER BY pa.team_id, m.match_date DESC NULLS LAST
+ON CONFLICT (team_id) DO NOTHING;
@@ -0,0 +1,26 @@
+-- Tahminci sıralaması (app/services/tipsters.py)
+-- created_by_email başına sonuç toplamları, ROI ve seriler. Tahmin sonucu
+-- değiştiğinde (check-results, güncelleme, silme) yazarın satırı yeniden hesaplanır.
+-- İlk doldurma ve periyodik düzeltme: POST /api/predictions/leaderboard/rebuild
+
+CREATE TABLE IF NOT EXISTS greydb.tipster_stats (
+    created_by_email      TEXT PRIMARY KEY,
+    settled               INTEGER NOT NULL DEFAULT 0,  -- won + lost + void
+    won                   INTEGER NOT NULL DEFAULT 0,
+    lost                  INTEGER NOT NULL DEFAULT 0,
+    void                  INTEGER NOT NULL DEFAULT 0,
+    staked                INTEGER NOT NULL DEFAULT 0,  -- oranı olan won + lost (ROI paydası)
+    profit                NUMERIC NOT NULL DEFAULT 0,  -- birim bahis kâr/zarar
+    hit_rate              NUMERIC,                     -- won / (won + lost)
+    roi                   NUMERIC,                     -- profit / staked
+    current_streak        INTEGER NOT NULL DEFAULT 0,
+    current_streak_result TEXT,                        -- won / lost
+    longest_win_streak    INTEGER NOT NULL DEFAULT 0,
+    longest_loss_streak   INTEGER NOT NULL DEFAULT 0,
+    last_match_date       TIMESTAMP,
+    updated_at            TIMESTAMP NOT NULL DEFAULT NOW()
+);
+
+-- Yazar satırının yeniden hesabı sadece yazarın tahminlerini okur
+CREATE INDEX IF NOT EXISTS idx_predictions_author_date
+    ON greydb.predictions (created_by_email, match_date);
@@ -0,0 +1,20 @@
+-- Kupon sonuçlandırma (app/services/coupons.py)
+-- Kupon sonucu ayakların tahmin sonuçlarından türetilir. Tahmin sonucu
+-- değiştiğinde (check-results, güncelleme, silme) sadece o tahminlere bağlı
+-- kuponlar tek UPDATE ile yeniden hesaplanır.
+-- İlk doldurma ve periyodik düzeltme: POST /api/coupons/settle
+
+ALTER TABLE greydb.coupons
+    ADD COLUMN IF NOT EXISTS result TEXT,           -- won / lost / void; NULL = açık
+    ADD COLUMN IF NOT EXISTS settled_odds NUMERIC,  -- void ayaklar düşülmüş oran (lost: 0)
+    ADD COLUMN IF NOT EXISTS settled_at TIMESTAMP;
+
+-- Tahmin -> bağlı kuponlar
+CREATE INDEX IF NOT EXISTS idx_coupon_matches_prediction
+    ON greydb.coupon_matches (prediction_id)
+    WHERE prediction_id IS NOT NULL;
+
+-- Açık kupon taraması (id sırasıyla sayfalı)
+CREATE INDEX IF NOT EXISTS idx_coupons_open
+    ON greydb.coupons (id)
+    WHERE result IS NULL;